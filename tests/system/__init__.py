@@ -35,8 +35,8 @@ Format of client_secrets.json:
 }
 
 """
+from __future__ import print_function
 import datetime
-import httplib
 import json
 import oauth2client.file
 import os.path
@@ -44,7 +44,13 @@ import traceback
 import upapi
 import upapi.base
 import upapi.scopes
-import urllib
+
+try:
+    import http.client as httplib
+    import urllib.parse as urllib
+except ImportError:
+    import httplib
+    import urllib
 
 
 #
@@ -175,10 +181,10 @@ class TestSystem(object):
             self._run()
         except AssertionError:
             self.test_data['fails'] += 1
-            print 'FAILED: {}\n\n'.format(self.name), traceback.format_exc()
+            print('FAILED: {}\n\n'.format(self.name), traceback.format_exc())
         else:
             self.test_data['successes'] += 1
-            print 'PASSED: {}'.format(self.name)
+            print('PASSED: {}'.format(self.name))
 
     def _run(self):
         """
@@ -191,10 +197,10 @@ class TestSystem(object):
         """
         Generate output of the test run.
         """
-        print SUMMARY.format(
+        print(SUMMARY.format(
             total=cls.test_data['total'],
             successes=cls.test_data['successes'],
-            fails=cls.test_data['fails'])
+            fails=cls.test_data['fails']))
 
 
 class TestGetRedirectUrl(TestSystem):
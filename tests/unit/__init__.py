@@ -4,7 +4,9 @@ Dummy data for Resource testcases.
 import mock
 import unittest
 import upapi.base
+import upapi.breaker
 import upapi.scopes
+import upapi.user
 
 
 class TestResource(unittest.TestCase):
@@ -30,6 +32,11 @@ class TestResource(unittest.TestCase):
         self.mock_creds_saver = mock.Mock(spec=['credentials'])
         self.mock_token_saver = mock.Mock(spec=['token'])
 
+        #
+        # Start every test with closed circuit breakers.
+        #
+        upapi.breaker.BREAKERS.reset()
+
         #
         # Common objects.
         #
@@ -2,15 +2,34 @@
 Unit tests for upapi.base.UpApi
 """
 import datetime
-import httplib
+import httplib2
+import io
 import json
 import mock
+import oauth2client.client
+import socket
+import threading
 import tests.unit
+import time
 import upapi.base
+import upapi.breaker
 import upapi.endpoints
 import upapi.exceptions
 import upapi.meta
+import upapi.mirror
+import upapi.parsing
 import upapi.scopes
+import upapi.timezones
+import upapi.transport
+
+try:
+    import http.client as httplib
+    import http.server as BaseHTTPServer
+    import urllib.parse as urlparse
+except ImportError:
+    import BaseHTTPServer
+    import httplib
+    import urlparse
 
 
 class TestUpApi(tests.unit.TestResource):
@@ -47,15 +66,19 @@ class TestUpApi(tests.unit.TestResource):
             token_response=self.token,
             scopes=self.up.app_scope)
 
-    @mock.patch('oauth2client.client.OAuth2WebServerFlow', autospec=True)
+    @mock.patch.dict('upapi.config._flows', clear=True)
+    @mock.patch('oauth2client.client.OAuth2WebServerFlow', side_effect=oauth2client.client.OAuth2WebServerFlow)
     def test__refresh_flow(self, mock_flow):
         """
-        Verify creation of flow object.
+        Verify creation of flow object, built once per app config and copied for each UpApi object.
 
         :param mock_flow: mocked oauth object
         """
-        upapi.base.UpApi(self.app_id, self.app_secret, self.app_redirect_uri)
-        mock_flow.assert_called_with(
+        up = upapi.base.UpApi(self.app_id, self.app_secret, self.app_redirect_uri)
+        other = upapi.base.UpApi(up.config, user_credentials=self.credentials)
+        self.assertIsNot(other.flow, up.flow)
+        self.assertEqual(other.flow.redirect_uri, up.flow.redirect_uri)
+        mock_flow.assert_called_once_with(
             self.app_id,
             client_secret=self.app_secret,
             scope=upapi.scopes.BASIC_READ,
@@ -85,7 +108,7 @@ class TestUpApi(tests.unit.TestResource):
             self.app_secret,
             self.app_redirect_uri,
             user_credentials=self.credentials)
-        mock_http.assert_called_with()
+        mock_http.assert_called_with(timeout=upapi.base.TIMEOUT)
         self.credentials.authorize.assert_called()
 
     def test___init__(self):
@@ -110,7 +133,15 @@ class TestUpApi(tests.unit.TestResource):
             self.app_secret,
             self.app_redirect_uri,
             app_scope=self.app_scope)
-        self.assertEqual(up.app_scope, self.app_scope)
+        self.assertEqual(up.app_scope, tuple(self.app_scope))
+
+        #
+        # The app secret and redirect URI are required, unless they come in an AppConfig.
+        #
+        self.assertRaises(TypeError, upapi.base.UpApi, self.app_id)
+        self.assertRaises(TypeError, upapi.base.UpApi, self.app_id, self.app_secret)
+        self.assertRaises(TypeError, upapi.base.UpApi, up.config, self.app_secret)
+        self.assertEqual(upapi.base.UpApi(up.config).app_scope, tuple(self.app_scope))
 
     @mock.patch('upapi.base.UpApi._refresh_flow', autospec=True)
     def test_redirect_uri(self, mock_refresh):
@@ -241,10 +272,8 @@ class TestUpApi(tests.unit.TestResource):
         # ok_statuses should not raise
         #
         mock_resp.status = httplib.CREATED
-        self.up.resp = mock_resp
-        self.up.content = ''
         try:
-            self.up._raise_for_status([httplib.OK, httplib.CREATED])
+            self.up._raise_for_status([httplib.OK, httplib.CREATED], mock_resp, '')
         except Exception as exc:
             self.fail('_raise_for_status unexpectedly threw {}'.format(exc))
 
@@ -255,7 +284,40 @@ class TestUpApi(tests.unit.TestResource):
         self.assertRaises(
             upapi.exceptions.UnexpectedAPIResponse,
             self.up._raise_for_status,
-            [httplib.OK, httplib.CREATED])
+            [httplib.OK, httplib.CREATED],
+            mock_resp,
+            '')
+
+        #
+        # Errors carry the status, headers, meta data and elapsed time, and have a class per kind of failure.
+        #
+        body = json.dumps({
+            'meta': {'user_xid': 'user_xid', 'message': 'Too Many Requests', 'code': 429, 'time': 1471463170}})
+        mock_resp.status = 429
+        with mock.patch('timeit.default_timer', return_value=12.5):
+            try:
+                self.up._raise_for_status([httplib.OK], mock_resp, body, {'retry-after': '30'}, 10)
+            except upapi.exceptions.RateLimited as exc:
+                self.assertEqual(exc.status, 429)
+                self.assertEqual(exc.retry_after, 30)
+                self.assertEqual(exc.meta.message, 'Too Many Requests')
+                self.assertEqual(exc.elapsed, 2.5)
+            else:
+                self.fail('_raise_for_status did not raise RateLimited')
+
+        for status, error in [
+                (httplib.UNAUTHORIZED, upapi.exceptions.AuthError),
+                (httplib.FORBIDDEN, upapi.exceptions.AuthError),
+                (httplib.NOT_FOUND, upapi.exceptions.NotFound),
+                (httplib.BAD_GATEWAY, upapi.exceptions.ServerError),
+                (httplib.BAD_REQUEST, upapi.exceptions.UnexpectedAPIResponse)]:
+            mock_resp.status = status
+            try:
+                self.up._raise_for_status([httplib.OK], mock_resp, b'not json')
+            except upapi.exceptions.UnexpectedAPIResponse as exc:
+                self.assertIs(type(exc), error)
+                self.assertEqual(str(exc), '{} not json'.format(status))
+                self.assertEqual((exc.headers, exc.meta, exc.elapsed, exc.retry_after), ({}, None, None, None))
 
     @mock.patch('httplib2.Http.request', autospec=True)
     @mock.patch('httplib2.Response', autospec=True)
@@ -287,7 +349,8 @@ class TestUpApi(tests.unit.TestResource):
         self.assertEqual(self.upcreds.meta.code, resp_content['meta']['code'])
         self.assertEqual(
             self.upcreds.meta.time,
-            datetime.datetime.fromtimestamp(resp_content['meta']['time']))
+            datetime.datetime.fromtimestamp(resp_content['meta']['time'], upapi.timezones.UTC))
+        self.assertEqual(self.upcreds.user_xid, resp_content['meta']['user_xid'])
 
         #
         # Verify the response data.
@@ -305,6 +368,557 @@ class TestUpApi(tests.unit.TestResource):
         self.up.get(resource)
         mock_request.assert_called_with(self.up, resource)
 
+    @mock.patch('upapi.base.UpApi.get', autospec=True)
+    def test_get_pages(self, mock_get):
+        """
+        Verify get_pages follows next links until the last page.
+
+        :param mock_get: mocked get method
+        """
+        next_link = '/nudge/api/v.1.1/users/@me/moves?page_token=1'
+        mock_get.side_effect = [
+            {'items': [{'xid': '0'}], 'links': {'next': next_link}},
+            {'items': [{'xid': '1'}]}]
+        pages = list(self.up.get_pages(upapi.endpoints.USERMOVES, {'date': 20170201}))
+        self.assertEqual([page['items'][0]['xid'] for page in pages], ['0', '1'])
+        self.assertEqual(
+            mock_get.call_args_list,
+            [mock.call(self.up, '{}?date=20170201'.format(upapi.endpoints.USERMOVES)),
+             mock.call(self.up, '{}{}'.format(upapi.endpoints.DOMAIN, next_link))])
+
+    @mock.patch('upapi.base.UpApi._stream_request', autospec=True)
+    def test_stream_items(self, mock_stream_request):
+        """
+        Verify stream_items yields the items of every page and sets the meta object.
+
+        :param mock_stream_request: mocked _stream_request method
+        """
+        meta = {'user_xid': 'user_xid', 'message': 'OK', 'code': 200, 'time': 1471463170}
+        next_link = '/nudge/api/v.1.1/users/@me/moves?page_token=1'
+        bodies = [
+            json.dumps({'meta': meta, 'data': {'items': [{'xid': '0'}, {'xid': '1'}], 'links': {'next': next_link}}}),
+            json.dumps({'meta': meta, 'data': {'items': [{'xid': '2'}]}})]
+        responses = []
+        for body in bodies:
+            body = body.encode('utf-8')
+            resp = mock.Mock(status=httplib.OK, length=None)
+            resp.getheaders.return_value = [('content-type', 'application/json')]
+            resp.read.side_effect = [body[:10], body[10:], b'']
+            responses.append(resp)
+        mock_stream_request.side_effect = responses
+
+        items = list(self.upcreds.stream_items(upapi.endpoints.USERMOVES, {'date': 20170201}, chunk_size=10))
+        self.assertEqual([item['xid'] for item in items], ['0', '1', '2'])
+        self.assertEqual(
+            mock_stream_request.call_args_list,
+            [mock.call(self.upcreds, '{}?date=20170201'.format(upapi.endpoints.USERMOVES)),
+             mock.call(self.upcreds, '{}{}'.format(upapi.endpoints.DOMAIN, next_link))])
+        self.assertEqual(self.upcreds.meta.user_xid, 'user_xid')
+        self.assertEqual(self.upcreds.last_response.headers, {'content-type': 'application/json'})
+
+        #
+        # Bad statuses raise.
+        #
+        resp = mock.Mock(status=httplib.NOT_FOUND)
+        resp.read.return_value = 'Not Found'
+        resp.getheaders.return_value = []
+        mock_stream_request.side_effect = [resp]
+        self.assertRaises(
+            upapi.exceptions.UnexpectedAPIResponse,
+            list,
+            self.upcreds.stream_items(upapi.endpoints.USERMOVES))
+
+    @mock.patch('upapi.base.UpApi._stream_request', autospec=True)
+    def test_download(self, mock_stream_request):
+        """
+        Verify download writes the body to the file object in chunks.
+
+        :param mock_stream_request: mocked _stream_request method
+        """
+        resp = mock.Mock(status=httplib.OK, length=None)
+        resp.read.side_effect = [b'\x89PNG', b'data', b'']
+        mock_stream_request.return_value = resp
+        buf = io.BytesIO()
+        url = upapi.endpoints.MOVESGRAPH.format(xid='xid')
+        self.assertEqual(self.upcreds.download(url, buf, chunk_size=4), 8)
+        self.assertEqual(buf.getvalue(), b'\x89PNGdata')
+        resp.read.assert_called_with(4)
+
+        #
+        # Stalled reads time out.
+        #
+        resp.read.side_effect = [b'\x89PNG', socket.timeout('timed out')]
+        self.assertRaises(upapi.exceptions.Timeout, self.upcreds.download, url, io.BytesIO())
+
+    def test_resource_kind(self):
+        """
+        Verify the kind is parsed from list, resource and sub-resource endpoints.
+        """
+        self.assertEqual(upapi.base.resource_kind(upapi.endpoints.USERMOVES), 'moves')
+        self.assertEqual(upapi.base.resource_kind(upapi.endpoints.BODYEVENTS), 'body_events')
+        self.assertEqual(upapi.base.resource_kind(upapi.endpoints.SLEEPSGRAPH), 'sleeps')
+        self.assertEqual(upapi.base.resource_kind('{}?date=20170201'.format(upapi.endpoints.USERSLEEPS)), 'sleeps')
+
+    @mock.patch('upapi.base.UpApi.get', autospec=True)
+    def test_get_item(self, mock_get):
+        """
+        Verify get_item reads through the mirror, keeping each user's items apart.
+
+        :param mock_get: mocked get method
+        """
+        move = {'xid': 'move_xid', 'date': 20170201}
+        mock_get.return_value = move
+
+        #
+        # No mirror, always hit the API.
+        #
+        self.assertEqual(self.up.get_item(upapi.endpoints.MOVES, 'move_xid'), move)
+        mock_get.assert_called_once_with(self.up, upapi.endpoints.MOVES.format(xid='move_xid'))
+
+        #
+        # With a mirror, the second lookup is answered locally.
+        #
+        mock_get.reset_mock()
+        self.up.mirror = upapi.mirror.Mirror()
+        self.up.user_xid = 'user_xid'
+        self.assertEqual(self.up.get_item(upapi.endpoints.MOVES, 'move_xid'), move)
+        self.assertEqual(self.up.get_item(upapi.endpoints.MOVES, 'move_xid'), move)
+        mock_get.assert_called_once_with(self.up, upapi.endpoints.MOVES.format(xid='move_xid'))
+        self.assertEqual(self.up.mirror.get_item('user_xid', 'move_xid'), move)
+        self.assertEqual(self.up.mirror.query('user_xid', 'moves'), [])
+
+        #
+        # List rows from a range query do not answer get_item, since they can leave out fields of the resource.
+        #
+        self.up.mirror.put_items('user_xid', 'moves', [{'xid': 'listed_xid', 'date': 20170201}])
+        self.assertEqual(self.up.get_item(upapi.endpoints.MOVES, 'listed_xid'), move)
+        self.assertEqual(mock_get.call_count, 2)
+
+        #
+        # Another user on the same mirror does not get the first user's copy.
+        #
+        mock_get.reset_mock()
+        other_move = dict(move, title='other')
+        mock_get.return_value = other_move
+        other = upapi.base.UpApi(self.app_id, self.app_secret, self.app_redirect_uri, mirror=self.up.mirror)
+        other.user_xid = 'other_xid'
+        self.assertEqual(other.get_item(upapi.endpoints.MOVES, 'move_xid'), other_move)
+        self.assertEqual(other.get_item(upapi.endpoints.MOVES, 'move_xid'), other_move)
+        mock_get.assert_called_once_with(other, upapi.endpoints.MOVES.format(xid='move_xid'))
+        self.assertEqual(self.up.get_item(upapi.endpoints.MOVES, 'move_xid'), move)
+
+        #
+        # Sub-resources would collide with their parent in the mirror.
+        #
+        self.assertRaises(ValueError, self.up.get_item, upapi.endpoints.MOVESTICKS, 'move_xid')
+
+    @mock.patch('upapi.base.UpApi.get_pages', autospec=True)
+    def test_get_range(self, mock_pages):
+        """
+        Verify get_range fetches time ranges, and with a mirror only the gaps, leaving the user's today unmarked.
+
+        :param mock_pages: mocked get_pages method
+        """
+        def pages(_, url, params):
+            #
+            # One item per day of the padded range, so the days just outside it must be left out.
+            #
+            day = datetime.datetime.utcfromtimestamp(params['start_time']).date()
+            last = datetime.datetime.utcfromtimestamp(params['end_time']).date()
+            items = []
+            while day <= last:
+                items.append({'xid': str(upapi.mirror.from_date(day)), 'date': upapi.mirror.from_date(day)})
+                day += datetime.timedelta(days=1)
+            return iter([{'items': items}])
+        mock_pages.side_effect = pages
+
+        def dates(call):
+            params = call[0][2]
+            first = upapi.mirror.from_date(datetime.datetime.utcfromtimestamp(params['start_time'] + 14 * 3600))
+            last = upapi.mirror.from_date(datetime.datetime.utcfromtimestamp(params['end_time'] - 36 * 3600))
+            return first, last
+
+        #
+        # No mirror, fetch the whole range at once.
+        #
+        items = self.up.get_range(upapi.endpoints.USERMOVES, 20170201, 20170202)
+        self.assertEqual([item['xid'] for item in items], ['20170201', '20170202'])
+        self.assertEqual([dates(call) for call in mock_pages.call_args_list], [(20170201, 20170202)])
+
+        #
+        # With a mirror, past days get fetched once, and only the gaps between mirrored days are fetched.
+        #
+        mock_pages.reset_mock()
+        self.up.mirror = upapi.mirror.Mirror()
+        self.up.user_xid = 'user_xid'
+        history = upapi.timezones.TimezoneHistory([{'time': 0, 'tz': 'GMT+1400'}])
+        with mock.patch.object(upapi.timezones.TIMEZONES, 'history', return_value=history):
+            self.up.get_range(upapi.endpoints.USERMOVES, 20170202, 20170202)
+            self.up.get_range(upapi.endpoints.USERMOVES, 20170205, 20170205)
+            items = self.up.get_range(upapi.endpoints.USERMOVES, 20170201, 20170206)
+            self.assertEqual(
+                [item['xid'] for item in items],
+                ['20170201', '20170202', '20170203', '20170204', '20170205', '20170206'])
+            self.assertEqual(
+                [dates(call) for call in mock_pages.call_args_list],
+                [(20170202, 20170202), (20170205, 20170205), (20170201, 20170201), (20170203, 20170204),
+                 (20170206, 20170206)])
+
+            #
+            # The user's today, in the zone the user is in, can still get items.
+            #
+            today = datetime.datetime.now(history.zone_at(0)).date()
+            first = upapi.mirror.from_date(today - datetime.timedelta(days=1))
+            self.up.get_range(upapi.endpoints.USERMOVES, first, upapi.mirror.from_date(today))
+            self.assertEqual(
+                self.up.mirror.missing_dates('user_xid', 'moves', first, upapi.mirror.from_date(today)),
+                [upapi.mirror.from_date(today)])
+
+    @mock.patch('httplib2.Http.request', autospec=True)
+    def test_request(self, mock_request):
+        """
+        Verify request returns a Response per call and keeps the last one per thread.
+
+        :param mock_request: mocked Http.request method
+        """
+        def respond(url, method, body=None, headers=None, connection_type=None):
+            resp = httplib2.Response({'status': httplib.OK, 'etag': url})
+            content = {
+                'meta': {'user_xid': 'user_xid', 'message': 'message', 'code': 200, 'time': 1471463170},
+                'data': {'url': url}}
+            return resp, json.dumps(content)
+        mock_request.side_effect = respond
+        self.upcreds.http.request = mock_request
+
+        response = self.upcreds.request('https://up.resource/main')
+        self.assertEqual(response.status, httplib.OK)
+        self.assertEqual(response.headers['etag'], 'https://up.resource/main')
+        self.assertEqual(response.meta.user_xid, 'user_xid')
+        self.assertEqual(response.data, {'url': 'https://up.resource/main'})
+        self.assertGreaterEqual(response.elapsed, 0)
+        self.assertIs(self.upcreds.last_response, response)
+
+        #
+        # Another thread's requests don't change this thread's last response.
+        #
+        thread_responses = []
+
+        def other():
+            self.upcreds.http.request = mock_request
+            thread_responses.append(self.upcreds.request('https://up.resource/other'))
+        thread = threading.Thread(target=other)
+        thread.start()
+        thread.join()
+        self.assertEqual(thread_responses[0].data, {'url': 'https://up.resource/other'})
+        self.assertIs(self.upcreds.last_response, response)
+        self.assertFalse(hasattr(self.upcreds, 'resp'))
+        self.assertFalse(hasattr(self.upcreds, 'content'))
+
+    @mock.patch('httplib2.Http.request', autospec=True)
+    def test_request_not_modified(self, mock_request):
+        """
+        Verify conditional requests send their headers and a 304 returns a Response without a body.
+
+        :param mock_request: mocked Http.request method
+        """
+        mock_request.return_value = (httplib2.Response({'status': httplib.NOT_MODIFIED, 'etag': '"etag"'}), b'')
+        self.upcreds.http.request = mock_request
+        response = self.upcreds.request(
+            'https://up.resource/main',
+            ok_statuses=[httplib.OK, httplib.NOT_MODIFIED],
+            headers={'If-None-Match': '"etag"'})
+        self.assertEqual(mock_request.call_args[1]['headers'], {'If-None-Match': '"etag"'})
+        self.assertEqual(response.status, httplib.NOT_MODIFIED)
+        self.assertEqual(response.headers['etag'], '"etag"')
+        self.assertIsNone(response.meta)
+        self.assertIsNone(response.data)
+        self.assertIs(self.upcreds.last_response, response)
+        self.assertRaises(
+            upapi.exceptions.UnexpectedAPIResponse,
+            self.upcreds.request,
+            'https://up.resource/main',
+            headers={'If-None-Match': '"etag"'})
+
+    def test__limits(self):
+        """
+        Verify heavy endpoints get longer limits, and limits can be overridden.
+        """
+        self.assertEqual(self.up._limits(upapi.endpoints.USER), (upapi.base.TIMEOUT, upapi.base.DEADLINE))
+        self.assertEqual(
+            self.up._limits(upapi.endpoints.MOVESTICKS.format(xid='xid')),
+            upapi.base.ENDPOINT_TIMEOUTS[upapi.endpoints.TICKS])
+        up = upapi.base.UpApi(
+            self.app_id,
+            self.app_secret,
+            self.app_redirect_uri,
+            timeout=1,
+            deadline=2,
+            endpoint_timeouts={upapi.endpoints.GRAPH: (3, None)})
+        self.assertEqual(up._limits(upapi.endpoints.USER), (1, 2))
+        self.assertEqual(up._limits(upapi.endpoints.SLEEPSGRAPH.format(xid='xid')), (3, None))
+
+    @mock.patch('httplib2.Http.request', autospec=True)
+    def test_request_timeout(self, mock_request):
+        """
+        Verify socket timeouts and missed deadlines raise Timeout.
+
+        :param mock_request: mocked Http.request method
+        """
+        mock_request.side_effect = socket.timeout('timed out')
+        self.upcreds.http.request = mock_request
+        self.assertRaises(upapi.exceptions.Timeout, self.upcreds.request, 'https://up.resource')
+
+        resp_content = {
+            'meta': {'user_xid': 'user_xid', 'message': 'message', 'code': 200, 'time': 1471463170},
+            'data': 'data'}
+        mock_request.side_effect = None
+        mock_request.return_value = (httplib2.Response({'status': httplib.OK}), json.dumps(resp_content))
+        with mock.patch('timeit.default_timer', side_effect=[0, upapi.base.DEADLINE + 1]):
+            self.assertRaises(upapi.exceptions.Timeout, self.upcreds.request, 'https://up.resource')
+
+        #
+        # A write that completed is not reported as timed out.
+        #
+        with mock.patch('timeit.default_timer', side_effect=[0, upapi.base.DEADLINE + 1, upapi.base.DEADLINE + 1]):
+            self.assertEqual(self.upcreds.request('https://up.resource', method='POST').data, 'data')
+
+    def test_request_deadline(self):
+        """
+        Verify the deadline cuts off a server that trickles its response, and the connection is not reused.
+        """
+        class Trickle(BaseHTTPServer.BaseHTTPRequestHandler):
+            def do_GET(self):
+                self.send_response(200)
+                self.send_header('Content-Length', '40')
+                self.end_headers()
+                try:
+                    for _ in range(40):
+                        self.wfile.write(b' ')
+                        self.wfile.flush()
+                        time.sleep(0.1)
+                except socket.error:
+                    pass
+
+            def log_message(self, format, *args):
+                pass
+
+        server = BaseHTTPServer.HTTPServer(('127.0.0.1', 0), Trickle)
+        thread = threading.Thread(target=server.handle_request)
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(thread.join)
+        self.credentials.authorize.side_effect = lambda http: http
+        up = upapi.base.UpApi(
+            self.app_id,
+            self.app_secret,
+            self.app_redirect_uri,
+            user_credentials=self.credentials,
+            timeout=1,
+            deadline=0.5,
+            breakers=None)
+        started = time.time()
+        self.assertRaises(
+            upapi.exceptions.Timeout,
+            up.request,
+            'http://127.0.0.1:{}/trickle'.format(server.server_address[1]))
+        self.assertLess(time.time() - started, 2)
+        self.assertNotIn(0.5, up._local.https)
+
+    @mock.patch('upapi.base.UpApi.refresh_token', autospec=True)
+    def test_transport(self, mock_refresh):
+        """
+        Verify requests and streams go through a shared transport with the credentials applied, refreshing an expired
+        token once.
+
+        :param mock_refresh: mocked token refresh method
+        """
+        meta = {'user_xid': 'user_xid', 'message': 'OK', 'code': 200, 'time': 1471463170}
+        self.credentials.apply = mock.Mock()
+        transport = mock.Mock(spec=upapi.transport.Http2Transport)
+        transport.request.side_effect = [
+            (httplib2.Response({'status': httplib.UNAUTHORIZED}), b'Unauthorized'),
+            (httplib2.Response({'status': httplib.OK}), json.dumps({'meta': meta, 'data': 'data'}).encode('utf-8'))]
+        up = upapi.base.UpApi(
+            self.app_id,
+            self.app_secret,
+            self.app_redirect_uri,
+            user_credentials=self.credentials,
+            transport=transport)
+        self.assertEqual(up.request(upapi.endpoints.USER).data, 'data')
+        self.assertEqual(mock_refresh.call_count, 1)
+        self.assertEqual(transport.request.call_count, 2)
+        args, kwargs = transport.request.call_args
+        self.assertEqual(args, (upapi.endpoints.USER, 'GET'))
+        self.assertEqual(kwargs['headers']['user-agent'], upapi.base.USERAGENT)
+        self.assertEqual(kwargs['timeout'], upapi.base.TIMEOUT)
+        self.credentials.apply.assert_called_with(kwargs['headers'])
+
+        body = json.dumps({'meta': meta, 'data': {'items': [{'xid': '0'}]}}).encode('utf-8')
+        resp = mock.Mock(status=httplib.OK, length=None)
+        resp.getheaders.return_value = []
+        resp.read.side_effect = [body, b'']
+        transport.stream.return_value = resp
+        self.assertEqual(list(up.stream_items(upapi.endpoints.USERMOVES)), [{'xid': '0'}])
+        transport.stream.assert_called_once_with(
+            upapi.endpoints.USERMOVES,
+            headers=mock.ANY,
+            timeout=upapi.base.TIMEOUT)
+
+    @mock.patch('httplib2.Http.request', autospec=True)
+    def test_request_breaker(self, mock_request):
+        """
+        Verify server errors open the endpoint family's breaker for every UpApi object sharing it, and that other
+        families and objects with circuit breaking disabled still send requests.
+
+        :param mock_request: mocked Http.request method
+        """
+        mock_request.return_value = (httplib2.Response({'status': httplib.SERVICE_UNAVAILABLE}), 'Unavailable')
+        self.upcreds.http.request = mock_request
+        for _ in range(upapi.breaker.FAILURE_THRESHOLD):
+            self.assertRaises(
+                upapi.exceptions.UnexpectedAPIResponse,
+                self.upcreds.request,
+                upapi.endpoints.USERMOVES)
+        self.assertEqual(mock_request.call_count, upapi.breaker.FAILURE_THRESHOLD)
+
+        other = upapi.base.UpApi(
+            self.app_id,
+            self.app_secret,
+            self.app_redirect_uri,
+            user_credentials=self.credentials)
+        other.http.request = mock_request
+        self.assertRaises(upapi.exceptions.CircuitOpen, self.upcreds.request, upapi.endpoints.MOVES.format(xid='a'))
+        self.assertRaises(upapi.exceptions.CircuitOpen, other.request, upapi.endpoints.USERMOVES)
+        self.assertEqual(mock_request.call_count, upapi.breaker.FAILURE_THRESHOLD)
+
+        self.assertRaises(upapi.exceptions.UnexpectedAPIResponse, other.request, upapi.endpoints.USERSLEEPS)
+        unguarded = upapi.base.UpApi(
+            self.app_id,
+            self.app_secret,
+            self.app_redirect_uri,
+            user_credentials=self.credentials,
+            breakers=None)
+        unguarded.http.request = mock_request
+        self.assertRaises(upapi.exceptions.UnexpectedAPIResponse, unguarded.request, upapi.endpoints.USERMOVES)
+        self.assertEqual(mock_request.call_count, upapi.breaker.FAILURE_THRESHOLD + 2)
+
+    def test_stream_breaker(self):
+        """
+        Verify a streaming probe that fails in an unexpected way still records its outcome, so the breaker keeps
+        probing instead of staying open for good.
+        """
+        registry = upapi.breaker.BreakerRegistry(failure_threshold=1, reset_timeout=0)
+        breaker = registry.get('moves')
+        breaker.allow()
+        breaker.record(False)
+        up = upapi.base.UpApi(
+            self.app_id,
+            self.app_secret,
+            self.app_redirect_uri,
+            user_credentials=self.credentials,
+            breakers=registry)
+        self.credentials.apply = mock.Mock(side_effect=ValueError('bad credentials'))
+        self.assertRaises(ValueError, list, up.stream_items(upapi.endpoints.USERMOVES))
+        self.assertEqual(breaker.state, upapi.breaker.OPEN)
+        self.assertTrue(breaker.allow())
+
+    @mock.patch('httplib2.Http.request', autospec=True)
+    def test_request_parse_pool(self, mock_request):
+        """
+        Verify responses are decoded by the parse pool when there is one.
+
+        :param mock_request: mocked Http.request method
+        """
+        resp_json = {
+            'meta': {'user_xid': 'user_xid', 'message': 'message', 'code': 200, 'time': 1471463170},
+            'data': 'data'}
+        mock_request.return_value = (httplib2.Response({'status': httplib.OK}), 'content')
+        self.upcreds.http.request = mock_request
+        self.upcreds.parse_pool = mock.Mock(spec=upapi.parsing.ParsePool)
+        self.upcreds.parse_pool.decode.return_value = resp_json
+        self.assertEqual(self.upcreds.request('https://up.resource').data, 'data')
+        self.upcreds.parse_pool.decode.assert_called_with('content', None)
+        self.upcreds.request('https://up.resource', columns=['time'])
+        self.upcreds.parse_pool.decode.assert_called_with('content', ['time'])
+
+        #
+        # Without a pool, columns are decoded in the calling thread.
+        #
+        content = json.dumps({'meta': resp_json['meta'], 'data': {'items': [{'time': 1}, {'time': 2}]}})
+        mock_request.return_value = (httplib2.Response({'status': httplib.OK}), content)
+        self.upcreds.parse_pool = None
+        items = self.upcreds.request('https://up.resource', columns=['time']).data['items']
+        self.assertEqual(list(items['time']), [1, 2])
+
+    @mock.patch('httplib2.Http.request', autospec=True)
+    @mock.patch('httplib2.Response', autospec=True)
+    def test__request_post(self, mock_resp, mock_request):
+        """
+        Verify _request form-encodes POST data.
+
+        :param mock_resp: mocked Response object
+        :param mock_request: mocked Http.request method
+        """
+        mock_resp.status = httplib.CREATED
+        resp_content = {
+            'meta': {'user_xid': 'user_xid', 'message': 'message', 'code': 201, 'time': 1471463170},
+            'data': {'xid': 'xid'}}
+        mock_request.return_value = (mock_resp, json.dumps(resp_content))
+        self.upcreds.http.request = mock_request
+        data = self.upcreds._request(
+            'https://up.resource',
+            method='POST',
+            data={'title': 'title', 'attributes': {'key': 'val'}},
+            ok_statuses=[httplib.CREATED])
+        self.assertEqual(data, resp_content['data'])
+        args, kwargs = mock_request.call_args
+        self.assertEqual(args, ('https://up.resource', 'POST'))
+        self.assertEqual(kwargs['headers'], {'Content-Type': 'application/x-www-form-urlencoded'})
+        self.assertEqual(
+            urlparse.parse_qs(kwargs['body']),
+            {'title': ['title'], 'attributes': [json.dumps({'key': 'val'})]})
+
+    @mock.patch('upapi.base.UpApi._request', autospec=True)
+    def test_post(self, mock_request):
+        """
+        Verify post uses the correct HTTP method
+
+        :param mock_request: mocked _request method
+        """
+        resource = 'https://up.resource'
+        self.up.post(resource, {'key': 'val'})
+        mock_request.assert_called_with(
+            self.up,
+            resource,
+            method='POST',
+            data={'key': 'val'},
+            ok_statuses=[httplib.OK, httplib.CREATED])
+
+    @mock.patch('httplib2.Http', autospec=True)
+    def test_http(self, mock_http):
+        """
+        Verify each thread gets its own Http object, which is replaced when the credentials change.
+
+        :param mock_http: mock httplib class
+        """
+        self.credentials.authorize.side_effect = lambda http: mock.Mock()
+        up = upapi.base.UpApi(
+            self.app_id,
+            self.app_secret,
+            self.app_redirect_uri,
+            user_credentials=self.credentials)
+        main_http = up.http
+        self.assertIs(up.http, main_http)
+
+        thread_https = []
+        thread = threading.Thread(target=lambda: thread_https.append(up.http))
+        thread.start()
+        thread.join()
+        self.assertIsNot(thread_https[0], main_http)
+
+        up.credentials = self.credentials
+        self.assertIsNot(up.http, main_http)
+
     @mock.patch('upapi.base.UpApi._request', autospec=True)
     def test_delete(self, mock_request):
         """
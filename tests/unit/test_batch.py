@@ -0,0 +1,71 @@
+"""
+Unit tests for upapi.batch
+"""
+import threading
+import unittest
+import upapi.batch
+
+
+class TestRun(unittest.TestCase):
+    """
+    Tests upapi.batch.run and stream
+    """
+
+    def test_run(self):
+        """
+        Verify results come back in order with errors captured per item.
+        """
+        def square(item):
+            if item == 3:
+                raise ValueError('bad item')
+            return item * item
+
+        results = upapi.batch.run(square, range(5), max_workers=2)
+        self.assertEqual([result.item for result in results], [0, 1, 2, 3, 4])
+        self.assertEqual([result.value for result in results], [0, 1, 4, None, 16])
+        self.assertIsInstance(results[3].error, ValueError)
+        self.assertEqual([result.error for result in results if result.item != 3], [None] * 4)
+
+    def test_run_max_workers(self):
+        """
+        Verify no more than max_workers calls run at once.
+        """
+        lock = threading.Lock()
+        running = [0]
+        peak = [0]
+
+        def track(_):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            threading.Event().wait(0.01)
+            with lock:
+                running[0] -= 1
+
+        upapi.batch.run(track, range(20), max_workers=3)
+        self.assertLessEqual(peak[0], 3)
+
+    def test_run_empty(self):
+        """
+        Verify an empty batch does nothing.
+        """
+        self.assertEqual(upapi.batch.run(None, []), [])
+
+    def test_stream(self):
+        """
+        Verify items are taken from the iterable a chunk at a time, at most two chunks ahead of the results.
+        """
+        taken = []
+
+        def items():
+            for item in range(10):
+                taken.append(item)
+                yield item
+
+        results = upapi.batch.stream(lambda item: item * 2, items(), max_workers=2, chunk_size=3)
+        self.assertEqual(taken, [])
+        self.assertEqual(next(results).value, 0)
+        self.assertEqual(taken, list(range(6)))
+        self.assertEqual([result.value for result in results], list(range(2, 20, 2)))
+        self.assertEqual(upapi.batch.run(lambda item: item, items(), chunk_size=4)[-1].item, 9)
+
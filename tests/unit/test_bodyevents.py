@@ -0,0 +1,105 @@
+"""
+Unit tests for the BodyEvents object
+"""
+import math
+import mock
+import tests.unit
+import upapi.endpoints
+import upapi.user.bodyevents
+
+
+class TestBodyEvents(tests.unit.TestResource):
+    """
+    Tests upapi.user.bodyevents.BodyEvents
+    """
+
+    @mock.patch('upapi.user.bodyevents.BodyEvents.stream_items', autospec=True)
+    def setUp(self, mock_stream):
+        """
+        Stream weigh-ins, newest first like the API, with a duplicate and one without a weight.
+
+        :param mock_stream: mocked stream_items method
+        """
+        super(TestBodyEvents, self).setUp()
+        mock_stream.return_value = iter([
+            {'xid': 'c', 'time_created': 300, 'weight': 80.5, 'body_fat': 20},
+            {'xid': 'b', 'time_created': 200, 'body_fat': 21},
+            {'xid': 'a', 'time_created': 100, 'weight': 81},
+            {'xid': 'a', 'time_created': 100, 'weight': 81.5}])
+        self.body_events = upapi.user.bodyevents.BodyEvents(
+            self.app_id,
+            self.app_secret,
+            app_redirect_uri=self.app_redirect_uri,
+            user_credentials=self.credentials,
+            params={'start_time': 0})
+        mock_stream.assert_called_with(self.body_events, upapi.endpoints.USERBODYEVENTS, {'start_time': 0})
+
+    def test___init__(self):
+        """
+        Verify events are sorted by time and deduplicated by xid.
+        """
+        self.assertEqual(len(self.body_events), 3)
+        self.assertEqual(list(self.body_events.times), [100, 200, 300])
+        self.assertEqual(self.body_events.xids, ['a', 'b', 'c'])
+        weights = self.body_events.values['weight']
+        self.assertEqual([weights[0], weights[2]], [81.5, 80.5])
+        self.assertTrue(math.isnan(weights[1]))
+        self.assertEqual(list(self.body_events.values['body_fat'])[1:], [21, 20])
+
+    def test_between(self):
+        """
+        Verify range lookups are inclusive and leave out missing measurements.
+        """
+        times, weights = self.body_events.between(100, 300)
+        self.assertEqual((list(times), list(weights)), ([100, 300], [81.5, 80.5]))
+        times, fats = self.body_events.between(150, 250, metric='body_fat')
+        self.assertEqual((list(times), list(fats)), ([200], [21]))
+        self.assertEqual(len(self.body_events.between(400, 500)[0]), 0)
+
+    def test_latest(self):
+        """
+        Verify the most recent measurement, optionally before a time.
+        """
+        self.assertEqual(self.body_events.latest(), (300, 80.5))
+        self.assertEqual(self.body_events.latest(before=299), (100, 81.5))
+        self.assertEqual(self.body_events.latest('body_fat', before=250), (200, 21))
+        self.assertIsNone(self.body_events.latest('bmi'))
+        self.assertIsNone(self.body_events.latest(before=50))
+
+    @mock.patch('upapi.user.bodyevents.BodyEvents.stream_items', autospec=True)
+    def test_refresh(self, mock_stream):
+        """
+        Verify refresh fetches what was updated since the last update, including edits to older events, and merges
+        new and changed events in place.
+
+        :param mock_stream: mocked stream_items method
+        """
+        mock_stream.return_value = iter([
+            {'xid': 'e', 'time_created': 400, 'time_updated': 400, 'weight': 79},
+            {'xid': 'a', 'time_created': 100, 'time_updated': 450, 'weight': 80}])
+        self.assertEqual(self.body_events.refresh(), 1)
+        mock_stream.assert_called_with(self.body_events, upapi.endpoints.USERBODYEVENTS, {'updated_after': 300})
+        self.assertEqual(self.body_events.updated, 450)
+        self.assertEqual(self.body_events.xids, ['a', 'b', 'c', 'e'])
+        self.assertEqual(self.body_events.between(100, 400)[1].tolist(), [80, 80.5, 79])
+
+        mock_stream.return_value = iter([])
+        self.assertEqual(self.body_events.refresh(), 0)
+        mock_stream.assert_called_with(self.body_events, upapi.endpoints.USERBODYEVENTS, {'updated_after': 450})
+
+        self.assertEqual(self.body_events.merge([{'xid': 'd', 'time_created': 250, 'weight': 82}]), 1)
+        self.assertEqual(self.body_events.xids, ['a', 'b', 'd', 'c', 'e'])
+        self.assertEqual(list(self.body_events.times), [100, 200, 250, 300, 400])
+        self.assertEqual(self.body_events.merge([{'xid': 'f', 'time_created': 500, 'weight': 78}]), 1)
+        self.assertEqual(self.body_events.xids[-1], 'f')
+        self.assertEqual(self.body_events.latest(), (500, 78))
+
+    @mock.patch('upapi.user.bodyevents.BodyEvents.get_item', autospec=True)
+    def test_get_body_event(self, mock_get_item):
+        """
+        Verify one body event is fetched by xid through the mirror.
+
+        :param mock_get_item: mocked get_item method
+        """
+        self.body_events.get_body_event('a')
+        mock_get_item.assert_called_with(self.body_events, upapi.endpoints.BODYEVENTS, 'a')
@@ -0,0 +1,120 @@
+"""
+Unit tests for upapi.breaker
+"""
+import mock
+import unittest
+import upapi.breaker
+import upapi.endpoints
+import upapi.exceptions
+
+
+class TestFamily(unittest.TestCase):
+    """
+    Tests upapi.breaker.family
+    """
+
+    def test_family(self):
+        """
+        Verify lists, items and sub-resources of a kind share a family.
+        """
+        self.assertEqual(upapi.breaker.family(upapi.endpoints.USERMOVES), 'moves')
+        self.assertEqual(upapi.breaker.family('{}?date=20170201'.format(upapi.endpoints.USERMOVES)), 'moves')
+        self.assertEqual(upapi.breaker.family(upapi.endpoints.MOVESTICKS.format(xid='abc')), 'moves')
+        self.assertEqual(upapi.breaker.family(upapi.endpoints.SLEEPS.format(xid='abc')), 'sleeps')
+        self.assertEqual(upapi.breaker.family(upapi.endpoints.USER), 'users')
+        self.assertEqual(upapi.breaker.family('https://up.resource'), '')
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """
+    Tests upapi.breaker.CircuitBreaker
+    """
+
+    def setUp(self):
+        """
+        Create a breaker that opens after two failures.
+        """
+        self.breaker = upapi.breaker.CircuitBreaker('moves', failure_threshold=2, reset_timeout=30)
+
+    @mock.patch('timeit.default_timer')
+    def test_open(self, mock_timer):
+        """
+        Verify consecutive failures open the breaker, and successes reset the count.
+
+        :param mock_timer: mocked timer
+        """
+        mock_timer.return_value = 100
+        self.assertFalse(self.breaker.allow())
+        self.breaker.record(False)
+        self.breaker.allow()
+        self.breaker.record(True)
+        self.assertEqual(self.breaker.failures, 0)
+        for _ in range(2):
+            self.breaker.allow()
+            self.breaker.record(False)
+        self.assertEqual(self.breaker.state, upapi.breaker.OPEN)
+        self.assertRaises(upapi.exceptions.CircuitOpen, self.breaker.allow)
+
+        #
+        # A late success of a request sent before the breaker tripped does not close it.
+        #
+        self.breaker.record(True)
+        self.assertEqual(self.breaker.state, upapi.breaker.OPEN)
+
+    @mock.patch('timeit.default_timer')
+    def test_half_open(self, mock_timer):
+        """
+        Verify one probe goes through after the cool-down, and its outcome closes or reopens the breaker.
+
+        :param mock_timer: mocked timer
+        """
+        mock_timer.return_value = 100
+        for _ in range(2):
+            self.breaker.record(False)
+
+        #
+        # A failed probe reopens the breaker for another cool-down.
+        #
+        mock_timer.return_value = 130
+        self.assertTrue(self.breaker.allow())
+        self.assertEqual(self.breaker.state, upapi.breaker.HALF_OPEN)
+        self.assertRaises(upapi.exceptions.CircuitOpen, self.breaker.allow)
+
+        #
+        # Late outcomes of other requests neither close the breaker nor free the probe.
+        #
+        self.breaker.record(True)
+        self.assertEqual(self.breaker.state, upapi.breaker.HALF_OPEN)
+        self.assertRaises(upapi.exceptions.CircuitOpen, self.breaker.allow)
+        self.breaker.record(False, probe=True)
+        self.assertEqual(self.breaker.state, upapi.breaker.OPEN)
+        mock_timer.return_value = 159
+        self.assertRaises(upapi.exceptions.CircuitOpen, self.breaker.allow)
+
+        #
+        # A successful probe closes it.
+        #
+        mock_timer.return_value = 160
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record(True, probe=True)
+        self.assertEqual(self.breaker.state, upapi.breaker.CLOSED)
+        self.breaker.allow()
+        self.breaker.allow()
+
+
+class TestBreakerRegistry(unittest.TestCase):
+    """
+    Tests upapi.breaker.BreakerRegistry
+    """
+
+    def test_get(self):
+        """
+        Verify each family gets one breaker with the registry's settings, until reset.
+        """
+        registry = upapi.breaker.BreakerRegistry(failure_threshold=3, reset_timeout=5)
+        moves = registry.get('moves')
+        self.assertIs(registry.get('moves'), moves)
+        self.assertIsNot(registry.get('sleeps'), moves)
+        self.assertEqual((moves.name, moves.failure_threshold, moves.reset_timeout), ('moves', 3, 5))
+        registry.reset()
+        self.assertIsNot(registry.get('moves'), moves)
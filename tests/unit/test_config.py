@@ -0,0 +1,77 @@
+"""
+Unit tests for upapi.config
+"""
+import mock
+import oauth2client.client
+import threading
+import unittest
+import upapi.base
+import upapi.config
+import upapi.endpoints
+import upapi.scopes
+
+
+class TestAppConfig(unittest.TestCase):
+    """
+    Tests upapi.config.AppConfig
+    """
+
+    def test___new__(self):
+        """
+        Verify scope defaults and lists of scopes become hashable tuples.
+        """
+        config = upapi.config.AppConfig('app_id', 'app_secret', 'redirect_uri')
+        self.assertEqual(config.scope, upapi.scopes.BASIC_READ)
+        self.assertEqual((config.auth_uri, config.token_uri), (upapi.endpoints.AUTH, upapi.endpoints.TOKEN))
+        config = upapi.config.AppConfig(
+            'app_id',
+            'app_secret',
+            'redirect_uri',
+            [upapi.scopes.MOVE_READ, upapi.scopes.SLEEP_READ])
+        self.assertEqual(config.scope, (upapi.scopes.MOVE_READ, upapi.scopes.SLEEP_READ))
+        self.assertEqual(hash(config), hash(config._replace()))
+
+    @mock.patch.dict('upapi.config._flows', clear=True)
+    @mock.patch('oauth2client.client.OAuth2WebServerFlow', side_effect=oauth2client.client.OAuth2WebServerFlow)
+    def test_flow(self, mock_flow):
+        """
+        Verify equal configs build one flow even when many threads ask at once, and each caller gets its own copy.
+
+        :param mock_flow: mocked flow class
+        """
+        configs = [upapi.config.AppConfig('app_id', 'app_secret', 'redirect_uri', token_uri='token_uri')] * 8
+        flows = []
+        threads = [threading.Thread(target=lambda config=config: flows.append(config.flow)) for config in configs]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(set(id(flow) for flow in flows)), 8)
+        flows[0].redirect_uri = 'changed'
+        flows[0].params['access_type'] = 'online'
+        self.assertEqual(configs[0].flow.redirect_uri, 'redirect_uri')
+        self.assertEqual(configs[0].flow.params, flows[1].params)
+        self.assertNotEqual(flows[0].params, flows[1].params)
+        mock_flow.assert_called_once_with(
+            'app_id',
+            client_secret='app_secret',
+            scope=upapi.scopes.BASIC_READ,
+            redirect_uri='redirect_uri',
+            user_agent=upapi.base.USERAGENT,
+            auth_uri=upapi.endpoints.AUTH,
+            token_uri='token_uri')
+
+        configs[0]._replace(redirect_uri='other_uri').flow
+        self.assertEqual(mock_flow.call_count, 2)
+        self.assertEqual(mock_flow.call_args[1]['redirect_uri'], 'other_uri')
+
+    @mock.patch.dict('upapi.config._flows', clear=True)
+    @mock.patch('upapi.config.MAX_FLOWS', 2)
+    def test_flow_bounded(self):
+        """
+        Verify only the most recently used flows are kept.
+        """
+        configs = [upapi.config.AppConfig('app_id', 'app_secret', uri) for uri in ['one', 'two', 'three']]
+        for config in configs + configs[1:2]:
+            config.flow
+        self.assertEqual(list(upapi.config._flows), [configs[2], configs[1]])
@@ -0,0 +1,207 @@
+"""
+Unit tests for the Events, GenericEvents and Moods objects
+"""
+import json
+import mock
+import tempfile
+import tests.unit
+import unittest
+import upapi.base
+import upapi.endpoints
+import upapi.exceptions
+import upapi.fakeserver
+import upapi.mirror
+import upapi.user.events
+
+
+class TestEvents(tests.unit.TestResource):
+    """
+    Tests upapi.user.events.Events
+    """
+
+    def setUp(self):
+        """
+        Create an Events object.
+        """
+        super(TestEvents, self).setUp()
+        self.events = upapi.user.events.Events(
+            self.app_id,
+            self.app_secret,
+            self.app_redirect_uri,
+            user_credentials=self.credentials)
+
+    @mock.patch('upapi.user.events.Events.post', autospec=True)
+    def test_create_meal(self, mock_post):
+        """
+        Verify meal creation posts to the user's meals.
+
+        :param mock_post: mocked post method
+        """
+        items = [{'name': 'apple', 'amount': 1}]
+        self.events.create_meal('Lunch', items=items)
+        mock_post.assert_called_with(self.events, upapi.endpoints.USERMEALS, {'note': 'Lunch', 'items': items})
+
+    @mock.patch('upapi.user.events.Events.post', autospec=True)
+    def test_update_workout(self, mock_post):
+        """
+        Verify workout updates post to the partial update endpoint.
+
+        :param mock_post: mocked post method
+        """
+        self.events.update_workout('xid', calories=100)
+        mock_post.assert_called_with(
+            self.events,
+            upapi.endpoints.WORKOUTSUPDATE.format(xid='xid'),
+            {'calories': 100})
+
+    @mock.patch('upapi.user.events.Events.post', autospec=True)
+    def test_create_unknown_field(self, mock_post):
+        """
+        Verify unknown fields are rejected before hitting the API.
+
+        :param mock_post: mocked post method
+        """
+        self.assertRaises(TypeError, self.events.create_mood, 'ok', 4, weight=80)
+        self.assertFalse(mock_post.called)
+
+    @mock.patch('upapi.user.events.Events.delete', autospec=True)
+    def test_delete_body_event(self, mock_delete):
+        """
+        Verify body event deletion.
+
+        :param mock_delete: mocked delete method
+        """
+        self.events.delete_body_event('xid')
+        mock_delete.assert_called_with(self.events, upapi.endpoints.BODYEVENTS.format(xid='xid'))
+
+    @mock.patch('upapi.user.events.Events.post', autospec=True)
+    @mock.patch('upapi.user.events.Events.delete', autospec=True)
+    def test_submit(self, mock_delete, mock_post):
+        """
+        Verify a batch reports each operation's result.
+
+        :param mock_delete: mocked delete method
+        :param mock_post: mocked post method
+        """
+        mock_post.return_value = {'xid': 'new_xid'}
+        mock_delete.side_effect = upapi.exceptions.UnexpectedAPIResponse('404')
+        results = self.events.submit([
+            ('create_generic_event', {'title': 'title', 'verb': 'did'}),
+            ('delete_mood', {'xid': 'xid'}),
+            ('disconnect', {}),
+            ('_write', {'operation': ('delete_mood', {'xid': 'xid'})})])
+        self.assertEqual(results[0].value, {'xid': 'new_xid'})
+        self.assertIsNone(results[0].error)
+        self.assertIsInstance(results[1].error, upapi.exceptions.UnexpectedAPIResponse)
+        self.assertIsInstance(results[2].error, ValueError)
+        self.assertIsInstance(results[3].error, ValueError)
+        self.assertEqual(mock_delete.call_count, 1)
+
+
+class TestEventsMirror(unittest.TestCase):
+    """
+    Tests writes through upapi.user.events.Events with a mirror, against the fake server
+    """
+
+    def setUp(self):
+        """
+        Start a fake server and create an Events object with a mirror for one of its users.
+        """
+        self.fake = upapi.fakeserver.FakeUpApi(users=1, items=3).start()
+        self.addCleanup(self.fake.stop)
+        config = self.fake.config()
+        up = upapi.base.UpApi(config)
+        self.events = upapi.user.events.Events(
+            config,
+            user_credentials=up.token_to_creds(self.fake.token(self.fake.users[0])),
+            mirror=upapi.mirror.Mirror(),
+            breakers=None)
+
+    def test_update_and_delete(self):
+        """
+        Verify get_item sees an update and a delete instead of the mirrored copy.
+        """
+        xid = self.fake.event(self.fake.users[0], 'meals', 0)['xid']
+        self.events.get_item(upapi.endpoints.MEALS, xid)
+        self.events.get_item(upapi.endpoints.MEALS, xid)
+        self.assertEqual(self.events.update_meal(xid, note='updated')['note'], 'updated')
+        self.assertEqual(self.events.get_item(upapi.endpoints.MEALS, xid)['note'], 'updated')
+
+        self.events.delete_meal(xid)
+        self.assertRaises(upapi.exceptions.NotFound, self.events.get_item, upapi.endpoints.MEALS, xid)
+
+
+class TestEventLog(unittest.TestCase):
+    """
+    Tests upapi.user.events.GenericEvents and Moods
+    """
+
+    def setUp(self):
+        """
+        Start a fake server.
+        """
+        self.fake = upapi.fakeserver.FakeUpApi(users=2, items=7, page_size=3).start()
+        self.addCleanup(self.fake.stop)
+        self.config = self.fake.config()
+
+    def log(self, cls, user_xid):
+        """
+        Create an event log for a user.
+
+        :param cls: GenericEvents or Moods
+        :param user_xid: fake user xid
+        :return: the event log
+        """
+        up = upapi.base.UpApi(self.config)
+        return cls(self.config, user_credentials=up.token_to_creds(self.fake.token(user_xid)), breakers=None)
+
+    def test_export_import(self):
+        """
+        Verify a user's generic events export across pages and import into another user, reporting each event.
+        """
+        source = self.log(upapi.user.events.GenericEvents, self.fake.users[0])
+        target = self.log(upapi.user.events.GenericEvents, self.fake.users[1])
+        with tempfile.TemporaryFile('w+') as exported:
+            self.assertEqual(source.export(exported), 7)
+            exported.seek(0)
+            events = [json.loads(line) for line in exported]
+        self.assertEqual(events, self.fake.events(self.fake.users[0], 'generic_events'))
+
+        results = target.import_events(events, max_workers=3)
+        self.assertEqual([result.error for result in results], [None] * 7)
+        self.assertEqual(
+            sorted(result.value['title'] for result in results),
+            sorted(event['title'] for event in events))
+        self.assertEqual(len(list(target.stream())), 14)
+        self.assertEqual(target.get_event(results[0].value['xid'])['title'], events[0]['title'])
+        target.mirror = upapi.mirror.Mirror()
+        event = target.get_event(results[0].value['xid'])
+        self.assertEqual(target.mirror.get_item(target.user_xid, event['xid']), event)
+
+        results = target.import_events([{'note': 'no title'}, {'title': 'titled'}])
+        self.assertIsInstance(results[0].error, TypeError)
+        self.assertIsNone(results[1].error)
+
+        results = target.update_events([(results[1].value['xid'], {'note': 'moved'}), (events[0]['xid'], {})])
+        self.assertEqual(results[0].value['note'], 'moved')
+        self.assertIsInstance(results[1].error, upapi.exceptions.NotFound)
+
+    def test_moods(self):
+        """
+        Verify moods import and delete in batches.
+        """
+        moods = self.log(upapi.user.events.Moods, self.fake.users[0])
+        results = moods.import_events([{'title': 'great', 'sub_type': 2, 'xid': 'old'}, {'title': 'meh'}])
+        self.assertEqual(results[0].value['sub_type'], '2')
+        self.assertIsInstance(results[1].error, TypeError)
+        self.assertEqual(len(list(moods.stream({'limit': 100}))), 8)
+
+        results = moods.delete_events([results[0].value['xid']])
+        self.assertIsNone(results[0].error)
+        self.assertEqual(len(list(moods.stream())), 7)
+
+        results = moods.stream_import(iter([{'title': 'fine', 'sub_type': 3}]))
+        self.assertEqual(len(list(moods.stream())), 7)
+        self.assertEqual(next(results).value['title'], 'fine')
+        self.assertEqual(list(results), [])
+        self.assertEqual(len(list(moods.stream())), 8)
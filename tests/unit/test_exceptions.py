@@ -0,0 +1,41 @@
+"""
+Unit tests for upapi.exceptions
+"""
+import mock
+import unittest
+import upapi.exceptions
+
+
+class TestAPIError(unittest.TestCase):
+    """
+    Tests upapi.exceptions.APIError
+    """
+
+    @mock.patch('time.time', return_value=1485999060)
+    def test_retry_after(self, mock_time):
+        """
+        Verify Retry-After is read as seconds or as an HTTP date.
+
+        :param mock_time: mocked clock
+        """
+        def retry_after(value):
+            return upapi.exceptions.RateLimited('429', headers={'retry-after': value}).retry_after
+
+        self.assertEqual(retry_after('120'), 120)
+        self.assertEqual(retry_after('-5'), 0)
+        self.assertEqual(retry_after('Thu, 02 Feb 2017 01:47:40 GMT'), 1000)
+        self.assertEqual(retry_after('Wed, 01 Feb 2017 00:00:00 GMT'), 0)
+        self.assertIsNone(retry_after('soon'))
+        self.assertIsNone(upapi.exceptions.RateLimited('429').retry_after)
+
+    def test_for_status(self):
+        """
+        Verify the hierarchy and the class picked for each status.
+        """
+        self.assertIs(upapi.exceptions.for_status(401), upapi.exceptions.AuthError)
+        self.assertIs(upapi.exceptions.for_status(429), upapi.exceptions.RateLimited)
+        self.assertIs(upapi.exceptions.for_status(503), upapi.exceptions.ServerError)
+        self.assertIs(upapi.exceptions.for_status(409), upapi.exceptions.UnexpectedAPIResponse)
+        for error in (upapi.exceptions.AuthError, upapi.exceptions.NotFound, upapi.exceptions.RateLimited):
+            self.assertTrue(issubclass(error, upapi.exceptions.UnexpectedAPIResponse))
+        self.assertTrue(issubclass(upapi.exceptions.Timeout, upapi.exceptions.APIError))
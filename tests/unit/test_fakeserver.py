@@ -0,0 +1,200 @@
+"""
+Unit tests for upapi.fakeserver, driving the fake server with the SDK.
+"""
+import io
+import json
+import threading
+import unittest
+import upapi.base
+import upapi.endpoints
+import upapi.exceptions
+import upapi.fakeserver
+
+try:
+    import http.server as BaseHTTPServer
+except ImportError:
+    import BaseHTTPServer
+
+
+class TestFakeUpApi(unittest.TestCase):
+    """
+    Tests upapi.fakeserver.FakeUpApi
+    """
+
+    def setUp(self):
+        """
+        Start a fake server and a client for its first user.
+        """
+        self.fake = upapi.fakeserver.FakeUpApi(users=2, items=12, page_size=5).start()
+        self.user_xid = self.fake.users[0]
+        self.up = upapi.base.UpApi(self.fake.config(), breakers=None)
+        self.up.token = self.fake.token(self.user_xid)
+
+    def tearDown(self):
+        """
+        Stop the fake server.
+        """
+        self.fake.stop()
+
+    def test_oauth(self):
+        """
+        Verify the OAuth code exchange and refreshing expired tokens.
+        """
+        up = upapi.base.UpApi(self.fake.config(), breakers=None)
+        token = up.get_up_token('http://app/callback?code={}'.format(self.fake.authorization_code(self.user_xid)))
+        self.assertTrue(token['access_token'].startswith('access-{}'.format(self.user_xid)))
+        self.assertEqual(up.get(upapi.endpoints.USER)['xid'], self.user_xid)
+
+        self.fake.expire_tokens()
+        self.assertEqual(up.get(upapi.endpoints.USER)['xid'], self.user_xid)
+        self.assertNotEqual(up.token['access_token'], token['access_token'])
+
+    def test_lists(self):
+        """
+        Verify paged list endpoints, single resources, ticks and friends, generated deterministically.
+        """
+        url = upapi.endpoints.USERMOVES
+        moves = list(self.up.stream_items(url))
+        pages = list(self.up.get_pages(url))
+        self.assertEqual(len(moves), 12)
+        self.assertEqual([len(page['items']) for page in pages], [5, 5, 2])
+        self.assertEqual(moves, [item for page in pages for item in page['items']])
+        self.assertEqual(moves[0], upapi.fakeserver.FakeUpApi(users=2, items=12).event(self.user_xid, 'moves', 0))
+
+        move = self.up.get(upapi.endpoints.MOVES.format(xid=moves[3]['xid']))
+        self.assertEqual(move, moves[3])
+        ticks = list(self.up.stream_items(upapi.endpoints.MOVESTICKS.format(xid=move['xid'])))
+        self.assertEqual(ticks[0]['time'], move['time_created'])
+        dated = self.up.get('{}?date={}'.format(upapi.endpoints.USERMOVES, move['date']))
+        self.assertEqual(dated['items'], [move])
+        updated_after = moves[1]['time_updated']
+        updated = self.up.get('{}?updated_after={}'.format(upapi.endpoints.USERMOVES, updated_after))
+        self.assertEqual(updated['items'], [moves[0]])
+
+        friends = self.up.get(upapi.endpoints.USERFRIENDS)
+        self.assertEqual(friends['items'], [{'xid': self.fake.users[1]}])
+        self.assertRaises(
+            upapi.exceptions.NotFound,
+            self.up.get,
+            upapi.endpoints.MOVES.format(xid='missing'))
+
+    def test_writes(self):
+        """
+        Verify created events are listed and deleted ones are gone.
+        """
+        meal = self.up.post(upapi.endpoints.USERMEALS, {'note': 'lunch'})
+        meals = self.up.get(upapi.endpoints.USERMEALS)['items']
+        self.assertEqual(meals[0], meal)
+        self.assertEqual(meal['note'], 'lunch')
+        self.up.delete(upapi.endpoints.MEALS.format(xid=meal['xid']))
+        self.assertNotEqual(self.up.get(upapi.endpoints.USERMEALS)['items'][0]['xid'], meal['xid'])
+
+    def test_faults(self):
+        """
+        Verify injected rate limiting, server errors and truncated bodies.
+        """
+        url = upapi.endpoints.USER
+        self.fake.faults.retry_after = 7
+        self.fake.faults.fail_next(upapi.fakeserver.RATE_LIMITED)
+        with self.assertRaises(upapi.exceptions.RateLimited) as context:
+            self.up.get(url)
+        self.assertEqual(context.exception.retry_after, 7)
+
+        self.fake.faults.fail_next(upapi.fakeserver.SERVER_ERROR)
+        self.assertRaises(upapi.exceptions.ServerError, self.up.get, url)
+
+        self.fake.faults.fail_next(upapi.fakeserver.TRUNCATED)
+        self.assertRaises(upapi.exceptions.IncompleteResponse, self.up.get, url)
+        self.assertEqual(self.up.get(url)['xid'], self.user_xid)
+
+    def test_faults_streamed(self):
+        """
+        Verify streamed and downloaded errors carry lowercase headers, so Retry-After is found, and truncated bodies
+        raise IncompleteResponse.
+        """
+        url = upapi.endpoints.USERMOVES
+        self.fake.faults.retry_after = 7
+        self.fake.faults.fail_next(upapi.fakeserver.RATE_LIMITED)
+        with self.assertRaises(upapi.exceptions.RateLimited) as context:
+            list(self.up.stream_items(url))
+        self.assertEqual(context.exception.retry_after, 7)
+        self.assertIn('retry-after', context.exception.headers)
+
+        self.fake.faults.fail_next(upapi.fakeserver.RATE_LIMITED)
+        with self.assertRaises(upapi.exceptions.RateLimited) as context:
+            self.up.download(upapi.endpoints.MOVESGRAPH.format(xid='xid'), io.BytesIO())
+        self.assertEqual(context.exception.retry_after, 7)
+
+        list(self.up.stream_items(url))
+        self.assertIn('content-type', self.up.last_response.headers)
+
+        self.fake.faults.fail_next(upapi.fakeserver.TRUNCATED)
+        self.assertRaises(upapi.exceptions.IncompleteResponse, list, self.up.stream_items(url))
+        self.fake.faults.fail_next(upapi.fakeserver.TRUNCATED)
+        self.assertRaises(
+            upapi.exceptions.IncompleteResponse,
+            self.up.download,
+            upapi.endpoints.MOVESGRAPH.format(xid=self.fake.event(self.user_xid, 'moves', 0)['xid']),
+            io.BytesIO())
+
+    def test_faults_rates(self):
+        """
+        Verify fault rates are drawn from the seeded generator.
+        """
+        faults = [upapi.fakeserver.Faults(rate_limited=0.2, server_error=0.2, seed=1) for _ in range(2)]
+        draws = [[fault.draw() for _ in range(50)] for fault in faults]
+        self.assertEqual(draws[0], draws[1])
+        self.assertEqual(set(draws[0]), set([None, upapi.fakeserver.RATE_LIMITED, upapi.fakeserver.SERVER_ERROR]))
+
+    def test_pubsub(self):
+        """
+        Verify webhooks registered through the pubsub endpoint get notifications.
+        """
+        received = []
+
+        class Webhook(BaseHTTPServer.BaseHTTPRequestHandler):
+            def do_POST(self):
+                received.append(json.loads(self.rfile.read(int(self.headers['Content-Length'])).decode('utf-8')))
+                self.send_response(200)
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        server = BaseHTTPServer.HTTPServer(('127.0.0.1', 0), Webhook)
+        thread = threading.Thread(target=server.handle_request)
+        thread.start()
+        try:
+            webhook = 'http://127.0.0.1:{}/hook'.format(server.server_address[1])
+            self.up.post(upapi.endpoints.PUBSUB, {'webhook': webhook})
+            self.assertEqual(self.fake.notify(self.user_xid, 'move', event_xid='xid'), 200)
+        finally:
+            thread.join()
+            server.server_close()
+        event = received[0]['events'][0]
+        self.assertEqual((event['user_xid'], event['type'], event['action']), (self.user_xid, 'move', 'creation'))
+
+
+class TestDomain(unittest.TestCase):
+    """
+    Tests pointing an app at the fake server through upapi.config.AppConfig's domain
+    """
+
+    def test_domain(self):
+        """
+        Verify a config with a domain sends requests, streamed pages and token refreshes to that server.
+        """
+        self.assertEqual(
+            upapi.endpoints.on_domain(upapi.endpoints.USERMOVES, 'http://127.0.0.1:8080/'),
+            'http://127.0.0.1:8080/nudge/api/v.1.1/users/@me/moves')
+        self.assertEqual(upapi.endpoints.on_domain(upapi.endpoints.USERMOVES, None), upapi.endpoints.USERMOVES)
+
+        with upapi.fakeserver.FakeUpApi(users=1, items=7, page_size=3) as fake:
+            config = fake.config()
+            self.assertEqual(config.token_uri, '{}/auth/oauth2/token'.format(fake.url))
+            up = upapi.base.UpApi(config, breakers=None)
+            up.token = fake.token(fake.users[0])
+            self.assertEqual(up.get(upapi.endpoints.USER)['xid'], fake.users[0])
+            self.assertEqual(len(list(up.stream_items(upapi.endpoints.USERMOVES))), 7)
+            self.assertEqual(sum(len(page['items']) for page in up.get_pages(upapi.endpoints.USERMOVES)), 7)
+            self.assertIn('access_token', up.refresh_token())
@@ -0,0 +1,107 @@
+"""
+Unit tests for the FriendsGraph object
+"""
+import mock
+import time
+import unittest
+import upapi.base
+import upapi.endpoints
+import upapi.exceptions
+import upapi.meta
+import upapi.response
+import upapi.user.friendsgraph
+
+
+class TestFriendsGraph(unittest.TestCase):
+    """
+    Tests upapi.user.friendsgraph.FriendsGraph
+    """
+
+    def setUp(self):
+        """
+        Create a graph and some authorized users.
+        """
+        self.graph = upapi.user.friendsgraph.FriendsGraph()
+        self.friends = {'a': ['b', 'c'], 'b': ['a'], 'c': []}
+        self.clients = [self._client(xid) for xid in sorted(self.friends)]
+
+    def _client(self, xid):
+        """
+        Mock an UpApi object that responds with the user's current friends.
+
+        :param xid: user xid
+        :return: mocked UpApi object
+        """
+        client = mock.Mock(spec=upapi.base.UpApi)
+        client.user_xid = None
+
+        def request(url):
+            self.assertEqual(url, upapi.endpoints.USERFRIENDS)
+            client.user_xid = xid
+            items = [{'xid': friend} for friend in self.friends[xid]]
+            return upapi.response.Response(
+                200,
+                {},
+                upapi.meta.Meta(xid, 'OK', 200, 1471463170),
+                {'items': items, 'size': len(items)},
+                0.1)
+        client.request.side_effect = request
+        return client
+
+    def test_crawl(self):
+        """
+        Verify the crawl builds an undirected graph without duplicate edges, and lists fetched together must agree.
+        """
+        results = self.graph.crawl(self.clients)
+        self.assertEqual([result.value for result in results], [True, True, True])
+        self.assertEqual(sorted(self.graph.edges()), [('a', 'b')])
+        self.assertEqual(self.graph.friends('a'), ['b'])
+        self.assertEqual(self.graph.friends('c'), [])
+        self.assertEqual(self.graph.friends('unknown'), [])
+
+    def test_crawl_incremental(self):
+        """
+        Verify fresh lists are skipped, unchanged lists report no change, and the most recent list decides.
+        """
+        self.graph.crawl(self.clients)
+
+        #
+        # Everything is fresh, so nothing is fetched.
+        #
+        self.assertEqual(self.graph.crawl(self.clients, max_age=60), [])
+
+        #
+        # Refetching unchanged lists changes nothing.
+        #
+        results = self.graph.crawl(self.clients)
+        self.assertEqual([result.value for result in results], [False, False, False])
+
+        #
+        # a unfriends b and still friends c. Only a is refetched, so its list is newer than theirs and decides.
+        #
+        self.friends['a'] = ['c']
+        self.graph.mark_stale('a')
+        with mock.patch('time.time', return_value=time.time() + 60):
+            results = self.graph.crawl(self.clients, max_age=600)
+        self.assertEqual([result.item for result in results], [self.clients[0]])
+        self.assertTrue(results[0].value)
+        self.assertEqual(list(self.graph.edges()), [('a', 'c')])
+        self.assertEqual(self.graph.friends('b'), [])
+
+        #
+        # c refetches its unchanged list, which is now the newest, so the friendship is gone again.
+        #
+        self.graph.mark_stale('c')
+        with mock.patch('time.time', return_value=time.time() + 120):
+            results = self.graph.crawl(self.clients, max_age=600)
+        self.assertFalse(results[0].value)
+        self.assertEqual(list(self.graph.edges()), [])
+
+    def test_crawl_errors(self):
+        """
+        Verify a failing user does not stop the crawl, and friendships with users never crawled come from one side.
+        """
+        self.clients[1].request.side_effect = upapi.exceptions.UnexpectedAPIResponse('500')
+        results = self.graph.crawl(self.clients)
+        self.assertIsInstance(results[1].error, upapi.exceptions.UnexpectedAPIResponse)
+        self.assertEqual(sorted(self.graph.edges()), [('a', 'b')])
@@ -0,0 +1,98 @@
+"""
+Unit tests for upapi.user.goals, polling the fake server.
+"""
+import json
+import mock
+import unittest
+import upapi.base
+import upapi.endpoints
+import upapi.fakeserver
+import upapi.user.goals
+
+
+class TestPolledResource(unittest.TestCase):
+    """
+    Tests upapi.user.goals.Goals and Settings
+    """
+
+    def setUp(self):
+        """
+        Start a fake server and point the goals and settings endpoints at it.
+        """
+        self.fake = upapi.fakeserver.FakeUpApi(users=1).start()
+        self.addCleanup(self.fake.stop)
+        self.user_xid = self.fake.users[0]
+        for cls in [upapi.user.goals.Goals, upapi.user.goals.Settings]:
+            patcher = mock.patch.object(cls, 'url', cls.url.replace(upapi.endpoints.DOMAIN, self.fake.url))
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        up = upapi.base.UpApi(self.fake.client_id, self.fake.client_secret, 'redirect_uri')
+        self.credentials = up.token_to_creds(self.fake.token(self.user_xid))
+
+    def fetch(self, cls, state=None):
+        """
+        Fetch a resource for the user.
+
+        :param cls: Goals or Settings
+        :param state: optional saved state
+        :return: the resource object
+        """
+        return cls(
+            self.fake.client_id,
+            self.fake.client_secret,
+            'redirect_uri',
+            user_credentials=self.credentials,
+            breakers=None,
+            state=state)
+
+    def test_goals(self):
+        """
+        Verify goals are refetched conditionally and only real changes count, not daily progress.
+        """
+        goals = self.fetch(upapi.user.goals.Goals)
+        self.assertTrue(goals.changed)
+        self.assertIsNone(goals.previous)
+        self.assertEqual(goals.data, self.fake.profile(self.user_xid, 'goals'))
+        self.assertTrue(goals.etag)
+
+        #
+        # Saved state survives JSON, and an unchanged resource is a 304 keeping the cached copy.
+        #
+        state = json.loads(json.dumps(goals.state))
+        again = self.fetch(upapi.user.goals.Goals, state)
+        self.assertFalse(again.changed)
+        self.assertEqual(again.last_response.status, 304)
+        self.assertEqual(again.data, goals.data)
+
+        self.fake.update_profile(self.user_xid, 'goals', {'remaining_for_day': {'move_steps_remaining': 1}})
+        self.assertFalse(again.refresh())
+        self.assertEqual(again.last_response.status, 200)
+        self.assertEqual(again.data['remaining_for_day'], {'move_steps_remaining': 1})
+
+        self.fake.update_profile(self.user_xid, 'goals', {'move_steps': 20000})
+        self.assertTrue(again.refresh())
+        self.assertEqual(again.data['move_steps'], 20000)
+        self.assertEqual(again.previous['move_steps'], goals.data['move_steps'])
+        self.assertFalse(again.refresh())
+
+    def test_settings(self):
+        """
+        Verify settings changes are detected.
+        """
+        settings = self.fetch(upapi.user.goals.Settings)
+        self.assertFalse(settings.refresh())
+        self.fake.update_profile(self.user_xid, 'settings', {'share_mood': True})
+        self.assertTrue(settings.refresh())
+        self.assertTrue(settings.data['share_mood'])
+
+    def test_digest(self):
+        """
+        Verify the digest ignores key order and volatile keys.
+        """
+        self.assertEqual(
+            upapi.user.goals.digest({'a': 1, 'b': {'c': 2, 'd': 3}}),
+            upapi.user.goals.digest({'b': {'d': 3, 'c': 2}, 'a': 1}))
+        self.assertEqual(
+            upapi.user.goals.digest({'a': 1, 'b': 2}, volatile=('b',)),
+            upapi.user.goals.digest({'a': 1, 'b': 3}, volatile=('b',)))
+        self.assertNotEqual(upapi.user.goals.digest({'a': 1}), upapi.user.goals.digest({'a': 2}))
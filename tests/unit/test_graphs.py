@@ -0,0 +1,72 @@
+"""
+Unit tests for upapi.graphs
+"""
+import io
+import mock
+import os
+import shutil
+import tempfile
+import unittest
+import upapi.base
+import upapi.endpoints
+import upapi.graphs
+
+
+class TestGraphCache(unittest.TestCase):
+    """
+    Tests upapi.graphs.GraphCache
+    """
+
+    def setUp(self):
+        """
+        Create a cache in a temporary directory and a mock UpApi serving images.
+        """
+        self.directory = tempfile.mkdtemp()
+        self.cache = upapi.graphs.GraphCache(self.directory)
+        self.images = {
+            upapi.endpoints.MOVESGRAPH.format(xid='move1'): b'\x89PNG move',
+            upapi.endpoints.MOVESGRAPH.format(xid='move2'): b'\x89PNG move',
+            upapi.endpoints.SLEEPSGRAPH.format(xid='move1'): b'\x89PNG sleep'}
+        self.up = mock.Mock(spec=upapi.base.UpApi)
+        self.up.download.side_effect = lambda url, fileobj, chunk_size: fileobj.write(self.images[url])
+
+    def tearDown(self):
+        """
+        Remove the cache.
+        """
+        shutil.rmtree(self.directory)
+
+    def test_download(self):
+        """
+        Verify graphs are downloaded once and copied to the file object.
+        """
+        self.assertIsNone(self.cache.path(upapi.endpoints.MOVESGRAPH, 'move1'))
+        buf = io.BytesIO()
+        path = self.cache.download(self.up, upapi.endpoints.MOVESGRAPH, 'move1', buf)
+        self.assertEqual(buf.getvalue(), b'\x89PNG move')
+        self.assertEqual(self.cache.path(upapi.endpoints.MOVESGRAPH, 'move1'), path)
+
+        buf = io.BytesIO()
+        self.assertEqual(self.cache.download(self.up, upapi.endpoints.MOVESGRAPH, 'move1', buf), path)
+        self.assertEqual(buf.getvalue(), b'\x89PNG move')
+        self.assertEqual(self.up.download.call_count, 1)
+
+    def test_download_content_addressed(self):
+        """
+        Verify identical images are stored once, and different kinds with the same xid are kept apart.
+        """
+        move1 = self.cache.download(self.up, upapi.endpoints.MOVESGRAPH, 'move1')
+        move2 = self.cache.download(self.up, upapi.endpoints.MOVESGRAPH, 'move2')
+        sleep1 = self.cache.download(self.up, upapi.endpoints.SLEEPSGRAPH, 'move1')
+        self.assertEqual(move1, move2)
+        self.assertNotEqual(move1, sleep1)
+        self.assertEqual(len(os.listdir(self.cache.blobs)), 2)
+
+    def test_download_error(self):
+        """
+        Verify failed downloads leave nothing behind.
+        """
+        self.up.download.side_effect = IOError('connection reset')
+        self.assertRaises(IOError, self.cache.download, self.up, upapi.endpoints.MOVESGRAPH, 'move1')
+        self.assertIsNone(self.cache.path(upapi.endpoints.MOVESGRAPH, 'move1'))
+        self.assertEqual(sorted(os.listdir(self.directory)), ['blobs', 'xids'])
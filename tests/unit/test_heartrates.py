@@ -0,0 +1,63 @@
+"""
+Unit tests for the HeartRates object
+"""
+import mock
+import tests.unit
+import upapi.endpoints
+import upapi.user.heartrates
+
+
+class TestHeartRates(tests.unit.TestResource):
+    """
+    Tests upapi.user.heartrates.HeartRates
+    """
+
+    def setUp(self):
+        """
+        Create a HeartRates object from out of order entries.
+        """
+        super(TestHeartRates, self).setUp()
+        self.items = [
+            {'xid': '3', 'time_created': 7200, 'resting_heartrate': 60},
+            {'xid': '1', 'time_created': 0, 'resting_heartrate': 50},
+            {'xid': '2', 'time_created': 600, 'resting_heartrate': 70},
+            {'xid': '4', 'time_created': 7300, 'resting_heartrate': None},
+            {'xid': '5', 'time_created': 7400, 'resting_heartrate': 64}]
+        with mock.patch('upapi.user.heartrates.HeartRates.stream_items', autospec=True) as mock_stream:
+            mock_stream.return_value = iter(self.items)
+            self.heartrates = upapi.user.heartrates.HeartRates(
+                self.app_id,
+                self.app_secret,
+                app_redirect_uri=self.app_redirect_uri,
+                user_credentials=self.credentials,
+                params={'start_time': 0})
+        mock_stream.assert_called_with(self.heartrates, upapi.endpoints.USERHEARTRATES, {'start_time': 0})
+
+    def test___init__(self):
+        """
+        Verify entries are sorted by time and empty heart rates are dropped.
+        """
+        self.assertEqual(len(self.heartrates), 4)
+        self.assertEqual(list(self.heartrates.times), [0, 600, 7200, 7400])
+        self.assertEqual(list(self.heartrates.rates), [50, 70, 60, 64])
+
+    def test_downsample(self):
+        """
+        Verify hourly summaries.
+        """
+        starts, mins, maxes, means = self.heartrates.downsample(3600)
+        self.assertEqual(list(starts), [0, 7200])
+        self.assertEqual(list(mins), [50, 60])
+        self.assertEqual(list(maxes), [70, 64])
+        self.assertEqual(list(means), [60, 62])
+
+    def test_rolling(self):
+        """
+        Verify rolling means and standard deviations.
+        """
+        means, stdevs = self.heartrates.rolling(2)
+        self.assertEqual(list(means), [60, 65, 62])
+        for stdev, expected in zip(stdevs, [10, 5, 2]):
+            self.assertAlmostEqual(stdev, expected)
+        self.assertEqual(len(self.heartrates.rolling(5)[0]), 0)
+        self.assertRaises(ValueError, self.heartrates.rolling, 0)
@@ -0,0 +1,104 @@
+"""
+Unit tests for upapi.leaderboard
+"""
+import calendar
+import datetime
+import mock
+import unittest
+import upapi.base
+import upapi.batch
+import upapi.endpoints
+import upapi.exceptions
+import upapi.leaderboard
+import upapi.mirror
+import upapi.timezones
+import upapi.user.friends
+
+
+class TestLeaderboard(unittest.TestCase):
+    """
+    Tests upapi.leaderboard.Leaderboard
+    """
+
+    def setUp(self):
+        """
+        Create clients whose moves have a fixed number of steps per day, for users eight hours behind UTC.
+        """
+        history = upapi.timezones.TimezoneHistory([{'time': 0, 'tz': 'GMT-0800'}])
+        patcher = mock.patch.object(upapi.timezones.TIMEZONES, 'history', return_value=history)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.steps = {'a': 100, 'b': 300, 'c': 200}
+        self.clients = dict((xid, self._client(xid)) for xid in self.steps)
+        self.leaderboard = upapi.leaderboard.Leaderboard(self.clients)
+        self.friends = mock.Mock(spec=upapi.user.friends.Friends)
+        self.friends.items = [upapi.user.friends.Friend({'xid': xid}) for xid in ['a', 'b', 'c', 'unauthorized']]
+
+    def _client(self, xid):
+        """
+        Mock an UpApi object with two moves per day.
+
+        :param xid: user xid
+        :return: mocked UpApi object
+        """
+        client = mock.Mock(spec=upapi.base.UpApi)
+
+        def get_range(url, start_date, end_date):
+            self.assertEqual(url, upapi.endpoints.USERMOVES)
+            return [
+                {'date': date, 'details': {'steps': self.steps[xid] // 2}}
+                for date in upapi.mirror.date_range(start_date, end_date)
+                for _ in range(2)]
+        client.get_range.side_effect = get_range
+        return client
+
+    def test_rank(self):
+        """
+        Verify friends are ranked by their totals.
+        """
+        self.assertEqual(
+            self.leaderboard.rank(self.friends, 20170201, 20170203),
+            [upapi.batch.Result('b', 900, None),
+             upapi.batch.Result('c', 600, None),
+             upapi.batch.Result('a', 300, None)])
+
+    def test_daily_totals(self):
+        """
+        Verify past days are fetched once, and only the gaps between cached days are fetched.
+        """
+        self.assertEqual(list(self.leaderboard.daily_totals('a', 20170201, 20170202)), [100, 100])
+        self.assertEqual(list(self.leaderboard.daily_totals('a', 20170204, 20170205)), [100, 100])
+        self.assertEqual(list(self.leaderboard.daily_totals('a', 20170130, 20170206)), [100] * 8)
+        self.assertEqual(
+            self.clients['a'].get_range.call_args_list,
+            [mock.call(upapi.endpoints.USERMOVES, 20170201, 20170202),
+             mock.call(upapi.endpoints.USERMOVES, 20170204, 20170205),
+             mock.call(upapi.endpoints.USERMOVES, 20170130, 20170131),
+             mock.call(upapi.endpoints.USERMOVES, 20170203, 20170203),
+             mock.call(upapi.endpoints.USERMOVES, 20170206, 20170206)])
+
+    def test_daily_totals_today(self):
+        """
+        Verify the user's today, in the zone the user is in, is always fetched, even once the day is over in UTC.
+        """
+        now = calendar.timegm(datetime.datetime(2017, 2, 3, 3).timetuple())
+        with mock.patch('time.time', return_value=now):
+            self.leaderboard.daily_totals('a', 20170202, 20170202)
+            self.leaderboard.daily_totals('a', 20170202, 20170202)
+            self.assertEqual(self.clients['a'].get_range.call_count, 2)
+            self.leaderboard.daily_totals('a', 20170201, 20170201)
+            self.leaderboard.daily_totals('a', 20170201, 20170201)
+            self.assertEqual(self.clients['a'].get_range.call_count, 3)
+        upapi.timezones.TIMEZONES.history.assert_called_with(self.clients['a'])
+
+    def test_rank_errors(self):
+        """
+        Verify a friend whose moves fail is ranked last with the error, and the others are still ranked.
+        """
+        error = upapi.exceptions.UnexpectedAPIResponse('500')
+        self.clients['b'].get_range.side_effect = error
+        self.assertEqual(
+            self.leaderboard.rank(self.friends, 20170201, 20170203),
+            [upapi.batch.Result('c', 600, None),
+             upapi.batch.Result('a', 300, None),
+             upapi.batch.Result('b', None, error)])
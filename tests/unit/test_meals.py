@@ -0,0 +1,114 @@
+"""
+Unit tests for the Meals object
+"""
+import mock
+import tests.unit
+import unittest
+import upapi.endpoints
+import upapi.exceptions
+import upapi.user.meals
+
+
+class TestVectorize(unittest.TestCase):
+    """
+    Tests upapi.user.meals.vectorize
+    """
+
+    def test_vectorize(self):
+        """
+        Verify nutrients land in their columns and missing ones are 0.
+        """
+        row = upapi.user.meals.vectorize({'calories': 500, 'protein': '20.5', 'fat': None, 'title': 'lunch'})
+        self.assertEqual(len(row), upapi.user.meals.WIDTH)
+        self.assertEqual(row[upapi.user.meals.COLUMNS['calories']], 500.0)
+        self.assertEqual(row[upapi.user.meals.COLUMNS['protein']], 20.5)
+        self.assertEqual(sum(row), 520.5)
+
+
+class TestMeals(tests.unit.TestResource):
+    """
+    Tests upapi.user.meals.Meals
+    """
+
+    def setUp(self):
+        """
+        Stream three meals over two days, newest first like the API.
+        """
+        super(TestMeals, self).setUp()
+        self.items = [
+            {'xid': 'dinner', 'date': 20170202, 'time_created': 300, 'details': {'calories': 800, 'protein': 40}},
+            {'xid': 'lunch', 'date': 20170201, 'time_created': 200, 'details': {'calories': 600, 'sugar': 10}},
+            {'xid': 'breakfast', 'date': 20170201, 'time_created': 100, 'details': {'calories': 400}}]
+        with mock.patch('upapi.user.meals.Meals.stream_items', autospec=True) as mock_stream:
+            mock_stream.return_value = iter(self.items)
+            self.meals = upapi.user.meals.Meals(
+                self.app_id,
+                self.app_secret,
+                app_redirect_uri=self.app_redirect_uri,
+                user_credentials=self.credentials,
+                params={'start_time': 0})
+        mock_stream.assert_called_with(self.meals, upapi.endpoints.USERMEALS, {'start_time': 0})
+
+    def test___init__(self):
+        """
+        Verify meals are sorted by date and time into parallel arrays.
+        """
+        self.assertEqual(len(self.meals), 3)
+        self.assertEqual(self.meals.xids, ['breakfast', 'lunch', 'dinner'])
+        self.assertEqual(list(self.meals.dates), [20170201, 20170201, 20170202])
+        self.assertEqual(list(self.meals.times), [100, 200, 300])
+        self.assertEqual(len(self.meals.nutrients), 3 * upapi.user.meals.WIDTH)
+        self.assertEqual(list(self.meals.row(2)), list(upapi.user.meals.vectorize(self.items[0]['details'])))
+        self.assertEqual(list(self.meals.column('calories')), [400, 600, 800])
+
+    def test_rollups(self):
+        """
+        Verify totals per user and per day.
+        """
+        columns = upapi.user.meals.COLUMNS
+        totals = self.meals.totals()
+        self.assertEqual(totals[columns['calories']], 1800)
+        self.assertEqual(totals[columns['protein']], 40)
+        self.assertEqual(totals[columns['sugar']], 10)
+
+        self.meals.user_xid = 'user_xid'
+        self.assertEqual(upapi.user.meals.totals_by_user([self.meals]), {'user_xid': totals})
+
+        dates, sums = self.meals.daily()
+        self.assertEqual(list(dates), [20170201, 20170202])
+        width = upapi.user.meals.WIDTH
+        self.assertEqual(sums[columns['calories']], 1000)
+        self.assertEqual(sums[columns['sugar']], 10)
+        self.assertEqual(sums[width + columns['calories']], 800)
+        self.assertEqual(len(sums), 2 * width)
+
+    @mock.patch('upapi.user.meals.Meals.get', autospec=True)
+    def test_details(self, mock_get):
+        """
+        Verify every meal is fetched concurrently, and failures are reported per meal.
+
+        :param mock_get: mocked get method
+        """
+        error = upapi.exceptions.UnexpectedAPIResponse('404')
+
+        def get(_, url):
+            if url == upapi.endpoints.MEALS.format(xid='missing'):
+                raise error
+            return {'url': url}
+        mock_get.side_effect = get
+        details = self.meals.details(max_workers=2)
+        self.assertEqual([result.item for result in details], ['breakfast', 'lunch', 'dinner'])
+        self.assertEqual(details[1].value, {'url': upapi.endpoints.MEALS.format(xid='lunch')})
+        details = self.meals.details(['missing', 'dinner'])
+        self.assertEqual(details[0].error, error)
+        self.assertEqual(details[1].value, {'url': upapi.endpoints.MEALS.format(xid='dinner')})
+
+    @mock.patch('upapi.user.meals.Meals.get_item', autospec=True)
+    def test_get_meal(self, mock_get_item):
+        """
+        Verify one meal is fetched by xid through the mirror.
+
+        :param mock_get_item: mocked get_item method
+        """
+        self.meals.get_meal('lunch')
+        mock_get_item.assert_called_with(self.meals, upapi.endpoints.MEALS, 'lunch')
@@ -0,0 +1,132 @@
+"""
+Unit tests for upapi.mirror
+"""
+import datetime
+import unittest
+import upapi.mirror
+
+
+class TestDates(unittest.TestCase):
+    """
+    Tests the upapi.mirror date helpers
+    """
+
+    def test_to_date(self):
+        """
+        Verify conversion from UP API dates.
+        """
+        self.assertEqual(upapi.mirror.to_date(20170203), datetime.date(2017, 2, 3))
+
+    def test_from_date(self):
+        """
+        Verify conversion to UP API dates.
+        """
+        self.assertEqual(upapi.mirror.from_date(datetime.date(2017, 2, 3)), 20170203)
+
+    def test_date_range(self):
+        """
+        Verify date ranges are inclusive and cross month boundaries.
+        """
+        self.assertEqual(upapi.mirror.date_range(20170227, 20170302), [20170227, 20170228, 20170301, 20170302])
+        self.assertEqual(upapi.mirror.date_range(20170302, 20170301), [])
+
+    def test_date_runs(self):
+        """
+        Verify dates are grouped into runs of consecutive days, across month boundaries.
+        """
+        self.assertEqual(
+            upapi.mirror.date_runs([20170227, 20170228, 20170301, 20170303, 20170310, 20170311]),
+            [(20170227, 20170301), (20170303, 20170303), (20170310, 20170311)])
+        self.assertEqual(upapi.mirror.date_runs([]), [])
+
+
+class TestMirror(unittest.TestCase):
+    """
+    Tests upapi.mirror.Mirror
+    """
+
+    def setUp(self):
+        """
+        Create an in-memory mirror with a few moves.
+        """
+        self.mirror = upapi.mirror.Mirror()
+        self.moves = [
+            {'xid': 'move2', 'date': 20170202, 'time_created': 2},
+            {'xid': 'move1', 'date': 20170201, 'time_created': 1},
+            {'xid': 'move3', 'date': 20170203, 'time_created': 3}]
+        self.mirror.put_items('user_xid', 'moves', self.moves)
+
+    def tearDown(self):
+        """
+        Close the mirror.
+        """
+        self.mirror.close()
+
+    def test_get_item(self):
+        """
+        Verify single resources are looked up by user and xid, so users sharing a mirror keep their own copies, and
+        list rows are kept apart from them.
+        """
+        self.assertIsNone(self.mirror.get_item('user_xid', 'move1'))
+        detail = dict(self.moves[1], details={'steps': 100})
+        self.mirror.put_item('user_xid', 'moves', detail)
+        self.assertEqual(self.mirror.get_item('user_xid', 'move1'), detail)
+        self.assertIsNone(self.mirror.get_item('user_xid', 'unknown'))
+        self.assertIsNone(self.mirror.get_item('other_xid', 'move1'))
+        self.assertEqual(self.mirror.query('user_xid', 'moves', 20170201, 20170201), [self.moves[1]])
+
+        other = {'xid': 'move1', 'date': 20170201, 'time_created': 1, 'title': 'other'}
+        self.mirror.put_item('other_xid', 'moves', other)
+        self.assertEqual(self.mirror.get_item('other_xid', 'move1'), other)
+        self.assertEqual(self.mirror.get_item('user_xid', 'move1'), detail)
+
+    def test_put_items(self):
+        """
+        Verify storing an existing xid replaces it.
+        """
+        updated = {'xid': 'move1', 'date': 20170201, 'time_created': 1, 'title': 'updated'}
+        self.mirror.put_items('user_xid', 'moves', [updated])
+        self.assertEqual(self.mirror.query('user_xid', 'moves', 20170201, 20170201), [updated])
+        self.mirror.put_item('user_xid', 'moves', self.moves[1])
+        self.mirror.put_item('user_xid', 'moves', updated)
+        self.assertEqual(self.mirror.get_item('user_xid', 'move1'), updated)
+
+    def test_update_and_delete_item(self):
+        """
+        Verify written items replace both copies, and deleted items are removed from both.
+        """
+        self.mirror.put_item('user_xid', 'moves', self.moves[0])
+        updated = dict(self.moves[0], title='updated')
+        self.mirror.update_item('user_xid', 'moves', updated)
+        self.assertEqual(self.mirror.get_item('user_xid', 'move2'), updated)
+        self.assertEqual(self.mirror.query('user_xid', 'moves', 20170202, 20170202), [updated])
+
+        self.mirror.delete_item('user_xid', 'move2')
+        self.assertIsNone(self.mirror.get_item('user_xid', 'move2'))
+        self.assertEqual(self.mirror.query('user_xid', 'moves', 20170202, 20170202), [])
+
+    def test_query(self):
+        """
+        Verify queries filter by user, kind and date and are ordered by date.
+        """
+        self.assertEqual(
+            [item['xid'] for item in self.mirror.query('user_xid', 'moves')],
+            ['move1', 'move2', 'move3'])
+        self.assertEqual(
+            [item['xid'] for item in self.mirror.query('user_xid', 'moves', 20170202, 20170203)],
+            ['move2', 'move3'])
+        self.assertEqual(self.mirror.query('user_xid', 'sleeps'), [])
+        self.assertEqual(self.mirror.query('other_xid', 'moves'), [])
+
+    def test_missing_dates(self):
+        """
+        Verify only unmarked dates are missing.
+        """
+        self.assertEqual(
+            self.mirror.missing_dates('user_xid', 'moves', 20170201, 20170203),
+            [20170201, 20170202, 20170203])
+        self.mirror.mark_dates('user_xid', 'moves', [20170201, 20170203])
+        self.assertEqual(self.mirror.missing_dates('user_xid', 'moves', 20170201, 20170203), [20170202])
+        self.assertEqual(
+            self.mirror.missing_dates('user_xid', 'sleeps', 20170201, 20170201),
+            [20170201])
@@ -0,0 +1,120 @@
+"""
+Unit tests for upapi.onboarding, exchanging callbacks with the fake server.
+"""
+import mock
+import time
+import unittest
+import upapi.fakeserver
+import upapi.onboarding
+
+
+class TestTokenExchanger(unittest.TestCase):
+    """
+    Tests upapi.onboarding.TokenExchanger
+    """
+
+    def setUp(self):
+        """
+        Start a fake server and an exchanger for its app.
+        """
+        self.fake = upapi.fakeserver.FakeUpApi(users=5).start()
+        self.config = self.fake.config()
+        self.save = mock.Mock()
+        self.exchanger = upapi.onboarding.TokenExchanger(self.config, max_workers=2, save=self.save, save_batch=2)
+
+    def tearDown(self):
+        """
+        Stop the exchanger and the fake server.
+        """
+        self.exchanger.close()
+        self.fake.stop()
+
+    def callback(self, user_xid):
+        """
+        Build the callback URL for a user that authorized the app.
+
+        :param user_xid: fake user xid
+        :return: callback URL
+        """
+        return 'http://app/callback?code={}'.format(self.fake.authorization_code(user_xid))
+
+    def saved(self):
+        """
+        :return: list of the batch sizes passed to save
+        """
+        return [len(call[0][0]) for call in self.save.call_args_list]
+
+    def test_exchange_all(self):
+        """
+        Verify concurrent exchanges keep their order, report errors per callback and save in batches.
+        """
+        urls = [self.callback(user_xid) for user_xid in self.fake.users] + ['http://app/callback?error=access_denied']
+        results = self.exchanger.exchange_all(urls)
+        self.assertEqual(
+            [result.value.access_token.startswith('access-{}'.format(user_xid))
+             for result, user_xid in zip(results, self.fake.users)],
+            [True] * 5)
+        self.assertIsNone(results[-1].value)
+        self.assertIsInstance(results[-1].error, Exception)
+        self.assertEqual(self.saved(), [2, 2, 1])
+
+    def test_submit(self):
+        """
+        Verify queued exchanges return credentials and close saves what is pending.
+        """
+        result = self.exchanger.submit(self.callback(self.fake.users[0]))
+        self.assertTrue(result.get(5).access_token.startswith('access-{}'.format(self.fake.users[0])))
+        self.assertFalse(self.save.called)
+        self.exchanger.close()
+        self.assertEqual(self.saved(), [1])
+
+    def test_save_error(self):
+        """
+        Verify a batch that fails to save does not fail the exchange and is kept for the next flush.
+        """
+        self.save.side_effect = [IOError('storage down'), None]
+        self.exchanger.exchange(self.callback(self.fake.users[0]))
+        self.assertIsNotNone(self.exchanger.exchange(self.callback(self.fake.users[1])))
+        self.assertIsInstance(self.exchanger.save_errors[0], IOError)
+        self.exchanger.flush()
+        self.assertEqual(self.saved(), [2, 2])
+
+    def test_exchange_all_save_error(self):
+        """
+        Verify exchange_all reports successful exchanges when saving fails, and keeps the save errors apart.
+        """
+        self.save.side_effect = IOError('storage down')
+        results = self.exchanger.exchange_all([self.callback(user_xid) for user_xid in self.fake.users])
+        self.assertEqual([result.error for result in results], [None] * 5)
+        self.assertEqual(len(self.exchanger.save_errors), self.save.call_count)
+        self.save.side_effect = None
+        self.exchanger.flush()
+        self.assertEqual(self.saved()[-1], 5)
+
+    def test_save_max_age(self):
+        """
+        Verify credentials are saved after save_max_age even if the batch is not full.
+        """
+        exchanger = upapi.onboarding.TokenExchanger(self.config, save=self.save, save_batch=10, save_max_age=0.1)
+        self.addCleanup(exchanger.close)
+        exchanger.exchange(self.callback(self.fake.users[0]))
+        for _ in range(50):
+            if self.save.called:
+                break
+            time.sleep(0.1)
+        self.assertEqual(self.saved(), [1])
+
+    def test_save_max_age_retry(self):
+        """
+        Verify a timed save that fails is retried once the timer fires again, without further callbacks.
+        """
+        self.save.side_effect = [IOError('storage down'), None]
+        exchanger = upapi.onboarding.TokenExchanger(self.config, save=self.save, save_batch=10, save_max_age=0.1)
+        self.addCleanup(exchanger.close)
+        exchanger.exchange(self.callback(self.fake.users[0]))
+        for _ in range(50):
+            if self.save.call_count == 2:
+                break
+            time.sleep(0.1)
+        self.assertEqual(self.saved(), [1, 1])
+        self.assertIsInstance(exchanger.save_errors[0], IOError)
@@ -0,0 +1,67 @@
+"""
+Unit tests for upapi.parsing
+"""
+import json
+import math
+import unittest
+import upapi.parsing
+
+
+class TestParsePool(unittest.TestCase):
+    """
+    Tests upapi.parsing.ParsePool
+    """
+
+    def setUp(self):
+        """
+        Start a small pool that sends every body to a worker, and create a ticks response.
+        """
+        self.pool = upapi.parsing.ParsePool(processes=2, min_size=0)
+        self.response = {
+            'meta': {'user_xid': 'user_xid', 'message': 'OK', 'code': 200, 'time': 1471463170},
+            'data': {'items': [{'time': 60 * index, 'steps': index, 'speed': 1.5} for index in range(100)]}}
+        self.content = json.dumps(self.response)
+
+    def tearDown(self):
+        """
+        Stop the pool.
+        """
+        self.pool.close()
+
+    def test_decode(self):
+        """
+        Verify bodies without columns decode inline to the same dicts.
+        """
+        self.assertEqual(self.pool.decode(self.content), self.response)
+        self.assertEqual(upapi.parsing.decode(self.content), self.response)
+
+    def test_decode_columns(self):
+        """
+        Verify items are converted into arrays in a worker and inline, with typecodes from the data.
+        """
+        for _ in range(2):
+            resp_json = self.pool.decode(self.content, ['time', 'steps', 'speed'])
+            items = resp_json['data']['items']
+            self.assertEqual(items['time'].typecode, upapi.parsing.INTEGER)
+            self.assertEqual(list(items['time']), [60 * index for index in range(100)])
+            self.assertEqual(list(items['steps']), list(range(100)))
+            self.assertEqual(items['speed'].typecode, upapi.parsing.FLOAT)
+            self.assertEqual(list(items['speed']), [1.5] * 100)
+            self.assertEqual(resp_json['meta'], self.response['meta'])
+            self.pool.min_size = len(self.content) + 1
+
+    def test_decode_columns_mixed(self):
+        """
+        Verify missing values are NaN, whole numbers mixed with fractions are floats and other fields stay lists.
+        """
+        content = json.dumps({'data': {'items': [
+            {'steps': 1, 'speed': 2, 'title': 'a'},
+            {'speed': 2.5, 'title': None},
+            {'steps': None, 'speed': 3, 'title': 'c'}]}})
+        items = upapi.parsing.decode_columns(content, ['steps', 'speed', 'title'])['data']['items']
+        self.assertEqual(items['steps'].typecode, upapi.parsing.FLOAT)
+        self.assertEqual(items['steps'][0], 1)
+        self.assertTrue(math.isnan(items['steps'][1]) and math.isnan(items['steps'][2]))
+        self.assertEqual(items['speed'].typecode, upapi.parsing.FLOAT)
+        self.assertEqual(list(items['speed']), [2, 2.5, 3])
+        self.assertEqual(items['title'], ['a', None, 'c'])
@@ -0,0 +1,120 @@
+"""
+Unit tests for the Sleeps and SleepPhases objects
+"""
+import mock
+import tests.unit
+import unittest
+import upapi.endpoints
+import upapi.exceptions
+import upapi.user.sleeps
+
+
+class TestSleepPhases(unittest.TestCase):
+    """
+    Tests upapi.user.sleeps.SleepPhases
+    """
+
+    def setUp(self):
+        """
+        Encode a night: awake, light, light, deep, awake, light until the end.
+        """
+        ticks = [
+            {'time': 0, 'depth': upapi.user.sleeps.AWAKE},
+            {'time': 600, 'depth': upapi.user.sleeps.LIGHT},
+            {'time': 1200, 'depth': upapi.user.sleeps.LIGHT},
+            {'time': 3600, 'depth': upapi.user.sleeps.DEEP},
+            {'time': 7200, 'depth': upapi.user.sleeps.AWAKE},
+            {'time': 7500, 'depth': upapi.user.sleeps.LIGHT}]
+        self.phases = upapi.user.sleeps.SleepPhases(ticks, 10800)
+
+    def test___init__(self):
+        """
+        Verify consecutive ticks of the same depth are merged.
+        """
+        self.assertEqual(list(self.phases.starts), [0, 600, 3600, 7200, 7500])
+        self.assertEqual(list(self.phases.ends), [600, 3600, 7200, 7500, 10800])
+        self.assertEqual(list(self.phases.depths), [1, 2, 3, 1, 2])
+
+    def test_durations(self):
+        """
+        Verify time per depth.
+        """
+        self.assertEqual(
+            self.phases.durations(),
+            {upapi.user.sleeps.AWAKE: 900, upapi.user.sleeps.LIGHT: 6300, upapi.user.sleeps.DEEP: 3600})
+        self.assertEqual(self.phases.duration, 10800)
+
+    def test_metrics(self):
+        """
+        Verify efficiency, awakenings and fragmentation.
+        """
+        self.assertAlmostEqual(self.phases.efficiency, 1 - 900 / 10800.0)
+        self.assertEqual(self.phases.awakenings, 1)
+        self.assertAlmostEqual(self.phases.fragmentation, 4 / 3.0)
+
+    def test_awakenings(self):
+        """
+        Verify waking up at the end is not an awakening, and neither is a night spent awake.
+        """
+        ticks = [
+            {'time': 0, 'depth': upapi.user.sleeps.LIGHT},
+            {'time': 600, 'depth': upapi.user.sleeps.AWAKE},
+            {'time': 900, 'depth': upapi.user.sleeps.DEEP},
+            {'time': 3600, 'depth': upapi.user.sleeps.AWAKE}]
+        self.assertEqual(upapi.user.sleeps.SleepPhases(ticks, 4000).awakenings, 1)
+        self.assertEqual(upapi.user.sleeps.SleepPhases(ticks[-1:], 4000).awakenings, 0)
+
+    def test_empty(self):
+        """
+        Verify a sleep without ticks.
+        """
+        phases = upapi.user.sleeps.SleepPhases([], 10800)
+        self.assertEqual(phases.durations(), {})
+        self.assertEqual(phases.duration, 0)
+        self.assertEqual(phases.efficiency, 0.0)
+        self.assertEqual(phases.awakenings, 0)
+        self.assertEqual(phases.fragmentation, 0.0)
+
+
+class TestSleeps(tests.unit.TestResource):
+    """
+    Tests upapi.user.sleeps.Sleeps
+    """
+
+    @mock.patch('upapi.user.sleeps.Sleeps.stream_items', autospec=True)
+    def test_phases(self, mock_stream):
+        """
+        Verify every sleep's ticks are fetched and encoded, and a failing night is reported on its own.
+
+        :param mock_stream: mocked stream_items method
+        """
+        sleeps = [
+            {'xid': 'sleep1', 'time_completed': 100},
+            {'xid': 'sleep2', 'time_completed': 200},
+            {'xid': 'sleep3', 'time_completed': 300}]
+        error = upapi.exceptions.UnexpectedAPIResponse('500')
+        ticks = {
+            upapi.endpoints.SLEEPSPHASES.format(xid='sleep1'): [{'time': 50, 'depth': 3}, {'time': 0, 'depth': 2}],
+            upapi.endpoints.SLEEPSPHASES.format(xid='sleep2'): [{'time': 0, 'depth': 3}]}
+
+        def stream(_, url, params=None):
+            if url == upapi.endpoints.USERSLEEPS:
+                return iter(sleeps)
+            if url not in ticks:
+                raise error
+            return iter(ticks[url])
+        mock_stream.side_effect = stream
+
+        sleeps_obj = upapi.user.sleeps.Sleeps(
+            self.app_id,
+            self.app_secret,
+            app_redirect_uri=self.app_redirect_uri,
+            user_credentials=self.credentials)
+        self.assertEqual(sleeps_obj.items, sleeps)
+        phases = sleeps_obj.phases(max_workers=2)
+        self.assertEqual(sorted(phases), ['sleep1', 'sleep2', 'sleep3'])
+        self.assertEqual(phases['sleep1'].item, sleeps[0])
+        self.assertEqual(list(phases['sleep1'].value.starts), [0, 50])
+        self.assertEqual(list(phases['sleep1'].value.ends), [50, 100])
+        self.assertEqual(phases['sleep2'].value.durations(), {3: 200})
+        self.assertEqual(phases['sleep3'].error, error)
@@ -0,0 +1,74 @@
+"""
+Unit tests for upapi.stream
+"""
+import json
+import unittest
+import upapi.stream
+
+
+def _chunks(body, size):
+    """
+    Split a body into chunks of size bytes.
+
+    :param body: byte string
+    :param size: chunk size
+    :return: list of chunks
+    """
+    return [body[index:index + size] for index in range(0, len(body), size)]
+
+
+class TestItemStream(unittest.TestCase):
+    """
+    Tests upapi.stream.ItemStream
+    """
+
+    def setUp(self):
+        """
+        Create a list response with items that are awkward to tokenize.
+        """
+        self.response = {
+            'meta': {'user_xid': 'user_xid', 'message': 'OK', 'code': 200, 'time': 1471463170},
+            'data': {
+                'items': [
+                    {'xid': '0', 'title': 'quote " and ] bracket', 'details': {'items': [1, 2]}},
+                    {'xid': '1', 'title': u'caf\u00e9', 'steps': 12345},
+                    12345,
+                    [1.5, -2e10, True, None]],
+                'links': {'next': '/nudge/api/v.1.1/users/@me/moves?page_token=1'},
+                'size': 4}}
+        self.body = json.dumps(self.response, ensure_ascii=False).encode('utf-8')
+
+    def test_iter(self):
+        """
+        Verify items and the rest of the response survive any chunking.
+        """
+        for size in [1, 2, 7, 64, len(self.body)]:
+            stream = upapi.stream.ItemStream(_chunks(self.body, size))
+            self.assertEqual(list(stream), self.response['data']['items'])
+            self.assertEqual(stream.response['meta'], self.response['meta'])
+            self.assertEqual(stream.response['data']['links'], self.response['data']['links'])
+            self.assertEqual(stream.response['data']['items'], [])
+
+    def test_iter_meta_last(self):
+        """
+        Verify the stream does not depend on key order.
+        """
+        body = b'{"data": {"size": 1, "items": [{"xid": "0"}]}, "meta": {"items": ["not", "these"]}}'
+        stream = upapi.stream.ItemStream(_chunks(body, 5))
+        self.assertEqual(list(stream), [{'xid': '0'}])
+        self.assertEqual(stream.response['meta'], {'items': ['not', 'these']})
+
+    def test_iter_truncated(self):
+        """
+        Verify a truncated body raises.
+        """
+        stream = upapi.stream.ItemStream(_chunks(self.body[:-40], 16))
+        self.assertRaises(ValueError, list, stream)
+
+    def test_iter_split_number(self):
+        """
+        Verify a number split across chunks is not cut short.
+        """
+        self.assertEqual(list(upapi.stream.ItemStream([b'{"data":{"items":[12.', b'5]}}'])), [12.5])
+        self.assertEqual(list(upapi.stream.ItemStream([b'{"data":{"items":[1', b'2e', b'3, -', b'4]}}'])), [12e3, -4])
+        self.assertRaises(ValueError, list, upapi.stream.ItemStream([b'{"data":{"items":[12.']))
@@ -0,0 +1,122 @@
+"""
+Unit tests for upapi.timezones
+"""
+import datetime
+import mock
+import pickle
+import unittest
+import upapi.base
+import upapi.endpoints
+import upapi.exceptions
+import upapi.timezones
+
+
+class TestZones(unittest.TestCase):
+    """
+    Tests the upapi.timezones zone lookups and conversions
+    """
+
+    def test_get_zone(self):
+        """
+        Verify fixed offsets and memoization.
+        """
+        self.assertIs(upapi.timezones.get_zone('UTC'), upapi.timezones.UTC)
+        pacific = upapi.timezones.get_zone('GMT-0800')
+        self.assertEqual(pacific.utcoffset(None), datetime.timedelta(hours=-8))
+        self.assertIs(upapi.timezones.get_zone('GMT-0800'), pacific)
+        self.assertEqual(upapi.timezones.get_zone('+05:30').utcoffset(None), datetime.timedelta(hours=5, minutes=30))
+        self.assertRaises(upapi.exceptions.UnknownTimezone, upapi.timezones.get_zone, 'Not/AZone')
+
+    @unittest.skipIf(
+        upapi.timezones.zoneinfo is None and upapi.timezones.pytz is None,
+        'Named zones need zoneinfo or pytz')
+    def test_get_zone_named(self):
+        """
+        Verify named zones follow daylight saving time.
+        """
+        zone = upapi.timezones.get_zone('America/Los_Angeles')
+        self.assertEqual(upapi.timezones.from_timestamp(1483228800, zone).utcoffset(), datetime.timedelta(hours=-8))
+        self.assertEqual(upapi.timezones.from_timestamp(1498867200, zone).utcoffset(), datetime.timedelta(hours=-7))
+
+    def test_fixed_offset_pickle(self):
+        """
+        Verify fixed offsets survive pickling.
+        """
+        zone = pickle.loads(pickle.dumps(upapi.timezones.get_zone('GMT-0800')))
+        self.assertEqual(zone.utcoffset(None), datetime.timedelta(hours=-8))
+        self.assertEqual(zone.tzname(None), 'GMT-0800')
+
+    def test_localize(self):
+        """
+        Verify bulk conversion does not depend on the host's zone.
+        """
+        times = upapi.timezones.localize([0, 86400], 'GMT-0800')
+        self.assertEqual([time.hour for time in times], [16, 16])
+        self.assertEqual([time.day for time in times], [31, 1])
+        self.assertEqual(upapi.timezones.from_timestamp(0), datetime.datetime(1970, 1, 1, tzinfo=upapi.timezones.UTC))
+
+    def test_localize_items(self):
+        """
+        Verify each event is converted in its own zone.
+        """
+        items = [{'time_created': 0, 'tz': 'GMT+0100'}, {'time_created': 0}]
+        self.assertEqual([time.hour for time in upapi.timezones.localize_items(items)], [1, 0])
+
+
+class TestTimezoneHistory(unittest.TestCase):
+    """
+    Tests upapi.timezones.TimezoneHistory
+    """
+
+    def test_zone_at(self):
+        """
+        Verify zones are looked up by when the user entered them.
+        """
+        history = upapi.timezones.TimezoneHistory([
+            {'time': 1000, 'tz': 'GMT+0100'},
+            {'time': 0, 'tz': 'GMT-0500'}])
+        self.assertEqual(history.zone_at(-10).tzname(None), 'GMT-0500')
+        self.assertEqual(history.zone_at(999).tzname(None), 'GMT-0500')
+        self.assertEqual(history.zone_at(1000).tzname(None), 'GMT+0100')
+        self.assertEqual([time.utcoffset().seconds // 3600 for time in history.localize([500, 1500])], [19, 1])
+        self.assertIs(upapi.timezones.TimezoneHistory([]).zone_at(0), upapi.timezones.UTC)
+
+
+class TestTimezones(unittest.TestCase):
+    """
+    Tests upapi.timezones.Timezones
+    """
+
+    def test_history(self):
+        """
+        Verify histories are fetched once per user until invalidated.
+        """
+        client = mock.Mock(spec=upapi.base.UpApi)
+        client.user_xid = 'user_xid'
+        client.get_pages.side_effect = lambda url: iter([{'items': [{'time': 0, 'tz': 'GMT+0200'}]}])
+        timezones = upapi.timezones.Timezones()
+        history = timezones.history(client)
+        self.assertIs(timezones.history(client), history)
+        client.get_pages.assert_called_once_with(upapi.endpoints.USERTIMEZONE)
+        self.assertEqual(history.zone_at(0).tzname(None), 'GMT+0200')
+
+        timezones.invalidate('user_xid')
+        self.assertIsNot(timezones.history(client), history)
+
+    def test_history_fresh_client(self):
+        """
+        Verify a client that does not know its user xid yet looks it up before the cache is checked.
+        """
+        timezones = upapi.timezones.Timezones()
+        clients = []
+        for xid, tz in [('user1', 'GMT+0100'), ('user2', 'GMT+0200')]:
+            client = mock.Mock(spec=upapi.base.UpApi)
+            client.user_xid = None
+            client.get.side_effect = lambda url, client=client, xid=xid: setattr(client, 'user_xid', xid)
+            client.get_pages.side_effect = lambda url, tz=tz: iter([{'items': [{'time': 0, 'tz': tz}]}])
+            clients.append(client)
+        history = timezones.history(clients[0])
+        clients[0].get.assert_called_once_with(upapi.endpoints.USER)
+        self.assertIs(timezones.history(clients[0]), history)
+        self.assertEqual(timezones.history(clients[1]).zone_at(0).tzname(None), 'GMT+0200')
+        self.assertEqual(history.zone_at(0).tzname(None), 'GMT+0100')
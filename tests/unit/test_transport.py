@@ -0,0 +1,88 @@
+"""
+Unit tests for upapi.transport
+"""
+import mock
+import socket
+import unittest
+import upapi.transport
+
+
+@unittest.skipIf(upapi.transport.httpx is None, 'needs httpx')
+class TestHttp2Transport(unittest.TestCase):
+    """
+    Tests upapi.transport.Http2Transport
+    """
+
+    def setUp(self):
+        """
+        Create a transport answering from a handler instead of the network. The handler's client replaces the HTTP/2
+        one, so the tests also run without h2.
+        """
+        httpx = upapi.transport.httpx
+        self.requests = []
+
+        def handler(request):
+            self.requests.append(request)
+            if request.url.path == '/timeout':
+                raise httpx.ReadTimeout('timed out', request=request)
+            #
+            # A byte stream leaves the body unread, like a network response, so it can be streamed.
+            #
+            return httpx.Response(200, headers={'etag': 'etag'}, stream=httpx.ByteStream(b'{"data": "body"}'))
+
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        with mock.patch.object(httpx, 'Client', return_value=client) as mock_client:
+            self.transport = upapi.transport.Http2Transport(max_connections=2)
+        self.assertTrue(mock_client.call_args[1]['http2'])
+
+    def tearDown(self):
+        """
+        Close the transport.
+        """
+        self.transport.close()
+
+    def test_request(self):
+        """
+        Verify request returns an httplib2-style response and body, and raises socket timeouts.
+        """
+        resp, content = self.transport.request(
+            'https://up.resource/main',
+            'POST',
+            body='a=1',
+            headers={'authorization': 'Bearer token'},
+            timeout=5)
+        self.assertEqual(resp.status, 200)
+        self.assertEqual(resp['etag'], 'etag')
+        self.assertEqual(content, b'{"data": "body"}')
+        self.assertEqual(self.requests[0].method, 'POST')
+        self.assertEqual(self.requests[0].headers['authorization'], 'Bearer token')
+        self.assertRaises(socket.timeout, self.transport.request, 'https://up.resource/timeout')
+
+    def test_stream(self):
+        """
+        Verify stream returns a response that reads the body in pieces.
+        """
+        resp = self.transport.stream('https://up.resource/main', timeout=5)
+        self.assertEqual(resp.status, 200)
+        self.assertIn(('etag', 'etag'), resp.getheaders())
+        self.assertEqual(resp.read(5), b'{"dat')
+        self.assertEqual(resp.read(), b'a": "body"}')
+        self.assertEqual(resp.read(5), b'')
+        resp.close()
+
+
+class TestNoHttpx(unittest.TestCase):
+    """
+    Tests upapi.transport.Http2Transport without httpx
+    """
+
+    def test_missing(self):
+        """
+        Verify a missing httpx is reported when creating the transport.
+        """
+        httpx = upapi.transport.httpx
+        upapi.transport.httpx = None
+        try:
+            self.assertRaises(ImportError, upapi.transport.Http2Transport)
+        finally:
+            upapi.transport.httpx = httpx
@@ -2,7 +2,12 @@
 Unit tests for upapi.__init__
 """
 import mock
+import os
+import pkgutil
+import subprocess
+import sys
 import tests.unit
+import unittest
 import upapi
 import upapi.endpoints
 import upapi.exceptions
@@ -57,14 +62,32 @@ class TestUp(tests.unit.TestSDK):
         """
         upapi.up()
         mock_upapi.assert_called_with(
-            upapi.client_id,
-            upapi.client_secret,
-            upapi.redirect_uri,
-            app_scope=upapi.scope,
+            upapi._app_config(),
             credentials_storage=upapi.credentials_storage,
             user_credentials=upapi.credentials)
 
 
+class TestAppConfig(tests.unit.TestSDK):
+    """
+    Tests upapi._app_config
+    """
+
+    def test__app_config(self):
+        """
+        Verify the config of the globals is reused until they change.
+        """
+        config = upapi._app_config()
+        self.assertEqual(config[:3], (upapi.client_id, upapi.client_secret, upapi.redirect_uri))
+        self.assertIs(upapi._app_config(), config)
+        upapi.scope = [upapi.scopes.MOVE_READ]
+        self.addCleanup(setattr, upapi, 'scope', None)
+        scoped = upapi._app_config()
+        self.assertEqual(scoped.scope, (upapi.scopes.MOVE_READ,))
+        self.assertIs(upapi._app_config(), scoped)
+        upapi.scope.append(upapi.scopes.SLEEP_READ)
+        self.assertEqual(upapi._app_config().scope, (upapi.scopes.MOVE_READ, upapi.scopes.SLEEP_READ))
+
+
 class TestGetRedirectUrl(tests.unit.TestSDK):
     """
     Tests upapi.get_redirect_url
@@ -186,9 +209,65 @@ class TestGetUser(tests.unit.TestSDK):
         """
         upapi.get_user()
         mock_user.assert_called_with(
-            upapi.client_id,
-            upapi.client_secret,
-            upapi.redirect_uri,
-            app_scope=upapi.scope,
+            upapi._app_config(),
+            credentials_storage=upapi.credentials_storage,
+            user_credentials=upapi.credentials)
+
+
+class TestGetEvents(tests.unit.TestSDK):
+    """
+    Tests upapi.get_events
+    """
+
+    @mock.patch('upapi.user.events.Events', autospec=True)
+    def test_get_events(self, mock_events):
+        """
+        Verify Events object gets created with global values.
+
+        :param mock_events: mocked Events object
+        """
+        upapi.get_events()
+        mock_events.assert_called_with(
+            upapi._app_config(),
             credentials_storage=upapi.credentials_storage,
             user_credentials=upapi.credentials)
+
+
+class TestLazyImport(unittest.TestCase):
+    """
+    Tests the lazy loading in upapi.__init__
+    """
+
+    def _loaded(self, code):
+        """
+        Run code in a fresh interpreter and report which heavy modules it loaded.
+
+        :param code: Python statements to run
+        :return: list of loaded module names
+        """
+        report = 'import sys; print(",".join(m for m in {!r} if m in sys.modules))'.format(
+            ('httplib2', 'oauth2client', 'upapi.base'))
+        output = subprocess.check_output(
+            [sys.executable, '-c', '{}; {}'.format(code, report)],
+            cwd=os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+        return [name for name in output.decode('ascii').strip().split(',') if name]
+
+    def test_import(self):
+        """
+        Verify importing upapi, upapi.endpoints or upapi.scopes loads neither oauth2client nor httplib2.
+        """
+        self.assertEqual(self._loaded('import upapi, upapi.endpoints, upapi.scopes, upapi.exceptions'), [])
+        self.assertEqual(self._loaded('import upapi.user'), ['httplib2', 'oauth2client', 'upapi.base'])
+
+    def test_submodules(self):
+        """
+        Verify every submodule of the package is either imported with it or loaded lazily.
+        """
+        names = set(name for _, name, _ in pkgutil.iter_modules(upapi.__path__))
+        self.assertEqual(names - set(['endpoints', 'exceptions', 'scopes']), upapi._LAZY_SUBMODULES)
+        if sys.version_info >= (3, 7):
+            output = subprocess.check_output(
+                [sys.executable, '-c', 'import upapi; print(",".join(getattr(upapi, name).__name__ for name in {!r}))'
+                 .format(sorted(names))],
+                cwd=os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+            self.assertEqual(output.decode('ascii').strip(), ','.join('upapi.' + name for name in sorted(names)))
@@ -75,3 +75,99 @@ class TestUser(tests.unit.TestUserResource):
         self.user.get_friends()
         mock_friends.assert_called_with(*self.user.args, **self.user.kwargs)
         self.assertEqual(self.user._friends, mock_friends.return_value)
+
+    @mock.patch('upapi.user.bodyevents.BodyEvents', autospec=True)
+    def test_get_body_events(self, mock_body_events):
+        """
+        Verify call to create BodyEvents object
+
+        :param mock_body_events: mocked BodyEvents object
+        """
+        params = {'start_time': 0}
+        self.user.get_body_events(params)
+        mock_body_events.assert_called_with(*self.user.args, params=params, **self.user.kwargs)
+
+    @mock.patch('upapi.user.events.GenericEvents', autospec=True)
+    def test_get_generic_events(self, mock_generic):
+        """
+        Verify call to create GenericEvents object
+
+        :param mock_generic: mocked GenericEvents object
+        """
+        self.user.get_generic_events()
+        mock_generic.assert_called_with(*self.user.args, **self.user.kwargs)
+
+    @mock.patch('upapi.user.goals.Goals', autospec=True)
+    def test_get_goals(self, mock_goals):
+        """
+        Verify call to create Goals object
+
+        :param mock_goals: mocked Goals object
+        """
+        state = {'etag': 'etag', 'digest': 'digest', 'data': {}}
+        self.user.get_goals(state)
+        mock_goals.assert_called_with(*self.user.args, state=state, **self.user.kwargs)
+
+    @mock.patch('upapi.user.events.Moods', autospec=True)
+    def test_get_moods(self, mock_moods):
+        """
+        Verify call to create Moods object
+
+        :param mock_moods: mocked Moods object
+        """
+        self.user.get_moods()
+        mock_moods.assert_called_with(*self.user.args, **self.user.kwargs)
+
+    @mock.patch('upapi.user.goals.Settings', autospec=True)
+    def test_get_settings(self, mock_settings):
+        """
+        Verify call to create Settings object
+
+        :param mock_settings: mocked Settings object
+        """
+        self.user.get_settings()
+        mock_settings.assert_called_with(*self.user.args, state=None, **self.user.kwargs)
+
+    @mock.patch('upapi.user.heartrates.HeartRates', autospec=True)
+    def test_get_heartrates(self, mock_heartrates):
+        """
+        Verify call to create HeartRates object
+
+        :param mock_heartrates: mocked HeartRates object
+        """
+        params = {'start_time': 0}
+        self.user.get_heartrates(params)
+        mock_heartrates.assert_called_with(*self.user.args, params=params, **self.user.kwargs)
+
+    @mock.patch('upapi.user.meals.Meals', autospec=True)
+    def test_get_meals(self, mock_meals):
+        """
+        Verify call to create Meals object
+
+        :param mock_meals: mocked Meals object
+        """
+        params = {'start_time': 0}
+        self.user.get_meals(params)
+        mock_meals.assert_called_with(*self.user.args, params=params, **self.user.kwargs)
+
+    @mock.patch('upapi.user.sleeps.Sleeps', autospec=True)
+    def test_get_sleeps(self, mock_sleeps):
+        """
+        Verify call to create Sleeps object
+
+        :param mock_sleeps: mocked Sleeps object
+        """
+        params = {'start_time': 0}
+        self.user.get_sleeps(params)
+        mock_sleeps.assert_called_with(*self.user.args, params=params, **self.user.kwargs)
+
+    @mock.patch('upapi.user.workouts.Workouts', autospec=True)
+    def test_get_workouts(self, mock_workouts):
+        """
+        Verify call to create Workouts object
+
+        :param mock_workouts: mocked Workouts object
+        """
+        params = {'start_time': 0}
+        self.user.get_workouts(params)
+        mock_workouts.assert_called_with(*self.user.args, params=params, **self.user.kwargs)
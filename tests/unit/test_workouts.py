@@ -0,0 +1,91 @@
+"""
+Unit tests for upapi.user.workouts, fetching from the fake server.
+"""
+import io
+import mock
+import unittest
+import upapi.base
+import upapi.endpoints
+import upapi.fakeserver
+import upapi.user.workouts
+
+
+class TestSummarize(unittest.TestCase):
+    """
+    Tests upapi.user.workouts.summarize
+    """
+
+    def test_summarize(self):
+        """
+        Verify totals come from the details, or from the ticks when the details leave them out.
+        """
+        workout = {
+            'xid': 'xid',
+            'sub_type': 2,
+            'date': 20170201,
+            'time_created': 1000,
+            'time_completed': 2800,
+            'details': {'steps': 2500, 'intensity': 3}}
+        ticks = [{'time': 1000, 'steps': 900, 'calories': 40}, {'time': 1600, 'steps': 1200, 'calories': 55}]
+        summary = upapi.user.workouts.summarize(workout, ticks)
+        self.assertEqual(
+            summary,
+            upapi.user.workouts.WorkoutSummary('xid', 2, 20170201, 1000, 2800, 1800, 2500, 95, 0, 3, 2, 1200))
+        self.assertEqual(upapi.user.workouts.summarize(dict(workout, details=None), []).peak_steps, 0)
+
+
+class TestWorkouts(unittest.TestCase):
+    """
+    Tests upapi.user.workouts.Workouts
+    """
+
+    def setUp(self):
+        """
+        Start a fake server and list the user's workouts from it.
+        """
+        self.fake = upapi.fakeserver.FakeUpApi(users=1, items=6, page_size=4).start()
+        self.addCleanup(self.fake.stop)
+        self.user_xid = self.fake.users[0]
+        config = self.fake.config()
+        up = upapi.base.UpApi(config)
+        self.workouts = upapi.user.workouts.Workouts(
+            config,
+            user_credentials=up.token_to_creds(self.fake.token(self.user_xid)),
+            breakers=None)
+
+    def test_summaries(self):
+        """
+        Verify every listed workout is fetched with its ticks and summarized, and failures are reported per workout.
+        """
+        self.assertEqual(len(self.workouts.items), 6)
+        results = self.workouts.summaries(max_workers=3)
+        self.assertEqual([result.item for result in results], [item['xid'] for item in self.workouts.items])
+        workout = self.fake.event(self.user_xid, 'workouts', 0)
+        ticks = self.fake.ticks('workouts', workout)
+        self.assertEqual(results[0].value, upapi.user.workouts.summarize(workout, ticks))
+        self.assertEqual(results[0].value.ticks, len(ticks))
+
+        results = self.workouts.summaries(['missing', workout['xid']])
+        self.assertIsNotNone(results[0].error)
+        self.assertEqual(results[1].value.xid, workout['xid'])
+
+    def test_graph_and_update(self):
+        """
+        Verify graph downloads and partial updates.
+        """
+        xid = self.workouts.items[0]['xid']
+        fileobj = io.BytesIO()
+        self.assertEqual(self.workouts.download_graph(xid, fileobj), len(fileobj.getvalue()))
+        self.assertTrue(fileobj.getvalue().startswith(b'\x89PNG'))
+        self.assertEqual(self.workouts.update(xid, intensity=5)['intensity'], '5')
+        self.assertRaises(TypeError, self.workouts.update, xid, weight=70)
+
+    @mock.patch('upapi.user.workouts.Workouts.get_item', autospec=True)
+    def test_get_workout(self, mock_get_item):
+        """
+        Verify one workout is fetched by xid through the mirror.
+
+        :param mock_get_item: mocked get_item method
+        """
+        self.workouts.get_workout('xid')
+        mock_get_item.assert_called_with(self.workouts, upapi.endpoints.WORKOUTS, 'xid')
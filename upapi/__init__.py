@@ -3,11 +3,51 @@ This is the Python SDK for the Jawbone UP API.
 
 For API details: https://jawbone.com/up/developer
 For SDK details: https://github.com/Jawbone/UPPlatform_Python_SDK
+
+Importing upapi only loads the lightweight modules (e.g., upapi.endpoints and upapi.scopes). The modules that need
+oauth2client and httplib2 (e.g., upapi.base and upapi.user) are loaded when first used, so processes that only need
+endpoints or scopes (e.g., webhook receivers) start faster and use less memory.
 """
+import importlib
 import upapi.endpoints
 import upapi.exceptions
-import upapi.base
-import upapi.user
+import upapi.scopes
+
+"""
+Submodules loaded on first attribute access (see __getattr__).
+"""
+_LAZY_SUBMODULES = frozenset([
+    'base',
+    'batch',
+    'breaker',
+    'config',
+    'fakeserver',
+    'graphs',
+    'leaderboard',
+    'meta',
+    'mirror',
+    'onboarding',
+    'parsing',
+    'pubsub',
+    'response',
+    'stream',
+    'timezones',
+    'transport',
+    'user',
+])
+
+
+def __getattr__(name):
+    """
+    Load a submodule on first access, so upapi.user works after a plain import upapi (Python 3.7+). On Python 2, import
+    submodules explicitly, e.g. import upapi.user.
+
+    :param name: attribute name
+    :return: the submodule
+    """
+    if name not in _LAZY_SUBMODULES:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+    return importlib.import_module('{}.{}'.format(__name__, name))
 
 """
 Set these variables with the values for your app from https://developer.jawbone.com
@@ -31,6 +71,25 @@ scope = None
 credentials_storage = None
 credentials = None
 
+_config = None
+_config_key = None
+
+
+def _app_config():
+    """
+    Get the upapi.config.AppConfig of the global properties. It is only built again when they change, so the objects
+    created from the globals share it and its OAuth flow.
+
+    :return: upapi.config.AppConfig object
+    """
+    global _config, _config_key
+    import upapi.config
+    key = (client_id, client_secret, redirect_uri, tuple(scope) if isinstance(scope, (list, set)) else scope)
+    if _config is None or key != _config_key:
+        _config = upapi.config.AppConfig(client_id, client_secret, redirect_uri, scope)
+        _config_key = key
+    return _config
+
 
 def up():
     """
@@ -38,13 +97,8 @@ def up():
 
     :return: upapi.base.UpApi object
     """
-    return upapi.base.UpApi(
-        client_id,
-        client_secret,
-        redirect_uri,
-        app_scope=scope,
-        credentials_storage=credentials_storage,
-        user_credentials=credentials)
+    import upapi.base
+    return upapi.base.UpApi(_app_config(), credentials_storage=credentials_storage, user_credentials=credentials)
 
 
 """
@@ -144,10 +198,18 @@ def get_user():
 
     :return: upapi.user.User object
     """
-    return upapi.user.User(
-        client_id,
-        client_secret,
-        redirect_uri,
-        app_scope=scope,
+    import upapi.user
+    return upapi.user.User(_app_config(), credentials_storage=credentials_storage, user_credentials=credentials)
+
+
+def get_events():
+    """
+    Create an Events object with the global properties, for creating, updating and deleting the user's events.
+
+    :return: upapi.user.events.Events object
+    """
+    import upapi.user.events
+    return upapi.user.events.Events(
+        _app_config(),
         credentials_storage=credentials_storage,
         user_credentials=credentials)
@@ -1,17 +1,40 @@
 """
 All the API objects inherit from UpApi.
 """
+import calendar
 import datetime
-import httplib
 import httplib2
 import json
 import oauth2client.client
+import socket
+import threading
+import time
+import timeit
+import upapi.breaker
+import upapi.config
 import upapi.endpoints
 import upapi.exceptions
 import upapi.meta
-import upapi.scopes
-import urllib
-import urlparse
+import upapi.mirror
+import upapi.parsing
+import upapi.response
+import upapi.stream
+import upapi.timezones
+
+#
+# Python 2 and 3 name the HTTP and URL modules differently. The code uses the Python 2 names.
+#
+try:
+    import http.client as httplib
+    import urllib.parse as urlparse
+    _urlencode = urlparse.urlencode
+    _TEXT = str
+except ImportError:
+    import httplib
+    import urllib
+    import urlparse
+    _urlencode = urllib.urlencode
+    _TEXT = unicode
 
 
 """
@@ -20,6 +43,28 @@ Setting a specific User-Agent for analytics purposes.
 SDK_VERSION = '0.7'
 USERAGENT = 'upapi/{} (https://developer.jawbone.com)'.format(SDK_VERSION)
 
+"""
+Default limits in seconds: TIMEOUT for connecting and for each socket read, and DEADLINE for a whole call. Ticks and
+graphs are much bigger than other responses, so they get longer limits. Override them per UpApi object.
+"""
+TIMEOUT = 10
+DEADLINE = 30
+ENDPOINT_TIMEOUTS = {
+    upapi.endpoints.TICKS: (30, 120),
+    upapi.endpoints.GRAPH: (30, 120),
+}
+
+"""
+Methods that are safe to report as timed out after they completed, since the caller can simply send them again.
+"""
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD'])
+
+#
+# The deadline of the calling thread's current call, as a timer value. Every socket read of the call waits no longer
+# than what is left of it.
+#
+_call = threading.local()
+
 
 class UpApi(object):
     """
@@ -28,15 +73,23 @@ class UpApi(object):
     def __init__(
             self,
             app_id,
-            app_secret,
-            app_redirect_uri,
+            app_secret=None,
+            app_redirect_uri=None,
             app_scope=None,
             credentials_storage=None,
-            user_credentials=None):
+            user_credentials=None,
+            mirror=None,
+            parse_pool=None,
+            timeout=TIMEOUT,
+            deadline=DEADLINE,
+            endpoint_timeouts=None,
+            breakers=upapi.breaker.BREAKERS,
+            transport=None):
         """
         Create an UpApi object to manage the OAuth connection.
 
-        :param app_id: Client ID from UP developer portal
+        :param app_id: Client ID from UP developer portal, or an upapi.config.AppConfig object shared by the app's
+            UpApi objects (then leave out app_secret, app_redirect_uri and app_scope)
         :param app_secret: App Secret from UP developer portal
         :param app_redirect_uri: one of your OAuth redirect URLs
         :param app_scope: list of permissions a user will have to approve (see upapi.scopes). Defaults to
@@ -47,19 +100,49 @@ class UpApi(object):
             override any value passed in for user_token. If neither user_token or user_credentials are passed in, then
             the app must send the user through the OAuth flow and call the get_up_token method to retrieve the token
             and credentials.
+        :param mirror: optional upapi.mirror.Mirror used to store fetched resources and answer repeated queries
+            without hitting the API.
+        :param parse_pool: optional upapi.parsing.ParsePool used to decode large responses in worker processes.
+        :param timeout: seconds to wait for a connection or for each read from it, or None to wait forever
+        :param deadline: seconds a whole call may take, or None for no limit
+        :param endpoint_timeouts: dict of endpoint suffix (e.g., upapi.endpoints.TICKS) to a (timeout, deadline) tuple,
+            overriding ENDPOINT_TIMEOUTS
+        :param breakers: upapi.breaker.BreakerRegistry shared by the UpApi objects that should fail fast together, or
+            None to disable circuit breaking. Defaults to upapi.breaker.BREAKERS
+        :param transport: optional upapi.transport.Http2Transport shared by many UpApi objects, multiplexing their
+            requests over a few HTTP/2 connections instead of opening connections per thread
         """
-        self.app_id = app_id
-        self.app_secret = app_secret
-        self._redirect_uri = app_redirect_uri
-
         #
-        # Default scope to BASIC_READ. The API itself will do this, but the OAuth2Client library complains if scope is
-        # None.
+        # The config defaults scope to BASIC_READ. The API itself will do this, but the OAuth2Client library complains
+        # if scope is None.
         #
-        if app_scope is None:
-            self.app_scope = upapi.scopes.BASIC_READ
+        if isinstance(app_id, upapi.config.AppConfig):
+            if (app_secret, app_redirect_uri, app_scope) != (None, None, None):
+                raise TypeError('Pass app_secret, app_redirect_uri and app_scope in the AppConfig, not with it')
+            self.config = app_id
+        elif app_secret is None or app_redirect_uri is None:
+            raise TypeError('UpApi needs app_secret and app_redirect_uri, or an AppConfig in place of app_id')
         else:
-            self.app_scope = app_scope
+            self.config = upapi.config.AppConfig(app_id, app_secret, app_redirect_uri, app_scope)
+        self.app_id = self.config.app_id
+        self.app_secret = self.config.app_secret
+        self.app_scope = self.config.scope
+
+        self.timeout = timeout
+        self.deadline = deadline
+        self.endpoint_timeouts = dict(ENDPOINT_TIMEOUTS)
+        if endpoint_timeouts is not None:
+            self.endpoint_timeouts.update(endpoint_timeouts)
+        self.breakers = breakers
+        self.transport = transport
+
+        #
+        # Each thread gets its own authorized Http objects (see the http property), one per timeout. Bumping the
+        # generation invalidates them all, e.g. when the credentials change. With a shared transport, they are thin
+        # wrappers that authorize each request.
+        #
+        self._local = threading.local()
+        self._http_generation = 0
 
         #
         # Set storage first, so that set_store gets called when setting credentials.
@@ -69,13 +152,20 @@ class UpApi(object):
         self.credentials = user_credentials
 
         #
-        # Initialize the OAuth objects.
+        # Initialize the OAuth objects. The flow is shared by every UpApi object with the same config.
         #
         self.flow = None
         self._refresh_flow()
-        self.http = None
         self._refresh_http()
 
+        #
+        # The user's xid is learned from the first response's meta data, and keys this user's data in the mirror. It is
+        # the only attribute a request ever sets, and every response carries the same value.
+        #
+        self.mirror = mirror
+        self.user_xid = None
+        self.parse_pool = parse_pool
+
         super(UpApi, self).__init__()
 
     def token_to_creds(self, token):
@@ -91,32 +181,106 @@ class UpApi(object):
             self.app_secret,
             token['refresh_token'],
             datetime.datetime.now() + datetime.timedelta(seconds=token['expires_in']),
-            upapi.endpoints.TOKEN,
+            self.config.token_uri,
             USERAGENT,
             token_response=token,
             scopes=self.app_scope)
 
     def _refresh_flow(self):
         """
-        Get a new flow object--called automatically when creating the object or updating the redirect URI.
+        Get the config's flow object--called automatically when creating the object or updating the redirect URI.
         """
-        self.flow = oauth2client.client.OAuth2WebServerFlow(
-            self.app_id,
-            client_secret=self.app_secret,
-            scope=self.app_scope,
-            redirect_uri=self.redirect_uri,
-            user_agent=USERAGENT,
-            auth_uri=upapi.endpoints.AUTH,
-            token_uri=upapi.endpoints.TOKEN)
+        self.flow = self.config.flow
 
     def _refresh_http(self):
         """
         Get new http object--called automatically when creating the object or updating the credentials/token.
         """
+        self._http_generation += 1
+        self._get_http(self.timeout)
+
+    def _get_http(self, timeout):
+        """
+        Get the calling thread's authorized Http object for a timeout, creating it if necessary.
+
+        :param timeout: socket timeout in seconds or None
+        :return: the authorized httplib2.Http object or None if there are no credentials
+        """
+        if getattr(self._local, 'generation', None) != self._http_generation:
+            self._local.https = {}
+            self._local.generation = self._http_generation
         if self.credentials is None:
-            self.http = None
-        else:
-            self.http = self.credentials.authorize(httplib2.Http())
+            return None
+        http = self._local.https.get(timeout)
+        if http is None:
+            if self.transport is None:
+                http = self.credentials.authorize(httplib2.Http(timeout=timeout))
+            else:
+                http = _AuthorizedTransport(self, timeout)
+            self._local.https[timeout] = http
+        return http
+
+    def _discard_http(self, timeout):
+        """
+        Close and forget the calling thread's Http object for a timeout, e.g. after a read timed out in the middle of a
+        response, which leaves its connection unusable.
+
+        :param timeout: socket timeout in seconds or None
+        """
+        http = getattr(self._local, 'https', {}).pop(timeout, None)
+        connections = getattr(http, 'connections', None)
+        if isinstance(connections, dict):
+            for conn in connections.values():
+                conn.close()
+
+    @property
+    def http(self):
+        """
+        The authorized Http object for the calling thread. httplib2.Http objects are not thread-safe, so every thread
+        gets its own, which it keeps reusing (along with its open connections) for later requests.
+
+        :return: the authorized httplib2.Http object or None if there are no credentials
+        """
+        return self._get_http(self.timeout)
+
+    def _limits(self, url):
+        """
+        Get the timeout and deadline for an endpoint.
+
+        :param url: the request URL
+        :return: (timeout, deadline) tuple of seconds or None
+        """
+        path = url.split('?')[0]
+        for suffix, limits in self.endpoint_timeouts.items():
+            if path.endswith(suffix):
+                return limits
+        return self.timeout, self.deadline
+
+    def _breaker(self, url):
+        """
+        Get the circuit breaker for a URL's endpoint family and check that it lets a request through. The caller must
+        record the outcome of the request on the breaker, whatever happens.
+
+        :param url: endpoint to send a request
+        :return: tuple of upapi.breaker.CircuitBreaker object (or None if circuit breaking is disabled) and whether the
+            request is the breaker's probe
+        """
+        if self.breakers is None:
+            return None, False
+        breaker = self.breakers.get(upapi.breaker.family(url))
+        return breaker, breaker.allow()
+
+    def _check_deadline(self, url, started, deadline):
+        """
+        Raise if a call has run past its deadline.
+
+        :param url: the request URL
+        :param started: timer value when the call started
+        :param deadline: seconds the call may take or None
+        """
+        elapsed = timeit.default_timer() - started
+        if deadline is not None and elapsed > deadline:
+            raise upapi.exceptions.Timeout('{} exceeded its {}s deadline'.format(url, deadline), elapsed=elapsed)
 
     @property
     def redirect_uri(self):
@@ -125,7 +289,7 @@ class UpApi(object):
 
         :return: the URI
         """
-        return self._redirect_uri
+        return self.config.redirect_uri
 
     @redirect_uri.setter
     def redirect_uri(self, url):
@@ -134,7 +298,7 @@ class UpApi(object):
 
         :param url: the specific redirect_url for this connection
         """
-        self._redirect_uri = url
+        self.config = self.config._replace(redirect_uri=url)
         self._refresh_flow()
 
     @property
@@ -194,11 +358,7 @@ class UpApi(object):
 
         :param callback_url: The full URL on your server that Jawbone sent the user back to
         """
-        #
-        # Parse the code parameter out of the URL.
-        #
-        code = urlparse.parse_qs(urlparse.urlparse(callback_url).query)['code'][0]
-        self.credentials = self.flow.step2_exchange(code)
+        self.credentials = self.flow.step2_exchange(callback_code(callback_url))
         return self.token
 
     def refresh_token(self):
@@ -209,43 +369,176 @@ class UpApi(object):
         # Need a fresh Http object because we cannot pass the existing access token to the refresh endpoint, and then
         # we need to refresh the Http object with the new credentials.
         #
-        self.credentials.refresh(httplib2.Http())
+        self.credentials.refresh(httplib2.Http(timeout=self.timeout))
         self._refresh_http()
         return self.token
 
-    def _raise_for_status(self, ok_statuses):
+    @property
+    def last_response(self):
+        """
+        The last upapi.response.Response received by the calling thread. Prefer the Response returned by request, which
+        cannot be confused with another call's.
+
+        :return: the Response object or None
         """
-        Check the API response status and throw an exception if necessary.
+        return getattr(self._local, 'response', None)
+
+    @property
+    def meta(self):
+        """
+        The Meta object of the last response received by the calling thread.
+
+        :return: the Meta object or None
+        """
+        response = self.last_response
+        return None if response is None else response.meta
+
+    def _raise_for_status(self, ok_statuses, resp, content, headers=None, started=None):
+        """
+        Check the API response status and throw an exception if necessary: the upapi.exceptions.UnexpectedAPIResponse
+        subclass for the status (see upapi.exceptions.for_status), carrying the status, headers, error meta data and
+        elapsed time.
 
         :param ok_statuses: list of acceptable response codes
+        :param resp: response to check
+        :param content: response body
+        :param headers: optional dict of response headers
+        :param started: optional timer value when the request was sent
         """
-        if self.resp.status not in ok_statuses:
-            raise upapi.exceptions.UnexpectedAPIResponse('{} {}'.format(self.resp.status, self.content))
+        if resp.status not in ok_statuses:
+            #
+            # Python 3 bodies are bytes, which would show up in the message as b'...'.
+            #
+            message = content
+            if not isinstance(content, str):
+                message = content.decode('utf-8', 'replace')
+            raise upapi.exceptions.for_status(resp.status)(
+                '{} {}'.format(resp.status, message),
+                status=resp.status,
+                headers=headers,
+                meta=_error_meta(content),
+                elapsed=None if started is None else timeit.default_timer() - started)
 
-    def _request(self, url, method='GET', data=None, ok_statuses=None):
+    def _respond(self, status, headers, resp_json, started):
+        """
+        Build the Response object for a decoded response body and remember it for the calling thread.
+
+        :param status: HTTP status code
+        :param headers: dict of response headers
+        :param resp_json: decoded response body
+        :param started: timer value when the request was sent
+        :return: upapi.response.Response object
+        """
+        meta = upapi.meta.Meta(**resp_json['meta'])
+        if self.user_xid is None:
+            self.user_xid = meta.user_xid
+        response = upapi.response.Response(
+            status,
+            headers,
+            meta,
+            resp_json['data'],
+            timeit.default_timer() - started)
+        self._local.response = response
+        return response
+
+    def request(self, url, method='GET', data=None, ok_statuses=None, headers=None, columns=None):
         """
-        Issue an HTTP request using the authorized Http object, handle bad responses, set the Meta object from the
-        response content, and return the data as JSON.
+        Issue an HTTP request using the authorized Http object, handle bad responses, and return everything about the
+        response. Nothing is stored on the object, so one object can serve many threads at once.
+
+        A 304 Not Modified response (e.g., to a conditional request with an If-None-Match header and 304 among the
+        ok_statuses) has no body, so its Response has no meta or data.
 
         :param url: endpoint to send the request
         :param method: HTTP method (e.g. GET, POST, etc.), defaults to GET
-        :return: JSON data
+        :param data: optional dict of form fields to send as the request body
+        :param ok_statuses: list of acceptable response codes, defaults to [200]
+        :param headers: optional dict of extra request headers
+        :param columns: optional item field names of a list response to decode into one array per field (see
+            upapi.parsing.decode_columns), in a worker of the parse pool if there is one
+        :return: upapi.response.Response object
         """
-        #
-        # TODO: clean up the ability to send a POST and add unit tests.
-        #
+        url = upapi.endpoints.on_domain(url, self.config.domain)
+        headers = dict(headers or {})
         if data is None:
             req_body = None
         else:
-            req_body = urllib.urlencode(data)
-        self.resp, self.content = self.http.request(url, method, body=req_body)
+            req_body = _urlencode(_form_fields(data))
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+
+        #
+        # httplib2 can only time out socket operations, so the deadline connections (see _DeadlineResponse) wait no
+        # longer than the rest of the deadline on every read, and a server trickling bytes gets cut off. A write that
+        # completed is never reported as timed out, since retrying it would repeat it.
+        #
+        timeout, deadline = self._limits(url)
+        breaker, probe = self._breaker(url)
+        healthy = False
+        started = timeit.default_timer()
+        try:
+            http = self._get_http(_shortest(timeout, deadline))
+            _call.deadline = None if deadline is None else started + deadline
+            try:
+                resp, content = http.request(
+                    url,
+                    method,
+                    body=req_body,
+                    headers=headers,
+                    connection_type=_DEADLINE_CONNECTIONS.get(urlparse.urlparse(url).scheme))
+            except socket.timeout:
+                self._discard_http(_shortest(timeout, deadline))
+                raise upapi.exceptions.Timeout(
+                    '{} timed out after {}s'.format(url, _shortest(timeout, deadline)),
+                    elapsed=timeit.default_timer() - started)
+            except httplib.IncompleteRead:
+                raise upapi.exceptions.IncompleteResponse(
+                    '{} sent an incomplete body'.format(url),
+                    elapsed=timeit.default_timer() - started)
+            finally:
+                _call.deadline = None
+            if method in IDEMPOTENT_METHODS:
+                self._check_deadline(url, started, deadline)
+            healthy = resp.status < httplib.INTERNAL_SERVER_ERROR
+        finally:
+            if breaker is not None:
+                breaker.record(healthy, probe)
 
         if ok_statuses is None:
             ok_statuses = [httplib.OK]
-        self._raise_for_status(ok_statuses)
-        resp_json = json.loads(self.content)
-        self.meta = upapi.meta.Meta(**resp_json['meta'])
-        return resp_json['data']
+        self._raise_for_status(ok_statuses, resp, content, dict(resp), started)
+        if resp.status == httplib.NOT_MODIFIED:
+            response = upapi.response.Response(
+                resp.status,
+                dict(resp),
+                None,
+                None,
+                timeit.default_timer() - started)
+            self._local.response = response
+            return response
+        try:
+            if self.parse_pool is None:
+                resp_json = upapi.parsing.decode(content, columns)
+            else:
+                resp_json = self.parse_pool.decode(content, columns)
+        except ValueError:
+            raise upapi.exceptions.IncompleteResponse(
+                '{} sent a body that is not complete JSON'.format(url),
+                status=resp.status,
+                headers=dict(resp),
+                elapsed=timeit.default_timer() - started)
+        return self._respond(resp.status, dict(resp), resp_json, started)
+
+    def _request(self, url, method='GET', data=None, ok_statuses=None):
+        """
+        Issue an HTTP request (see request) and return the response data as JSON.
+
+        :param url: endpoint to send the request
+        :param method: HTTP method (e.g. GET, POST, etc.), defaults to GET
+        :param data: optional dict of form fields to send as the request body
+        :param ok_statuses: list of acceptable response codes, defaults to [200]
+        :return: JSON data
+        """
+        return self.request(url, method=method, data=data, ok_statuses=ok_statuses).data
 
     def get(self, url):
         """
@@ -256,6 +549,328 @@ class UpApi(object):
         """
         return self._request(url)
 
+    def post(self, url, data):
+        """
+        Send a POST request to URL.
+
+        :param url: endpoint to send the POST
+        :param data: dict of form fields
+        :return: JSON data
+        """
+        return self._request(url, method='POST', data=data, ok_statuses=[httplib.OK, httplib.CREATED])
+
+    def get_pages(self, url, params=None):
+        """
+        Send GET requests to a list endpoint, following the next links until the last page.
+
+        :param url: list endpoint to send the GET
+        :param params: optional dict of query parameters for the first page
+        :return: generator of JSON data, one per page
+        """
+        url = _with_params(url, params)
+        while url is not None:
+            data = self.get(url)
+            yield data
+            url = _next_url(data, self.config.domain)
+
+    def _stream_connection(self, url, timeout):
+        """
+        Get this thread's keep-alive connection to the URL's host for streaming requests.
+
+        :param url: the request URL
+        :param timeout: socket timeout in seconds or None
+        :return: httplib connection
+        """
+        parts = urlparse.urlparse(url)
+        connections = getattr(self._local, 'stream_connections', None)
+        if connections is None:
+            connections = self._local.stream_connections = {}
+        key = (parts.scheme, parts.netloc)
+        if key not in connections:
+            if parts.scheme == 'https':
+                connections[key] = httplib.HTTPSConnection(parts.netloc, timeout=timeout)
+            else:
+                connections[key] = httplib.HTTPConnection(parts.netloc, timeout=timeout)
+        conn = connections[key]
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        return conn
+
+    def _close_stream_connection(self, url):
+        """
+        Close and forget this thread's streaming connection to the URL's host, e.g. after an unfinished response.
+
+        :param url: the request URL
+        """
+        parts = urlparse.urlparse(url)
+        conn = getattr(self._local, 'stream_connections', {}).pop((parts.scheme, parts.netloc), None)
+        if conn is not None:
+            conn.close()
+
+    def _open_stream(self, url, path, headers, timeout):
+        """
+        Send a GET request over the shared transport if there is one, or else this thread's streaming connection.
+
+        :param url: endpoint to send the GET
+        :param path: the URL's path and query
+        :param headers: dict of request headers
+        :param timeout: socket timeout in seconds or None
+        :return: httplib or upapi.transport.StreamResponse response with an unread body
+        """
+        if self.transport is not None:
+            return self.transport.stream(url, headers=headers, timeout=timeout)
+        conn = self._stream_connection(url, timeout)
+        conn.request('GET', path, headers=headers)
+        return conn.getresponse()
+
+    def _stream_request(self, url):
+        """
+        Send a GET request and return the response without reading its body. httplib2 always reads the whole body, so
+        streaming requests go through httplib (or the shared transport) with the credentials applied by hand.
+
+        :param url: endpoint to send the GET
+        :return: httplib response with an unread body
+        """
+        url = upapi.endpoints.on_domain(url, self.config.domain)
+        parts = urlparse.urlparse(url)
+        path = '{}?{}'.format(parts.path, parts.query) if parts.query else parts.path
+        timeout, deadline = self._limits(url)
+        breaker, probe = self._breaker(url)
+        healthy = False
+        try:
+            for attempt in range(2):
+                headers = {'user-agent': USERAGENT, 'accept-encoding': 'identity'}
+                self.credentials.apply(headers)
+                try:
+                    resp = self._open_stream(url, path, headers, _shortest(timeout, deadline))
+                except socket.timeout:
+                    self._close_stream_connection(url)
+                    raise upapi.exceptions.Timeout('{} timed out after {}s'.format(url, timeout))
+                except (httplib.HTTPException, IOError):
+                    #
+                    # The server may have closed the kept-alive connection, so retry once on a new one.
+                    #
+                    self._close_stream_connection(url)
+                    if attempt:
+                        raise
+                    continue
+
+                #
+                # Like the authorized httplib2 object, refresh an expired access token and try again.
+                #
+                if resp.status == httplib.UNAUTHORIZED and not attempt:
+                    resp.read()
+                    self.refresh_token()
+                    continue
+                healthy = resp.status < httplib.INTERNAL_SERVER_ERROR
+                return resp
+        finally:
+            if breaker is not None:
+                breaker.record(healthy, probe)
+
+    def _read_chunks(self, url, resp, chunk_size):
+        """
+        Read a streamed response body a chunk at a time, within the endpoint's deadline. Only time spent waiting on the
+        network counts towards the deadline, not time the caller spends between chunks.
+
+        :param url: the request URL
+        :param resp: httplib response with an unread body
+        :param chunk_size: number of bytes to read at a time
+        :return: generator of byte strings
+        """
+        timeout, deadline = self._limits(url)
+        waited = 0
+        while True:
+            started = timeit.default_timer()
+            try:
+                chunk = resp.read(chunk_size)
+            except socket.timeout:
+                raise upapi.exceptions.Timeout(
+                    '{} timed out after {}s'.format(url, timeout),
+                    elapsed=waited + timeit.default_timer() - started)
+            except httplib.IncompleteRead:
+                chunk = None
+            waited += timeit.default_timer() - started
+            if deadline is not None and waited > deadline:
+                raise upapi.exceptions.Timeout('{} exceeded its {}s deadline'.format(url, deadline), elapsed=waited)
+
+            #
+            # Python 3 raises IncompleteRead when the connection drops before Content-Length bytes arrived, while
+            # Python 2 returns an empty chunk with some of the length left.
+            #
+            if chunk is None or (not chunk and getattr(resp, 'length', None)):
+                raise upapi.exceptions.IncompleteResponse(
+                    '{} sent an incomplete body'.format(url),
+                    status=resp.status,
+                    headers=_headers(resp),
+                    elapsed=waited)
+            if not chunk:
+                return
+            yield chunk
+
+    def stream_items(self, url, params=None, chunk_size=upapi.stream.CHUNK_SIZE):
+        """
+        Iterate over the items of a list endpoint as they arrive, following the next links until the last page. Bodies
+        are parsed incrementally, so only the current chunk and item are held in memory rather than whole pages.
+
+        :param url: list endpoint to send the GET
+        :param params: optional dict of query parameters for the first page
+        :param chunk_size: number of bytes to read at a time
+        :return: generator of item dicts
+        """
+        url = _with_params(url, params)
+        while url is not None:
+            started = timeit.default_timer()
+            resp = self._stream_request(url)
+            finished = False
+            try:
+                if resp.status != httplib.OK:
+                    self._raise_for_status([httplib.OK], resp, _read_body(resp), _headers(resp), started)
+                items = upapi.stream.ItemStream(self._read_chunks(url, resp, chunk_size))
+                try:
+                    for item in items:
+                        yield item
+                except ValueError:
+                    raise upapi.exceptions.IncompleteResponse(
+                        '{} sent a body that is not complete JSON'.format(url),
+                        status=resp.status,
+                        headers=_headers(resp),
+                        elapsed=timeit.default_timer() - started)
+                finished = True
+            finally:
+                if not finished:
+                    resp.close()
+                    self._close_stream_connection(url)
+
+            response = self._respond(resp.status, _headers(resp), items.response, started)
+            url = _next_url(response.data, self.config.domain)
+
+    def download(self, url, fileobj, chunk_size=upapi.stream.CHUNK_SIZE):
+        """
+        Stream a binary resource (e.g., upapi.endpoints.MOVESGRAPH images) into a file object, a chunk at a time.
+
+        :param url: endpoint to send the GET
+        :param fileobj: file or buffer opened for binary writing
+        :param chunk_size: number of bytes to read at a time
+        :return: number of bytes written
+        """
+        started = timeit.default_timer()
+        resp = self._stream_request(url)
+        size = 0
+        finished = False
+        try:
+            if resp.status != httplib.OK:
+                self._raise_for_status([httplib.OK], resp, _read_body(resp), _headers(resp), started)
+            for chunk in self._read_chunks(url, resp, chunk_size):
+                fileobj.write(chunk)
+                size += len(chunk)
+            finished = True
+        finally:
+            if not finished:
+                resp.close()
+                self._close_stream_connection(url)
+        return size
+
+    def get_item(self, url, xid):
+        """
+        Get a single resource by xid, reading through the mirror if there is one.
+
+        :param url: resource endpoint ending with an {xid} placeholder, e.g. upapi.endpoints.MOVES
+        :param xid: the resource's xid
+        :return: JSON data
+        """
+        if not url.endswith(upapi.endpoints.XID):
+            raise ValueError('Not a resource endpoint: {}'.format(url))
+        #
+        # The mirror is per user, so it can only answer once the user's xid is known, i.e. after the first response.
+        #
+        if self.mirror is not None and self.user_xid is not None:
+            item = self.mirror.get_item(self.user_xid, xid)
+            if item is not None:
+                return item
+
+        item = self.get(url.format(xid=xid))
+        if self.mirror is not None:
+            self.mirror.put_item(self.user_xid, resource_kind(url), item)
+        return item
+
+    def _mirror_update(self, url, item):
+        """
+        Keep the mirror in step with an update, so get_item does not return the old copy.
+
+        :param url: resource endpoint ending with an {xid} placeholder, e.g. upapi.endpoints.MEALS
+        :param item: the updated item as returned by the API
+        :return: the item
+        """
+        if self.mirror is not None and self.user_xid is not None:
+            self.mirror.update_item(self.user_xid, resource_kind(url), item)
+        return item
+
+    def _mirror_delete(self, xid, data):
+        """
+        Keep the mirror in step with a delete, so get_item fetches (and fails to find) the deleted resource.
+
+        :param xid: the deleted resource's xid
+        :param data: JSON data of the delete response
+        :return: the data
+        """
+        if self.mirror is not None and self.user_xid is not None:
+            self.mirror.delete_item(self.user_xid, xid)
+        return data
+
+    def get_range(self, url, start_date, end_date):
+        """
+        Get every item of a list endpoint (e.g., upapi.endpoints.USERMOVES) dated from start_date to end_date. With a
+        mirror, only days that have not been completely mirrored are fetched from the API.
+
+        :param url: list endpoint
+        :param start_date: first date in YYYYMMDD format
+        :param end_date: last date in YYYYMMDD format
+        :return: list of item dicts ordered by date
+        """
+        kind = resource_kind(url)
+        if self.mirror is None:
+            return sorted(self._get_dates(url, start_date, end_date), key=lambda item: item['date'])
+
+        if self.user_xid is None:
+            self.get(upapi.endpoints.USER)
+
+        #
+        # Days before the user's today will not get new items, so they never need to be fetched again. The user's
+        # today depends on the zone the user is in, not the zone this code runs in.
+        #
+        zone = upapi.timezones.TIMEZONES.history(self).zone_at(time.time())
+        today = upapi.mirror.from_date(datetime.datetime.now(zone).date())
+        missing = self.mirror.missing_dates(self.user_xid, kind, start_date, end_date)
+        for first, last in upapi.mirror.date_runs(missing):
+            self.mirror.put_items(self.user_xid, kind, self._get_dates(url, first, last))
+            self.mirror.mark_dates(
+                self.user_xid,
+                kind,
+                [date for date in upapi.mirror.date_range(first, last) if date < today])
+        return self.mirror.query(self.user_xid, kind, start_date, end_date)
+
+    def _get_dates(self, url, start_date, end_date):
+        """
+        Fetch every item of a list endpoint dated from start_date to end_date, with one paged time range query.
+
+        :param url: list endpoint
+        :param start_date: first date in YYYYMMDD format
+        :param end_date: last date in YYYYMMDD format
+        :return: list of item dicts
+        """
+        #
+        # Dates are in the user's zone at the time, so query the range padded by the widest zone offsets (UTC-12 to
+        # UTC+14) and keep the items dated in it.
+        #
+        start_time = calendar.timegm(upapi.mirror.to_date(start_date).timetuple()) - 14 * 3600
+        end_time = calendar.timegm(upapi.mirror.to_date(end_date).timetuple()) + 36 * 3600
+        items = []
+        for page in self.get_pages(url, {'start_time': start_time, 'end_time': end_time}):
+            items.extend(item for item in page['items'] if start_date <= item.get('date', 0) <= end_date)
+        return items
+
     def delete(self, url):
         """
         Send a DELETE request to URL.
@@ -289,3 +904,247 @@ class UpApi(object):
     #     Delete a user-specific pubsub webhook.
     #     """
     #     self.delete(upapi.endpoints.PUBSUB)
+
+
+class _AuthorizedTransport(object):
+    """
+    Authorize requests sent over a shared transport with an UpApi object's credentials, like credentials.authorize
+    does for httplib2.Http objects.
+    """
+    def __init__(self, up, timeout):
+        """
+        Wrap the UpApi object's transport.
+
+        :param up: UpApi object with a transport and credentials
+        :param timeout: socket timeout in seconds or None
+        """
+        self.up = up
+        self.timeout = timeout
+        super(_AuthorizedTransport, self).__init__()
+
+    def request(self, uri, method='GET', body=None, headers=None, connection_type=None):
+        """
+        Send an authorized request, refreshing an expired access token and trying again once. The transport waits no
+        longer than the rest of the call's deadline.
+
+        :param uri: request URL
+        :param method: HTTP method
+        :param body: optional request body
+        :param headers: optional dict of request headers
+        :param connection_type: ignored; the transport manages its own connections
+        :return: tuple of httplib2.Response and body
+        """
+        for attempt in range(2):
+            req_headers = {'user-agent': USERAGENT}
+            req_headers.update(headers or {})
+            self.up.credentials.apply(req_headers)
+            resp, content = self.up.transport.request(
+                uri,
+                method,
+                body=body,
+                headers=req_headers,
+                timeout=_read_timeout(self.timeout))
+            if resp.status != httplib.UNAUTHORIZED or attempt:
+                return resp, content
+            self.up.refresh_token()
+
+
+def _read_timeout(timeout):
+    """
+    Get the socket timeout for the next read of the calling thread's call: the timeout, or less if the call's deadline
+    is sooner.
+
+    :param timeout: socket timeout in seconds or None
+    :return: seconds or None
+    """
+    deadline = getattr(_call, 'deadline', None)
+    if deadline is None:
+        return timeout
+    remaining = deadline - timeit.default_timer()
+    if remaining <= 0:
+        raise socket.timeout('deadline exceeded')
+    return _shortest(timeout, remaining)
+
+
+class _DeadlineSocket(object):
+    """
+    Wrap the socket a response reads through, setting the socket timeout from the call's remaining deadline before
+    every receive.
+    """
+    def __init__(self, sock):
+        """
+        Wrap the socket.
+
+        :param sock: socket object
+        """
+        self.sock = sock
+        self.timeout = sock.gettimeout()
+        super(_DeadlineSocket, self).__init__()
+
+    def _timed(self, name, *args):
+        """
+        Call a receive method of the socket within the remaining deadline.
+
+        :param name: method name
+        :param args: method arguments
+        :return: what the method returns
+        """
+        self.sock.settimeout(_read_timeout(self.timeout))
+        try:
+            return getattr(self.sock, name)(*args)
+        finally:
+            self.sock.settimeout(self.timeout)
+
+    def recv(self, *args):
+        return self._timed('recv', *args)
+
+    def recv_into(self, *args):
+        return self._timed('recv_into', *args)
+
+    def __getattr__(self, name):
+        return getattr(self.sock, name)
+
+
+class _DeadlineResponse(httplib.HTTPResponse):
+    """
+    An httplib response whose reads wait no longer than the rest of the call's deadline.
+    """
+    def __init__(self, sock, *args, **kwargs):
+        #
+        # Python 2 httplib classes are old-style, so super does not work.
+        #
+        httplib.HTTPResponse.__init__(self, sock, *args, **kwargs)
+
+        #
+        # Time the receives of the file httplib made, which keeps the socket open after the connection lets go of it.
+        # Its socket is what the file reads through: the raw SocketIO's on Python 3, the file object's on Python 2.
+        #
+        raw = getattr(self.fp, 'raw', self.fp)
+        raw._sock = _DeadlineSocket(raw._sock)
+
+
+class _DeadlineHTTPConnection(httplib2.HTTPConnectionWithTimeout):
+    response_class = _DeadlineResponse
+
+
+class _DeadlineHTTPSConnection(httplib2.HTTPSConnectionWithTimeout):
+    response_class = _DeadlineResponse
+
+
+_DEADLINE_CONNECTIONS = {'http': _DeadlineHTTPConnection, 'https': _DeadlineHTTPSConnection}
+
+
+def callback_code(callback_url):
+    """
+    Parse the authorization code out of an OAuth callback URL.
+
+    :param callback_url: The full URL on your server that Jawbone sent the user back to
+    :return: the code
+    """
+    return urlparse.parse_qs(urlparse.urlparse(callback_url).query)['code'][0]
+
+
+def resource_kind(url):
+    """
+    Get the resource kind (e.g., moves) from an endpoint URL, such as upapi.endpoints.USERMOVES or MOVESGRAPH.
+
+    :param url: list or resource endpoint
+    :return: the kind
+    """
+    path = url.split('?')[0].split(upapi.endpoints.XID)[0].rstrip('/')
+    return path.rsplit('/', 1)[-1]
+
+
+def _headers(resp):
+    """
+    Get the headers of an httplib (or transport) response with lowercase names, like httplib2 responses have.
+
+    :param resp: response with a getheaders method
+    :return: dict of lowercase header names to values
+    """
+    return dict((name.lower(), val) for name, val in resp.getheaders())
+
+
+def _error_meta(content):
+    """
+    Get the meta data from an error response body, if it has any.
+
+    :param content: response body
+    :return: upapi.meta.Meta object, or None if the body is not a JSON response with meta data
+    """
+    try:
+        meta = json.loads(content)['meta']
+        return upapi.meta.Meta(meta.get('user_xid'), meta.get('message'), meta['code'], meta['time'])
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def _read_body(resp):
+    """
+    Read the rest of a streamed response body, e.g. of an error, keeping what arrived if the body is cut off.
+
+    :param resp: httplib response with an unread body
+    :return: byte string
+    """
+    try:
+        return resp.read()
+    except httplib.IncompleteRead as error:
+        return error.partial
+
+
+def _shortest(*limits):
+    """
+    Get the shortest of some time limits.
+
+    :param limits: seconds or None for no limit
+    :return: the shortest limit or None if there is none
+    """
+    limits = [limit for limit in limits if limit is not None]
+    return min(limits) if limits else None
+
+
+def _with_params(url, params):
+    """
+    Add query parameters to a URL.
+
+    :param url: endpoint
+    :param params: dict of query parameters or None
+    :return: the URL
+    """
+    if params:
+        return '{}?{}'.format(url, _urlencode(params))
+    return url
+
+
+def _next_url(data, domain=None):
+    """
+    Get the URL of the next page of a list response.
+
+    :param data: data of a list response
+    :param domain: base URL the list came from, defaults to upapi.endpoints.DOMAIN
+    :return: the URL or None on the last page
+    """
+    next_page = data.get('links', {}).get('next')
+    if next_page is None:
+        return None
+    return '{}{}'.format(domain or upapi.endpoints.DOMAIN, next_page)
+
+
+def _form_fields(data):
+    """
+    Prepare a dict for form encoding. The API expects nested values (e.g., meal items) as JSON strings and unicode
+    values as UTF-8.
+
+    :param data: dict of form fields
+    :return: dict of encodable form fields
+    """
+    fields = {}
+    for key, val in data.items():
+        if isinstance(val, (dict, list, tuple)):
+            val = json.dumps(val)
+        elif isinstance(val, bool):
+            val = str(val).lower()
+        elif isinstance(val, _TEXT):
+            val = val.encode('utf-8')
+        fields[key] = val
+    return fields
@@ -0,0 +1,85 @@
+"""
+Helpers for sending many UP API requests concurrently. UpApi objects give each thread its own connection, so one object
+can be shared by all the workers.
+"""
+import collections
+import functools
+import itertools
+import multiprocessing.pool
+
+
+"""
+Default number of concurrent requests. Keep this modest; the UP API rate limits each app.
+"""
+MAX_WORKERS = 8
+
+"""
+Default number of items taken from the iterable at a time. At most two chunks are in flight, so a batch over a large
+iterable (e.g., events read from a file) never holds all of its items in memory.
+"""
+CHUNK_SIZE = 256
+
+"""
+The outcome of one batched call: the item it was called with, and either its return value or the exception it raised.
+"""
+Result = collections.namedtuple('Result', ['item', 'value', 'error'])
+
+
+def capture(func, item):
+    """
+    Call func with an item, capturing its return value or the exception it raised.
+
+    :param func: function taking a single item
+    :param item: the item
+    :return: Result object
+    """
+    try:
+        return Result(item, func(item), None)
+    except Exception as exc:
+        return Result(item, None, exc)
+
+
+def stream(func, items, max_workers=MAX_WORKERS, chunk_size=CHUNK_SIZE):
+    """
+    Call func once per item using at most max_workers threads, taking chunk_size items from the iterable at a time.
+    The next chunk starts while the results of the current one are consumed. A failing call does not stop the rest of
+    the batch.
+
+    :param func: function taking a single item
+    :param items: iterable of items
+    :param max_workers: maximum number of concurrent calls
+    :param chunk_size: maximum number of items taken from the iterable at a time
+    :return: generator of Result objects in the same order as items
+    """
+    items = iter(items)
+    chunk = list(itertools.islice(items, chunk_size))
+    if not chunk:
+        return
+
+    call = functools.partial(capture, func)
+    pool = multiprocessing.pool.ThreadPool(min(max_workers, len(chunk)))
+    try:
+        pending = pool.map_async(call, chunk, chunksize=1)
+        while pending is not None:
+            chunk = list(itertools.islice(items, chunk_size))
+            following = pool.map_async(call, chunk, chunksize=1) if chunk else None
+            for result in pending.get():
+                yield result
+            pending = following
+    finally:
+        pool.close()
+        pool.join()
+
+
+def run(func, items, max_workers=MAX_WORKERS, chunk_size=CHUNK_SIZE):
+    """
+    Call func once per item using at most max_workers threads (see stream).
+
+    :param func: function taking a single item
+    :param items: iterable of items
+    :param max_workers: maximum number of concurrent calls
+    :param chunk_size: maximum number of items taken from the iterable at a time
+    :return: list of Result objects in the same order as items
+    """
+    return list(stream(func, items, max_workers=max_workers, chunk_size=chunk_size))
+
@@ -0,0 +1,148 @@
+"""
+Circuit breakers stop sending requests to an endpoint family (e.g., moves) while the UP API keeps failing, so callers
+fail fast instead of piling up hung or failing calls. After a cool-down one probe request is let through: if it
+succeeds the breaker closes again, otherwise it stays open for another cool-down.
+"""
+import threading
+import timeit
+import upapi.endpoints
+import upapi.exceptions
+
+
+"""
+Consecutive failures (server errors, timeouts or connection errors) that open a breaker, and seconds an open breaker
+waits before letting a probe through.
+"""
+FAILURE_THRESHOLD = 5
+RESET_TIMEOUT = 30
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+
+def family(url):
+    """
+    Get the endpoint family of a URL: its resource kind, whether it is a list, an item or an item's ticks or graph.
+
+    :param url: endpoint URL, e.g. upapi.endpoints.USERMOVES or a formatted MOVESTICKS
+    :return: the family, e.g. moves
+    """
+    segments = [segment for segment in url.split('?')[0].split('://', 1)[-1].split('/')[1:] if segment]
+    if upapi.endpoints.VERSION in segments:
+        segments = segments[segments.index(upapi.endpoints.VERSION) + 1:]
+    if segments[:2] == ['users', '@me'] and len(segments) > 2:
+        segments = segments[2:]
+    return segments[0] if segments else ''
+
+
+class CircuitBreaker(object):
+    """
+    The CircuitBreaker tracks the health of one endpoint family. It is safe to share between threads.
+    """
+    def __init__(self, name, failure_threshold=FAILURE_THRESHOLD, reset_timeout=RESET_TIMEOUT):
+        """
+        Create a closed breaker.
+
+        :param name: endpoint family, used in error messages
+        :param failure_threshold: consecutive failures that open the breaker
+        :param reset_timeout: seconds to wait before probing an open breaker
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self._opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+        super(CircuitBreaker, self).__init__()
+
+    def allow(self):
+        """
+        Check whether a request may be sent. Every allowed request must be followed by a call to record, passing on
+        whether it was the probe.
+
+        :return: True if the request is the probe of a half-open breaker
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return False
+            if self.state == OPEN and timeit.default_timer() - self._opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self._probing = False
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+        raise upapi.exceptions.CircuitOpen('{} requests are failing fast until the API recovers'.format(self.name))
+
+    def record(self, healthy, probe=False):
+        """
+        Record the outcome of an allowed request. Only the probe decides whether a tripped breaker closes: outcomes of
+        requests sent before it tripped are ignored.
+
+        :param healthy: False for server errors, timeouts and connection errors
+        :param probe: the value allow returned for the request
+        """
+        with self._lock:
+            if probe:
+                self._probing = False
+                if healthy:
+                    self.state = CLOSED
+                    self.failures = 0
+                else:
+                    self.state = OPEN
+                    self._opened_at = timeit.default_timer()
+                return
+            if self.state != CLOSED:
+                return
+            if healthy:
+                self.failures = 0
+                return
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.state = OPEN
+                self._opened_at = timeit.default_timer()
+
+
+class BreakerRegistry(object):
+    """
+    The BreakerRegistry holds one CircuitBreaker per endpoint family. UpApi objects share BREAKERS by default.
+    """
+    def __init__(self, failure_threshold=FAILURE_THRESHOLD, reset_timeout=RESET_TIMEOUT):
+        """
+        Create an empty registry.
+
+        :param failure_threshold: consecutive failures that open a breaker
+        :param reset_timeout: seconds to wait before probing an open breaker
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers = {}
+        self._lock = threading.Lock()
+        super(BreakerRegistry, self).__init__()
+
+    def get(self, family):
+        """
+        Get the breaker for an endpoint family, creating it if necessary.
+
+        :param family: endpoint family, e.g. moves
+        :return: CircuitBreaker object
+        """
+        breaker = self._breakers.get(family)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(
+                    family,
+                    CircuitBreaker(family, self.failure_threshold, self.reset_timeout))
+        return breaker
+
+    def reset(self):
+        """
+        Forget every breaker, closing them all.
+        """
+        with self._lock:
+            self._breakers = {}
+
+
+BREAKERS = BreakerRegistry()
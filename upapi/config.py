@@ -0,0 +1,98 @@
+"""
+The AppConfig holds an app's OAuth settings from https://developer.jawbone.com. It is immutable, so one object can be
+shared by all the per-user UpApi objects of an app, and its OAuth flow is built once and copied for each of them.
+"""
+import collections
+import copy
+import oauth2client.client
+import threading
+import upapi.base
+import upapi.endpoints
+import upapi.scopes
+
+
+"""
+Maximum number of configurations whose flows are kept. The least recently used flow is dropped beyond it.
+"""
+MAX_FLOWS = 64
+
+_flows = collections.OrderedDict()
+_flows_lock = threading.Lock()
+
+
+class AppConfig(collections.namedtuple(
+        'AppConfig',
+        ['app_id', 'app_secret', 'redirect_uri', 'scope', 'auth_uri', 'token_uri', 'domain'])):
+    """
+    Immutable OAuth settings of an app. Pass one to UpApi (or any resource) in place of app_id, app_secret and
+    app_redirect_uri.
+    """
+    __slots__ = ()
+
+    def __new__(
+            cls,
+            app_id,
+            app_secret,
+            redirect_uri,
+            scope=None,
+            auth_uri=None,
+            token_uri=None,
+            domain=None):
+        """
+        Create the configuration.
+
+        :param app_id: Client ID from UP developer portal
+        :param app_secret: App Secret from UP developer portal
+        :param redirect_uri: one of your OAuth redirect URLs
+        :param scope: a scope or list of scopes (see upapi.scopes), defaults to upapi.scopes.BASIC_READ
+        :param auth_uri: OAuth authorization endpoint, defaults to upapi.endpoints.AUTH on the domain
+        :param token_uri: OAuth token endpoint, defaults to upapi.endpoints.TOKEN on the domain
+        :param domain: optional base URL that every request goes to instead of upapi.endpoints.DOMAIN, e.g. a
+            upapi.fakeserver.FakeUpApi's url
+        :return: AppConfig object
+        """
+        if scope is None:
+            scope = upapi.scopes.BASIC_READ
+        elif isinstance(scope, (list, set, frozenset)):
+            scope = tuple(scope)
+        if domain is not None:
+            domain = domain.rstrip('/')
+        if auth_uri is None:
+            auth_uri = upapi.endpoints.on_domain(upapi.endpoints.AUTH, domain)
+        if token_uri is None:
+            token_uri = upapi.endpoints.on_domain(upapi.endpoints.TOKEN, domain)
+        return super(AppConfig, cls).__new__(
+            cls,
+            app_id,
+            app_secret,
+            redirect_uri,
+            scope,
+            auth_uri,
+            token_uri,
+            domain)
+
+    @property
+    def flow(self):
+        """
+        A new copy of the OAuth flow for this configuration. The flow is built once per configuration (for the
+        MAX_FLOWS most recently used ones) and copied for each caller, so callers can change their copy.
+
+        :return: oauth2client.client.OAuth2WebServerFlow object
+        """
+        with _flows_lock:
+            flow = _flows.pop(self, None)
+            if flow is None:
+                flow = oauth2client.client.OAuth2WebServerFlow(
+                    self.app_id,
+                    client_secret=self.app_secret,
+                    scope=self.scope,
+                    redirect_uri=self.redirect_uri,
+                    user_agent=upapi.base.USERAGENT,
+                    auth_uri=self.auth_uri,
+                    token_uri=self.token_uri)
+            _flows[self] = flow
+            while len(_flows) > MAX_FLOWS:
+                _flows.popitem(last=False)
+        flow = copy.copy(flow)
+        flow.params = dict(flow.params)
+        return flow
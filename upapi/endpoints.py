@@ -1,7 +1,10 @@
 """
 This module holds all the UP API routes used in the SDK.
 https://jawbone.com/up/developer/endpoints
+
+To send an app's requests somewhere else, e.g. to a upapi.fakeserver, give its upapi.config.AppConfig a domain.
 """
+
 DOMAIN = 'https://jawbone.com'
 
 """
@@ -61,4 +64,17 @@ SLEEPSPHASES = '{}{}'.format(SLEEPS, TICKS)
 WORKOUTS = '{}/workouts/{}'.format(RESOURCE, XID)
 WORKOUTSGRAPH = '{}{}'.format(WORKOUTS, GRAPH)
 WORKOUTSTICKS = '{}{}'.format(WORKOUTS, TICKS)
-WORKOUTSUPDATE = '{}{}'.format(WORKOUTS, UPDATE)
\ No newline at end of file
+WORKOUTSUPDATE = '{}{}'.format(WORKOUTS, UPDATE)
+
+
+def on_domain(url, domain):
+    """
+    Point an endpoint at another server.
+
+    :param url: endpoint URL on DOMAIN
+    :param domain: base URL of the other server (e.g., http://127.0.0.1:8080), or None to keep DOMAIN
+    :return: the endpoint URL
+    """
+    if domain is None or not url.startswith(DOMAIN):
+        return url
+    return '{}{}'.format(domain.rstrip('/'), url[len(DOMAIN):])
\ No newline at end of file
@@ -1,17 +1,139 @@
 """
 Exceptions that the SDK will throw.
 """
+import email.utils
+import time
 
 
-class UnexpectedAPIResponse(Exception):
+class APIError(Exception):
+    """
+    Base class for failed API calls. It carries what is known about the call, so callers can react (e.g., retry or back
+    off) without parsing the message.
+    """
+    def __init__(self, message, status=None, headers=None, meta=None, elapsed=None):
+        """
+        Create the exception.
+
+        :param message: error message
+        :param status: HTTP status code, or None if no response arrived
+        :param headers: dict of response headers with lowercase names
+        :param meta: upapi.meta.Meta object from the error body, or None if the body had none
+        :param elapsed: seconds from sending the request until the failure, or None if unknown
+        """
+        super(APIError, self).__init__(message)
+        self.status = status
+        self.headers = {} if headers is None else headers
+        self.meta = meta
+        self.elapsed = elapsed
+
+    @property
+    def retry_after(self):
+        """
+        Seconds the API asked to wait before retrying, from the Retry-After header (in seconds or as an HTTP date).
+
+        :return: seconds, or None without a valid header
+        """
+        value = self.headers.get('retry-after')
+        if value is None:
+            return None
+        try:
+            return max(int(value), 0)
+        except ValueError:
+            parsed = email.utils.parsedate_tz(value)
+            if parsed is None:
+                return None
+            return max(int(email.utils.mktime_tz(parsed) - time.time()), 0)
+
+
+class UnexpectedAPIResponse(APIError):
     """
     UpApi raises this for API responses other than expected (according to the documentation)
     """
     pass
 
 
+class AuthError(UnexpectedAPIResponse):
+    """
+    UpApi raises this when the API rejects the credentials or their scope (401 or 403).
+    """
+    pass
+
+
+class NotFound(UnexpectedAPIResponse):
+    """
+    UpApi raises this when the requested resource does not exist (404).
+    """
+    pass
+
+
+class RateLimited(UnexpectedAPIResponse):
+    """
+    UpApi raises this when the app has sent too many requests (429). Wait retry_after seconds before retrying.
+    """
+    pass
+
+
+class ServerError(UnexpectedAPIResponse):
+    """
+    UpApi raises this when the API fails (5xx).
+    """
+    pass
+
+
+class Timeout(APIError):
+    """
+    UpApi raises this when the API does not respond within the configured timeout or deadline.
+    """
+    pass
+
+
+class IncompleteResponse(APIError):
+    """
+    UpApi raises this when a response body ends before it is complete (e.g., the connection dropped), so it cannot be
+    parsed.
+    """
+    pass
+
+
+class CircuitOpen(Exception):
+    """
+    UpApi raises this instead of sending a request while the endpoint's circuit breaker is open (see upapi.breaker).
+    """
+    pass
+
+
 class MissingCredentials(Exception):
     """
     Raised when trying to act on behalf of the user without setting the Credentials object.
     """
-    pass
\ No newline at end of file
+    pass
+
+
+class UnknownTimezone(Exception):
+    """
+    Raised for zone names that are not fixed offsets and that neither zoneinfo nor pytz (if installed) know.
+    """
+    pass
+
+
+"""
+Exceptions for unexpected statuses. Other statuses raise ServerError from 500 up, and UnexpectedAPIResponse below.
+"""
+STATUS_ERRORS = {
+    401: AuthError,
+    403: AuthError,
+    404: NotFound,
+    429: RateLimited,
+}
+
+
+def for_status(status):
+    """
+    Get the exception class for an unexpected response status.
+
+    :param status: HTTP status code
+    :return: UnexpectedAPIResponse or one of its subclasses
+    """
+    if status >= 500:
+        return ServerError
+    return STATUS_ERRORS.get(status, UnexpectedAPIResponse)
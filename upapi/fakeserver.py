@@ -0,0 +1,831 @@
+"""
+A fake UP API server for integration and load testing without real users or network access. It serves OAuth tokens,
+the user, friends, goals and settings (with ETags), list endpoints (with paging), single resources, ticks, graphs and
+pubsub webhooks, all generated deterministically from a seed, and can inject faults: latency, rate limiting, server
+errors and truncated bodies.
+
+Run it from the command line and point the SDK at it with the domain of the app's config:
+
+    python -m upapi.fakeserver --port 8080 --users 100 --latency 0.05 --server-error 0.01
+    config = upapi.config.AppConfig(client_id, client_secret, redirect_uri, domain='http://127.0.0.1:8080')
+
+Or start it in-process:
+
+    with upapi.fakeserver.FakeUpApi(users=10) as fake:
+        up = upapi.base.UpApi(fake.config())
+        up.token = fake.token(fake.users[0])
+"""
+import argparse
+import hashlib
+import json
+import random
+import socket
+import threading
+import time
+import upapi.endpoints
+
+try:
+    import http.client as httplib
+    import http.server as BaseHTTPServer
+    import socketserver as SocketServer
+    import urllib.parse as urlparse
+    _urlencode = urlparse.urlencode
+except ImportError:
+    import BaseHTTPServer
+    import SocketServer
+    import httplib
+    import urllib
+    import urlparse
+    _urlencode = urllib.urlencode
+
+
+"""
+Newest generated events happen on this day (2017-02-01, in unixtime), and older ones one day apart.
+"""
+EPOCH = 1485907200
+DAY = 86400
+
+"""
+Defaults for generated data: events per list endpoint per user, and items per page.
+"""
+ITEMS = 30
+PAGE_SIZE = 10
+
+"""
+Kinds of event the list endpoints serve, and the kinds with ticks.
+"""
+KINDS = (
+    'bandevents',
+    'body_events',
+    'generic_events',
+    'heartrates',
+    'meals',
+    'mood',
+    'moves',
+    'sleeps',
+    'timezone',
+    'trends',
+    'workouts')
+TICK_KINDS = ('moves', 'sleeps', 'workouts')
+
+"""
+Single resources per user, served with ETags.
+"""
+PROFILES = ('goals', 'settings')
+
+"""
+Fault names for Faults.fail_next.
+"""
+RATE_LIMITED = 'rate_limited'
+SERVER_ERROR = 'server_error'
+TRUNCATED = 'truncated'
+
+TOO_MANY_REQUESTS = 429
+
+_API = upapi.endpoints.RESOURCE[len(upapi.endpoints.DOMAIN):]
+_USER = upapi.endpoints.USER[len(upapi.endpoints.DOMAIN):]
+_TOKEN = upapi.endpoints.TOKEN[len(upapi.endpoints.DOMAIN):]
+_PNG = b'\x89PNG\r\n\x1a\n'
+
+
+def _xid(*parts):
+    """
+    Make a deterministic xid.
+
+    :param parts: values identifying the object
+    :return: 22 character xid
+    """
+    return hashlib.sha1(':'.join(str(part) for part in parts).encode('utf-8')).hexdigest()[:22]
+
+
+def _date(timestamp):
+    """
+    Get the UP API date (e.g., 20170201) of a unixtime, in UTC.
+
+    :param timestamp: unixtime
+    :return: date as an int
+    """
+    day = time.gmtime(timestamp)
+    return day.tm_year * 10000 + day.tm_mon * 100 + day.tm_mday
+
+
+class Faults(object):
+    """
+    The Faults object decides which requests fail. Each fault happens with its probability, drawn from a seeded random
+    generator, and fail_next queues faults for the next requests. Change the attributes at any time.
+    """
+    def __init__(self, latency=0.0, rate_limited=0.0, server_error=0.0, truncated=0.0, retry_after=1, seed=0):
+        """
+        Set the fault rates.
+
+        :param latency: seconds to wait before every response
+        :param rate_limited: probability of a 429 response
+        :param server_error: probability of a 503 response
+        :param truncated: probability of a body cut off halfway
+        :param retry_after: Retry-After seconds sent with 429 responses
+        :param seed: random seed
+        """
+        self.latency = latency
+        self.rate_limited = rate_limited
+        self.server_error = server_error
+        self.truncated = truncated
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._queue = []
+        self._lock = threading.Lock()
+        super(Faults, self).__init__()
+
+    def fail_next(self, fault, count=1):
+        """
+        Make the next requests fail.
+
+        :param fault: RATE_LIMITED, SERVER_ERROR or TRUNCATED
+        :param count: number of requests to fail
+        """
+        with self._lock:
+            self._queue.extend([fault] * count)
+
+    def draw(self):
+        """
+        Pick the fault for a request.
+
+        :return: RATE_LIMITED, SERVER_ERROR, TRUNCATED or None
+        """
+        with self._lock:
+            if self._queue:
+                return self._queue.pop(0)
+            roll = self._random.random()
+        for fault, rate in ((RATE_LIMITED, self.rate_limited), (SERVER_ERROR, self.server_error),
+                            (TRUNCATED, self.truncated)):
+            if roll < rate:
+                return fault
+            roll -= rate
+        return None
+
+
+class FakeUpApi(object):
+    """
+    The FakeUpApi serves generated UP API data over HTTP from a background thread.
+    """
+    def __init__(
+            self,
+            host='127.0.0.1',
+            port=0,
+            users=3,
+            items=ITEMS,
+            page_size=PAGE_SIZE,
+            seed=0,
+            client_id='client_id',
+            client_secret='client_secret',
+            faults=None):
+        """
+        Generate the users. The server starts with start (or as a context manager).
+
+        :param host: address to listen on
+        :param port: port to listen on, or 0 for any free port
+        :param users: number of users
+        :param items: events per list endpoint per user
+        :param page_size: default number of items per page
+        :param seed: seed for the generated data and faults
+        :param client_id: app client ID that the token endpoint accepts
+        :param client_secret: app secret that the token endpoint accepts
+        :param faults: optional Faults object, defaults to no faults
+        """
+        self.host = host
+        self.port = port
+        self.items = items
+        self.page_size = page_size
+        self.seed = seed
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.faults = Faults(seed=seed) if faults is None else faults
+        self.users = [_xid(seed, 'user', index) for index in range(users)]
+        self.webhooks = {}
+
+        #
+        # Index every event xid by owner, kind and index, so single resources are found without generating them all.
+        #
+        self._owners = dict(
+            (_xid(seed, user_xid, kind, index), (user_xid, kind, index))
+            for user_xid in self.users
+            for kind in KINDS
+            for index in range(items))
+        self._generation = 0
+        self._deleted = set()
+        self._created = {}
+        self._profiles = {}
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+        super(FakeUpApi, self).__init__()
+
+    @property
+    def url(self):
+        """
+        The server's base URL, to use as the domain of an upapi.config.AppConfig.
+
+        :return: URL like http://127.0.0.1:8080
+        """
+        return 'http://{}:{}'.format(self.host, self.port)
+
+    def config(self, redirect_uri='redirect_uri', scope=None):
+        """
+        Make the configuration of the fake app, pointing every request at this server.
+
+        :param redirect_uri: OAuth redirect URL
+        :param scope: optional scope or list of scopes
+        :return: upapi.config.AppConfig object
+        """
+        import upapi.config
+        return upapi.config.AppConfig(self.client_id, self.client_secret, redirect_uri, scope, domain=self.url)
+
+    def start(self):
+        """
+        Start serving in a background thread.
+
+        :return: this object
+        """
+        self._server = _Server((self.host, self.port), _Handler)
+        self._server.fake = self
+        self._server.connections = set()
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stop serving.
+        """
+        self._server.shutdown()
+        self._server.close_connections()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        """
+        Start serving.
+
+        :return: this object
+        """
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        """
+        Stop serving.
+
+        :param exc_info: ignored
+        """
+        self.stop()
+
+    def authorization_code(self, user_xid):
+        """
+        Get the authorization code the OAuth flow would send a user back with.
+
+        :param user_xid: user xid
+        :return: code for the token endpoint
+        """
+        return 'code-{}'.format(user_xid)
+
+    def token(self, user_xid):
+        """
+        Issue a token for a user without the OAuth flow.
+
+        :param user_xid: user xid
+        :return: token dict as returned by the token endpoint
+        """
+        with self._lock:
+            generation = self._generation
+        return {
+            'access_token': 'access-{}-{}'.format(user_xid, generation),
+            'refresh_token': 'refresh-{}'.format(user_xid),
+            'token_type': 'Bearer',
+            'expires_in': 31536000}
+
+    def expire_tokens(self):
+        """
+        Make every access token issued so far expire, so clients have to refresh them.
+        """
+        with self._lock:
+            self._generation += 1
+
+    def user_for(self, authorization):
+        """
+        Get the user of a valid access token.
+
+        :param authorization: Authorization header value
+        :return: user xid, or None if the token is invalid or expired
+        """
+        parts = (authorization or '').split(' ', 1)
+        if len(parts) != 2 or parts[0] != 'Bearer' or not parts[1].startswith('access-'):
+            return None
+        user_xid, _, generation = parts[1][len('access-'):].rpartition('-')
+        if user_xid not in self.users or generation != str(self._generation):
+            return None
+        return user_xid
+
+    def event(self, user_xid, kind, index):
+        """
+        Generate one event. Event index 0 is the newest, and each older event happened a day earlier.
+
+        :param user_xid: user xid
+        :param kind: one of KINDS
+        :param index: event index
+        :return: event dict
+        """
+        xid = _xid(self.seed, user_xid, kind, index)
+        rng = random.Random(xid)
+        started = EPOCH - index * DAY + rng.randint(0, 12) * 3600
+        event = {
+            'xid': xid,
+            'title': '{} {}'.format(kind, index),
+            'type': kind.rstrip('s'),
+            'date': _date(started),
+            'time_created': started,
+            'time_updated': started + 3600,
+            'time_completed': started + rng.randint(1, 8) * 3600,
+            'tz': 'GMT-0800'}
+        if kind == 'moves':
+            steps = rng.randint(1000, 20000)
+            event['details'] = {'steps': steps, 'distance': steps * 0.75, 'calories': steps * 0.05}
+        elif kind == 'sleeps':
+            event['details'] = {'duration': event['time_completed'] - started, 'awakenings': rng.randint(0, 5)}
+        elif kind == 'workouts':
+            event['details'] = {'steps': rng.randint(500, 5000), 'intensity': rng.randint(1, 5)}
+        elif kind == 'heartrates':
+            event['resting_heartrate'] = rng.randint(50, 80)
+        elif kind == 'meals':
+            event['details'] = {'calories': rng.randint(200, 1200), 'protein': rng.randint(5, 60)}
+        elif kind == 'body_events':
+            event['weight'] = round(rng.uniform(50, 100), 1)
+        elif kind == 'mood':
+            event['sub_type'] = rng.randint(1, 8)
+        elif kind == 'timezone':
+            event['time'] = started
+        return event
+
+    def events(self, user_xid, kind):
+        """
+        Get a user's events of a kind, newest first, including created and excluding deleted ones.
+
+        :param user_xid: user xid
+        :param kind: one of KINDS
+        :return: list of event dicts
+        """
+        with self._lock:
+            created = list(self._created.get((user_xid, kind), []))
+            deleted = set(self._deleted)
+        events = created[::-1] + [self.event(user_xid, kind, index) for index in range(self.items)]
+        return [event for event in events if event['xid'] not in deleted]
+
+    def find(self, kind, xid):
+        """
+        Find an event of any user by xid.
+
+        :param kind: one of KINDS
+        :param xid: event xid
+        :return: tuple of user xid and event dict, or (None, None)
+        """
+        with self._lock:
+            owner = self._owners.get(xid)
+            if xid in self._deleted or owner is None or owner[1] != kind:
+                return None, None
+            if owner[2] is None:
+                return owner[0], next(event for event in self._created[owner[:2]] if event['xid'] == xid)
+        return owner[0], self.event(*owner)
+
+    def ticks(self, kind, event):
+        """
+        Generate an event's ticks, e.g. steps per 10 minutes or sleep depths.
+
+        :param kind: one of TICK_KINDS
+        :param event: event dict
+        :return: list of tick dicts
+        """
+        rng = random.Random('{}:ticks'.format(event['xid']))
+        start, end = event['time_created'], event['time_completed']
+        ticks = []
+        for tick_time in range(start, end, 600):
+            if kind == 'sleeps':
+                ticks.append({'time': tick_time, 'depth': rng.randint(1, 3)})
+            else:
+                steps = rng.randint(0, 1200)
+                ticks.append({'time': tick_time, 'steps': steps, 'distance': steps * 0.75, 'calories': steps * 0.05})
+        return ticks
+
+    def profile(self, user_xid, name):
+        """
+        Get a user's goals or settings.
+
+        :param user_xid: user xid
+        :param name: one of PROFILES
+        :return: resource dict
+        """
+        with self._lock:
+            stored = self._profiles.get((user_xid, name))
+        if stored is not None:
+            return dict(stored)
+        rng = random.Random('{}:{}:{}'.format(self.seed, user_xid, name))
+        if name == 'goals':
+            return {
+                'move_steps': rng.randint(5, 15) * 1000,
+                'sleep_total': rng.randint(6, 9) * 3600,
+                'body_weight': round(rng.uniform(50, 100), 1),
+                'body_weight_intent': rng.randint(0, 2),
+                'remaining_for_day': {'move_steps_remaining': rng.randint(0, 5000), 'sleep_seconds_remaining': 0}}
+        return {
+            'data_sharing': True,
+            'first_day_of_week': rng.randint(0, 1),
+            'share_move': True,
+            'share_sleep': rng.random() < 0.5,
+            'share_eat': rng.random() < 0.5,
+            'share_mood': False,
+            'share_body_events': False,
+            'share_workouts': True}
+
+    def update_profile(self, user_xid, name, fields):
+        """
+        Change a user's goals or settings, e.g. to test change detection.
+
+        :param user_xid: user xid
+        :param name: one of PROFILES
+        :param fields: dict of new values
+        """
+        profile = self.profile(user_xid, name)
+        profile.update(fields)
+        with self._lock:
+            self._profiles[(user_xid, name)] = profile
+
+    def create(self, user_xid, kind, fields):
+        """
+        Store an event created through the API.
+
+        :param user_xid: user xid
+        :param kind: one of KINDS
+        :param fields: dict of form fields
+        :return: the new event dict
+        """
+        with self._lock:
+            created = self._created.setdefault((user_xid, kind), [])
+            now = int(time.time())
+            event = dict(fields, xid=_xid(self.seed, user_xid, kind, 'created', len(created)))
+            event.update({'date': _date(now), 'time_created': now, 'time_updated': now})
+            created.append(event)
+            self._owners[event['xid']] = (user_xid, kind, None)
+        return event
+
+    def delete(self, xid):
+        """
+        Delete an event.
+
+        :param xid: event xid
+        """
+        with self._lock:
+            self._deleted.add(xid)
+
+    def notify(self, user_xid, kind, action='creation', event_xid=None):
+        """
+        Send a pubsub notification to the user's webhook, like the UP API does when the user's data changes.
+
+        :param user_xid: user xid
+        :param kind: event type, e.g. move
+        :param action: creation, updation, deletion or enter_sleep_mode
+        :param event_xid: optional xid of the changed event
+        :return: HTTP status of the webhook's response
+        """
+        webhook = self.webhooks[user_xid]
+        now = int(time.time())
+        payload = json.dumps({
+            'notification_timestamp': now,
+            'events': [{
+                'user_xid': user_xid,
+                'event_xid': event_xid,
+                'type': kind,
+                'action': action,
+                'timestamp': now,
+                'secret_hash': hashlib.sha256((self.client_id + self.client_secret).encode('utf-8')).hexdigest()}]})
+        parts = urlparse.urlparse(webhook)
+        if parts.scheme == 'https':
+            conn = httplib.HTTPSConnection(parts.netloc, timeout=10)
+        else:
+            conn = httplib.HTTPConnection(parts.netloc, timeout=10)
+        try:
+            conn.request('POST', parts.path or '/', payload, {'Content-Type': 'application/json'})
+            return conn.getresponse().status
+        finally:
+            conn.close()
+
+
+class _Server(SocketServer.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    """
+    HTTP server handling each connection in its own thread. Clients keep connections alive, so the server tracks them
+    to close them when it stops.
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def process_request(self, request, client_address):
+        """
+        Track the connection and handle it in a new thread.
+
+        :param request: client socket
+        :param client_address: client address
+        """
+        self.connections.add(request)
+        SocketServer.ThreadingMixIn.process_request(self, request, client_address)
+
+    def shutdown_request(self, request):
+        """
+        Forget and close a finished connection.
+
+        :param request: client socket
+        """
+        self.connections.discard(request)
+        BaseHTTPServer.HTTPServer.shutdown_request(self, request)
+
+    def close_connections(self):
+        """
+        Close the connections that are still open.
+        """
+        for request in list(self.connections):
+            try:
+                request.shutdown(socket.SHUT_RDWR)
+            except socket.error:
+                pass
+
+
+class _Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """
+    Route requests to the fake API.
+    """
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        """
+        Keep quiet; load tests send a lot of requests.
+        """
+        pass
+
+    def do_GET(self):
+        """
+        Handle GET requests.
+        """
+        self._handle('GET')
+
+    def do_POST(self):
+        """
+        Handle POST requests.
+        """
+        self._handle('POST')
+
+    def do_DELETE(self):
+        """
+        Handle DELETE requests.
+        """
+        self._handle('DELETE')
+
+    def _send(self, status, body, content_type='application/json', headers=None, truncate=False):
+        """
+        Send a response.
+
+        :param status: HTTP status
+        :param body: body bytes
+        :param content_type: Content-Type header
+        :param headers: optional dict of extra headers
+        :param truncate: send only half the body and close the connection
+        """
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, str(value))
+        if truncate:
+            self.send_header('Connection', 'close')
+            self.close_connection = True
+        self.end_headers()
+        self.wfile.write(body[:len(body) // 2] if truncate else body)
+
+    def _send_json(self, status, user_xid, data, message=None, headers=None, truncate=False):
+        """
+        Send a JSON response with meta data.
+
+        :param status: HTTP status
+        :param user_xid: user xid for the meta data
+        :param data: response data
+        :param message: meta message, defaults to the status reason
+        :param headers: optional dict of extra headers
+        :param truncate: send only half the body and close the connection
+        """
+        body = json.dumps({
+            'meta': {
+                'user_xid': user_xid,
+                'message': message or httplib.responses[status],
+                'code': status,
+                'time': int(time.time())},
+            'data': data})
+        self._send(status, body.encode('utf-8'), headers=headers, truncate=truncate)
+
+    def _handle(self, method):
+        """
+        Apply faults and route the request.
+
+        :param method: HTTP method
+        """
+        fake = self.server.fake
+        parts = urlparse.urlparse(self.path)
+        query = dict((key, values[-1]) for key, values in urlparse.parse_qs(parts.query).items())
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length).decode('utf-8') if length else ''
+        fields = dict((key, values[-1]) for key, values in urlparse.parse_qs(body).items())
+
+        if fake.faults.latency:
+            time.sleep(fake.faults.latency)
+        fault = fake.faults.draw()
+        if fault == RATE_LIMITED:
+            return self._send_json(
+                TOO_MANY_REQUESTS,
+                None,
+                {},
+                message='Too Many Requests',
+                headers={'Retry-After': fake.faults.retry_after})
+        if fault == SERVER_ERROR:
+            return self._send_json(httplib.SERVICE_UNAVAILABLE, None, {})
+
+        if parts.path == _TOKEN and method == 'POST':
+            return self._token(fields, fault == TRUNCATED)
+
+        user_xid = fake.user_for(self.headers.get('Authorization'))
+        if user_xid is None:
+            return self._send_json(httplib.UNAUTHORIZED, None, {})
+        status, data = self._route(method, parts.path, query, fields, user_xid)
+        if isinstance(data, bytes):
+            return self._send(status, data, content_type='image/png', truncate=fault == TRUNCATED)
+
+        #
+        # Goals and settings have ETags and answer matching conditional requests with 304 Not Modified.
+        #
+        headers = None
+        if status == httplib.OK and parts.path[len(_USER) + 1:] in PROFILES:
+            etag = '"{}"'.format(_xid(json.dumps(data, sort_keys=True)))
+            if self.headers.get('If-None-Match') == etag:
+                return self._send(httplib.NOT_MODIFIED, b'', headers={'ETag': etag})
+            headers = {'ETag': etag}
+        self._send_json(status, user_xid, data, headers=headers, truncate=fault == TRUNCATED)
+
+    def _token(self, fields, truncate):
+        """
+        Exchange an authorization code or refresh token for an access token.
+
+        :param fields: dict of form fields
+        :param truncate: send only half the body
+        """
+        fake = self.server.fake
+        if fields.get('client_id') != fake.client_id or fields.get('client_secret') != fake.client_secret:
+            return self._send(httplib.UNAUTHORIZED, b'{"error": "invalid_client"}')
+        if fields.get('grant_type') == 'refresh_token':
+            grant = fields.get('refresh_token', '')
+        else:
+            grant = fields.get('code', '')
+        user_xid = grant.split('-', 1)[-1]
+        if user_xid not in fake.users:
+            return self._send(httplib.BAD_REQUEST, b'{"error": "invalid_grant"}')
+        self._send(httplib.OK, json.dumps(fake.token(user_xid)).encode('utf-8'), truncate=truncate)
+
+    def _route(self, method, path, query, fields, user_xid):
+        """
+        Answer an authorized API request.
+
+        :param method: HTTP method
+        :param path: URL path
+        :param query: dict of query parameters
+        :param fields: dict of form fields
+        :param user_xid: the requesting user
+        :return: tuple of status and response data (bytes for images)
+        """
+        fake = self.server.fake
+        if path == _USER:
+            rng = random.Random(user_xid)
+            index = fake.users.index(user_xid)
+            return httplib.OK, {
+                'xid': user_xid,
+                'first': 'First{}'.format(index),
+                'last': 'Last{}'.format(index),
+                'image': '',
+                'weight': round(rng.uniform(50, 100), 1),
+                'height': round(rng.uniform(1.5, 2.0), 2)}
+        if path == _USER + '/friends':
+            friends = [{'xid': xid} for xid in fake.users if xid != user_xid]
+            return httplib.OK, {'items': friends, 'size': len(friends)}
+        if path == _USER + '/pubsub':
+            if method == 'POST':
+                fake.webhooks[user_xid] = fields.get('webhook')
+            elif method == 'DELETE':
+                fake.webhooks.pop(user_xid, None)
+            return httplib.OK, {}
+        if path == _USER + '/PartnerAppMembership' and method == 'DELETE':
+            fake.webhooks.pop(user_xid, None)
+            return httplib.OK, {}
+        if path.startswith(_USER + '/') and path[len(_USER) + 1:] in PROFILES:
+            return httplib.OK, fake.profile(user_xid, path[len(_USER) + 1:])
+        if path.startswith(_USER + '/'):
+            kind = path[len(_USER) + 1:]
+            if kind not in KINDS:
+                return httplib.NOT_FOUND, {}
+            if method == 'POST':
+                return httplib.CREATED, fake.create(user_xid, kind, fields)
+            return httplib.OK, self._page(path, query, fake.events(user_xid, kind))
+
+        segments = path[len(_API) + 1:].split('/') if path.startswith(_API + '/') else []
+        if len(segments) < 2 or segments[0] not in KINDS:
+            return httplib.NOT_FOUND, {}
+        owner, event = fake.find(segments[0], segments[1])
+        if owner != user_xid:
+            return httplib.NOT_FOUND, {}
+        if len(segments) == 2:
+            if method == 'DELETE':
+                fake.delete(event['xid'])
+                return httplib.OK, {}
+            return httplib.OK, event
+        if segments[2:] == ['ticks'] and segments[0] in TICK_KINDS:
+            ticks = fake.ticks(segments[0], event)
+            return httplib.OK, {'items': ticks, 'size': len(ticks)}
+        if segments[2:] == ['image']:
+            return httplib.OK, _PNG + event['xid'].encode('ascii')
+        if segments[2:] == ['partialUpdate'] and method == 'POST':
+            return httplib.OK, dict(event, **fields)
+        return httplib.NOT_FOUND, {}
+
+    def _page(self, path, query, events):
+        """
+        Filter and page a list of events, with a next link if there are more.
+
+        :param path: URL path
+        :param query: dict of query parameters
+        :param events: list of event dicts, newest first
+        :return: page data
+        """
+        fake = self.server.fake
+        if 'date' in query:
+            events = [event for event in events if event['date'] == int(query['date'])]
+        if 'start_time' in query:
+            events = [event for event in events if event['time_created'] >= int(query['start_time'])]
+        if 'end_time' in query:
+            events = [event for event in events if event['time_created'] <= int(query['end_time'])]
+        if 'updated_after' in query:
+            events = [event for event in events if event['time_updated'] > int(query['updated_after'])]
+        offset = int(query.get('page_token', 0))
+        limit = int(query.get('limit', fake.page_size))
+        page = events[offset:offset + limit]
+        data = {'items': page, 'size': len(page), 'links': {}}
+        if offset + limit < len(events):
+            next_query = dict(query, page_token=offset + limit)
+            data['links']['next'] = '{}?{}'.format(path, _urlencode(sorted(next_query.items())))
+        return data
+
+
+def main(argv=None):
+    """
+    Run a fake server until interrupted.
+
+    :param argv: optional command line arguments
+    """
+    parser = argparse.ArgumentParser(description='Serve a fake UP API.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--users', type=int, default=3)
+    parser.add_argument('--items', type=int, default=ITEMS)
+    parser.add_argument('--page-size', type=int, default=PAGE_SIZE)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--client-id', default='client_id')
+    parser.add_argument('--client-secret', default='client_secret')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds to wait before every response')
+    parser.add_argument('--rate-limited', type=float, default=0.0, help='probability of a 429 response')
+    parser.add_argument('--server-error', type=float, default=0.0, help='probability of a 503 response')
+    parser.add_argument('--truncated', type=float, default=0.0, help='probability of a truncated body')
+    args = parser.parse_args(argv)
+
+    faults = Faults(args.latency, args.rate_limited, args.server_error, args.truncated, seed=args.seed)
+    fake = FakeUpApi(
+        args.host,
+        args.port,
+        args.users,
+        args.items,
+        args.page_size,
+        args.seed,
+        args.client_id,
+        args.client_secret,
+        faults)
+    with fake:
+        print('Serving a fake UP API: domain={}'.format(fake.url))
+        for user_xid in fake.users:
+            print('{} {}'.format(user_xid, fake.token(user_xid)['access_token']))
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
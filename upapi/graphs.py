@@ -0,0 +1,133 @@
+"""
+On-disk cache for the graph images of moves, sleeps and workouts (e.g., upapi.endpoints.MOVESGRAPH). Images are stored
+once per distinct content and looked up by xid, so a report can render many graphs without downloading any twice or
+holding them in memory.
+"""
+import errno
+import hashlib
+import os
+import shutil
+import tempfile
+import upapi.base
+import upapi.stream
+
+
+class _HashingWriter(object):
+    """
+    File-like wrapper that hashes everything written through it.
+    """
+    def __init__(self, fileobj, digest):
+        """
+        Wrap the file object.
+
+        :param fileobj: file opened for binary writing
+        :param digest: hashlib object to update
+        """
+        self.fileobj = fileobj
+        self.digest = digest
+        super(_HashingWriter, self).__init__()
+
+    def write(self, chunk):
+        """
+        Hash and write a chunk.
+
+        :param chunk: bytes
+        """
+        self.digest.update(chunk)
+        self.fileobj.write(chunk)
+
+
+class GraphCache(object):
+    """
+    The GraphCache stores graph images under directory/blobs by content hash, with a small reference file per xid under
+    directory/xids naming the image. Writes go through temporary files, so one cache can be shared by many processes.
+    """
+    def __init__(self, directory):
+        """
+        Create the cache directories if necessary.
+
+        :param directory: root directory of the cache
+        """
+        self.directory = directory
+        self.blobs = os.path.join(directory, 'blobs')
+        self.xids = os.path.join(directory, 'xids')
+        for path in [self.blobs, self.xids]:
+            try:
+                os.makedirs(path)
+            except OSError as exc:
+                if exc.errno != errno.EEXIST:
+                    raise
+        super(GraphCache, self).__init__()
+
+    def _ref_path(self, url, xid):
+        """
+        Get the reference file for a graph.
+
+        :param url: graph endpoint, e.g. upapi.endpoints.MOVESGRAPH
+        :param xid: the event's xid
+        :return: path of the reference file
+        """
+        return os.path.join(self.xids, '{}-{}'.format(upapi.base.resource_kind(url), xid))
+
+    def path(self, url, xid):
+        """
+        Look up a cached graph.
+
+        :param url: graph endpoint, e.g. upapi.endpoints.MOVESGRAPH
+        :param xid: the event's xid
+        :return: path of the cached image or None if it is not cached
+        """
+        try:
+            with open(self._ref_path(url, xid)) as ref:
+                digest = ref.read().strip()
+        except IOError:
+            return None
+        path = os.path.join(self.blobs, '{}.png'.format(digest))
+        return path if os.path.exists(path) else None
+
+    def _move_into_place(self, write, path=None):
+        """
+        Write a temporary file in the cache, then rename it to its final path so readers never see partial files.
+
+        :param write: function taking the open temporary file and returning the final path (if path is None)
+        :param path: final path, if known before writing
+        :return: the final path
+        """
+        temp = tempfile.NamedTemporaryFile(dir=self.directory, delete=False)
+        try:
+            with temp:
+                final_path = write(temp)
+            path = final_path if path is None else path
+            os.rename(temp.name, path)
+        except Exception:
+            os.remove(temp.name)
+            raise
+        return path
+
+    def download(self, up, url, xid, fileobj=None, chunk_size=upapi.stream.CHUNK_SIZE):
+        """
+        Get a graph, downloading it only if it is not cached yet.
+
+        :param up: UpApi object with the user's credentials
+        :param url: graph endpoint, e.g. upapi.endpoints.MOVESGRAPH
+        :param xid: the event's xid
+        :param fileobj: optional file or buffer opened for binary writing to copy the image into
+        :param chunk_size: number of bytes to read and copy at a time
+        :return: path of the cached image
+        """
+        path = self.path(url, xid)
+        if path is None:
+            digest = hashlib.sha256()
+
+            def write_blob(temp):
+                up.download(url.format(xid=xid), _HashingWriter(temp, digest), chunk_size=chunk_size)
+                return os.path.join(self.blobs, '{}.png'.format(digest.hexdigest()))
+            path = self._move_into_place(write_blob)
+            self._move_into_place(
+                lambda ref: ref.write(digest.hexdigest().encode('ascii')),
+                self._ref_path(url, xid))
+
+        if fileobj is not None:
+            with open(path, 'rb') as image:
+                shutil.copyfileobj(image, fileobj, chunk_size)
+        return path
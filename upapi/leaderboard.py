@@ -0,0 +1,107 @@
+"""
+Leaderboards rank a user's friends by their move summaries (e.g., steps) over a date window.
+https://jawbone.com/up/developer/endpoints/moves
+"""
+import array
+import datetime
+import threading
+import time
+import upapi.batch
+import upapi.endpoints
+import upapi.mirror
+import upapi.timezones
+
+
+class Leaderboard(object):
+    """
+    The Leaderboard fetches daily move summaries for many users concurrently and caches each completed day's total, so
+    ranking the same people again only fetches days it has not seen.
+    """
+    def __init__(self, clients, metric='steps'):
+        """
+        Create a leaderboard over a set of authorized users.
+
+        :param clients: dict of user xid to UpApi object with that user's credentials
+        :param metric: move details field to rank by, e.g. steps, distance or calories
+        """
+        self.clients = clients
+        self.metric = metric
+        self._lock = threading.Lock()
+        self._totals = {}
+        super(Leaderboard, self).__init__()
+
+    def _missing(self, xid, dates):
+        """
+        Find the dates without a cached total for a user.
+
+        :param xid: user xid
+        :param dates: list of dates in YYYYMMDD format
+        :return: list of dates in YYYYMMDD format
+        """
+        with self._lock:
+            totals = self._totals.get(xid, {})
+            return [date for date in dates if date not in totals]
+
+    def _fetch(self, xid, start_date, end_date):
+        """
+        Fetch a user's moves and cache the daily totals. The user's today, in the zone the user is in, keeps changing, so
+        it is never cached.
+
+        :param xid: user xid
+        :param start_date: first date in YYYYMMDD format
+        :param end_date: last date in YYYYMMDD format
+        :return: dict of date to total, including today
+        """
+        daily = dict.fromkeys(upapi.mirror.date_range(start_date, end_date), 0)
+        for move in self.clients[xid].get_range(upapi.endpoints.USERMOVES, start_date, end_date):
+            if move['date'] in daily:
+                daily[move['date']] += move['details'].get(self.metric) or 0
+
+        zone = upapi.timezones.TIMEZONES.history(self.clients[xid]).zone_at(time.time())
+        today = upapi.mirror.from_date(datetime.datetime.fromtimestamp(time.time(), zone).date())
+        with self._lock:
+            totals = self._totals.setdefault(xid, {})
+            for date, total in daily.items():
+                if date < today:
+                    totals[date] = total
+        return daily
+
+    def daily_totals(self, xid, start_date, end_date):
+        """
+        Get a user's daily totals, fetching only the runs of days that are not cached.
+
+        :param xid: user xid
+        :param start_date: first date in YYYYMMDD format
+        :param end_date: last date in YYYYMMDD format
+        :return: array of totals, one per date
+        """
+        dates = upapi.mirror.date_range(start_date, end_date)
+        missing = self._missing(xid, dates)
+        fetched = {}
+        for first, last in upapi.mirror.date_runs(missing):
+            fetched.update(self._fetch(xid, first, last))
+        with self._lock:
+            totals = self._totals.get(xid, {})
+            return array.array('d', [totals[date] if date in totals else fetched[date] for date in dates])
+
+    def rank(self, friends, start_date, end_date, max_workers=upapi.batch.MAX_WORKERS):
+        """
+        Rank friends by their total over a date window. Friends without an authorized client are left out, and a friend
+        whose moves could not be fetched does not stop the others from being ranked.
+
+        :param friends: upapi.user.friends.Friends object
+        :param start_date: first date in YYYYMMDD format
+        :param end_date: last date in YYYYMMDD format
+        :param max_workers: maximum number of concurrent users to fetch
+        :return: list of upapi.batch.Result objects with friend xids as items and totals as values, highest total first,
+            then the failed friends with their errors
+        """
+        xids = [friend.xid for friend in friends.items if friend.xid in self.clients]
+        results = upapi.batch.run(
+            lambda xid: sum(self.daily_totals(xid, start_date, end_date)),
+            xids,
+            max_workers=max_workers)
+        return sorted(
+            results,
+            key=lambda result: (result.error is None, result.value),
+            reverse=True)
@@ -1,7 +1,7 @@
 """
 All API responses contain meta data particular to the API request.
 """
-import datetime
+import upapi.timezones
 
 
 class Meta(object):
@@ -15,9 +15,9 @@ class Meta(object):
         :param user_xid: User's XID
         :param message: response message
         :param code: HTTP response code
-        :param time: unixtime
+        :param time: unixtime, converted to an aware datetime in UTC
         """
         self.user_xid = user_xid
         self.message = message
         self.code = code
-        self.time = datetime.datetime.fromtimestamp(time)
+        self.time = upapi.timezones.from_timestamp(time)
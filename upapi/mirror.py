@@ -0,0 +1,244 @@
+"""
+A local SQLite mirror of UP API resources. Resources fetched through an UpApi object with a mirror get stored here, so
+historic data (e.g., last month's moves or sleeps) can be queried again without hitting the API.
+"""
+import datetime
+import json
+import sqlite3
+import threading
+
+
+"""
+Items are keyed by user and xid, since users that share a mirror can see the same item (e.g. a friend's public event),
+and indexed by user, kind (e.g. moves, sleeps) and date. The items table holds the rows of list endpoints, and the
+details table the single resources fetched by xid, which carry more than the list rows (e.g., a meal's food items). The
+days table records which days of a list endpoint have been completely fetched, so range queries know when they can be
+answered offline.
+"""
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    xid TEXT NOT NULL,
+    user_xid TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    date INTEGER,
+    time_created INTEGER,
+    data TEXT NOT NULL,
+    PRIMARY KEY (user_xid, xid)
+);
+CREATE INDEX IF NOT EXISTS items_user_kind_date ON items (user_xid, kind, date, time_created);
+CREATE TABLE IF NOT EXISTS details (
+    xid TEXT NOT NULL,
+    user_xid TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (user_xid, xid)
+);
+CREATE TABLE IF NOT EXISTS days (
+    user_xid TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    date INTEGER NOT NULL,
+    PRIMARY KEY (user_xid, kind, date)
+);
+"""
+
+
+def to_date(date):
+    """
+    Convert an UP API date (e.g., 20170203) to a datetime.date.
+
+    :param date: integer date in YYYYMMDD format
+    :return: datetime.date
+    """
+    return datetime.date(date // 10000, date // 100 % 100, date % 100)
+
+
+def from_date(date):
+    """
+    Convert a datetime.date to an UP API date (e.g., 20170203).
+
+    :param date: datetime.date
+    :return: integer date in YYYYMMDD format
+    """
+    return date.year * 10000 + date.month * 100 + date.day
+
+
+def date_range(start_date, end_date):
+    """
+    List the UP API dates from start_date to end_date, inclusive.
+
+    :param start_date: first date in YYYYMMDD format
+    :param end_date: last date in YYYYMMDD format
+    :return: list of dates in YYYYMMDD format
+    """
+    day = to_date(start_date)
+    last = to_date(end_date)
+    dates = []
+    while day <= last:
+        dates.append(from_date(day))
+        day += datetime.timedelta(days=1)
+    return dates
+
+
+def date_runs(dates):
+    """
+    Group dates into runs of consecutive days.
+
+    :param dates: sorted list of dates in YYYYMMDD format
+    :return: list of (first date, last date) tuples
+    """
+    runs = []
+    for date in dates:
+        if runs and to_date(runs[-1][1]) + datetime.timedelta(days=1) == to_date(date):
+            runs[-1] = (runs[-1][0], date)
+        else:
+            runs.append((date, date))
+    return runs
+
+
+class Mirror(object):
+    """
+    The Mirror stores UP API resources in SQLite. One Mirror can be shared by many UpApi objects and threads.
+    """
+    def __init__(self, path=':memory:'):
+        """
+        Open (or create) the mirror database.
+
+        :param path: SQLite database file, defaults to an in-memory database
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.executescript(SCHEMA)
+        super(Mirror, self).__init__()
+
+    def put_items(self, user_xid, kind, items):
+        """
+        Store (or replace) the items of a list endpoint.
+
+        :param user_xid: xid of the user that owns the items
+        :param kind: resource kind, e.g. moves
+        :param items: list of item dicts as returned by the API
+        """
+        rows = [
+            (item['xid'], user_xid, kind, item.get('date'), item.get('time_created'), json.dumps(item))
+            for item in items]
+        with self._lock, self._conn:
+            self._conn.executemany('INSERT OR REPLACE INTO items VALUES (?, ?, ?, ?, ?, ?)', rows)
+
+    def put_item(self, user_xid, kind, item):
+        """
+        Store (or replace) a single resource as fetched by xid. List rows of the same xid are left alone.
+
+        :param user_xid: xid of the user that owns the item
+        :param kind: resource kind, e.g. meals
+        :param item: item dict as returned by the API
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO details VALUES (?, ?, ?, ?)',
+                (item['xid'], user_xid, kind, json.dumps(item)))
+
+    def get_item(self, user_xid, xid):
+        """
+        Look up a single resource of a user, as stored by put_item. List rows are not used, since they can leave out
+        fields of the resource.
+
+        :param user_xid: xid of the user that owns the item
+        :param xid: the item's xid
+        :return: the item dict or None if it has not been mirrored for the user
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT data FROM details WHERE user_xid = ? AND xid = ?',
+                (user_xid, xid)).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0])
+
+    def update_item(self, user_xid, kind, item):
+        """
+        Replace a resource after it was written: its single resource copy, and its list row if it has one.
+
+        :param user_xid: xid of the user that owns the item
+        :param kind: resource kind, e.g. meals
+        :param item: the written item dict as returned by the API
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO details VALUES (?, ?, ?, ?)',
+                (item['xid'], user_xid, kind, json.dumps(item)))
+            self._conn.execute(
+                'UPDATE items SET date = ?, time_created = ?, data = ? WHERE user_xid = ? AND xid = ?',
+                (item.get('date'), item.get('time_created'), json.dumps(item), user_xid, item['xid']))
+
+    def delete_item(self, user_xid, xid):
+        """
+        Remove a deleted resource: its single resource copy and its list row.
+
+        :param user_xid: xid of the user that owned the item
+        :param xid: the item's xid
+        """
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM details WHERE user_xid = ? AND xid = ?', (user_xid, xid))
+            self._conn.execute('DELETE FROM items WHERE user_xid = ? AND xid = ?', (user_xid, xid))
+
+    def query(self, user_xid, kind, start_date=None, end_date=None):
+        """
+        Get a user's items of one kind, ordered by date and creation time.
+
+        :param user_xid: xid of the user that owns the items
+        :param kind: resource kind, e.g. moves
+        :param start_date: optional first date in YYYYMMDD format
+        :param end_date: optional last date in YYYYMMDD format
+        :return: list of item dicts
+        """
+        sql = 'SELECT data FROM items WHERE user_xid = ? AND kind = ?'
+        params = [user_xid, kind]
+        if start_date is not None:
+            sql += ' AND date >= ?'
+            params.append(start_date)
+        if end_date is not None:
+            sql += ' AND date <= ?'
+            params.append(end_date)
+        sql += ' ORDER BY date, time_created'
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def mark_dates(self, user_xid, kind, dates):
+        """
+        Record that every item for these dates has been mirrored.
+
+        :param user_xid: xid of the user that owns the items
+        :param kind: resource kind, e.g. moves
+        :param dates: list of dates in YYYYMMDD format
+        """
+        with self._lock, self._conn:
+            self._conn.executemany(
+                'INSERT OR IGNORE INTO days VALUES (?, ?, ?)',
+                [(user_xid, kind, date) for date in dates])
+
+    def missing_dates(self, user_xid, kind, start_date, end_date):
+        """
+        Find the dates in a range that have not been completely mirrored.
+
+        :param user_xid: xid of the user that owns the items
+        :param kind: resource kind, e.g. moves
+        :param start_date: first date in YYYYMMDD format
+        :param end_date: last date in YYYYMMDD format
+        :return: list of dates in YYYYMMDD format
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT date FROM days WHERE user_xid = ? AND kind = ? AND date BETWEEN ? AND ?',
+                (user_xid, kind, start_date, end_date)).fetchall()
+        mirrored = set(row[0] for row in rows)
+        return [date for date in date_range(start_date, end_date) if date not in mirrored]
+
+    def close(self):
+        """
+        Close the database connection.
+        """
+        with self._lock:
+            self._conn.close()
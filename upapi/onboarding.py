@@ -0,0 +1,184 @@
+"""
+Exchange OAuth callbacks for credentials in bulk, e.g. when thousands of users sign up at once. Exchanges run on a
+bounded pool of threads that keep their connections to the token endpoint open, and new credentials are saved in
+batches instead of one storage write per user. A failed save never fails an exchange: the batch stays queued for the
+next save and the error is kept in save_errors.
+"""
+import functools
+import httplib2
+import multiprocessing.pool
+import threading
+import upapi.base
+import upapi.batch
+
+
+"""
+Default number of credentials saved together.
+"""
+SAVE_BATCH = 100
+
+"""
+Default number of seconds new credentials wait for a full batch before they are saved anyway.
+"""
+SAVE_MAX_AGE = 5
+
+
+class TokenExchanger(object):
+    """
+    The TokenExchanger turns OAuth callback URLs into credentials for one app. It is safe to share between threads,
+    e.g. the request handlers receiving the callbacks.
+    """
+    def __init__(
+            self,
+            config,
+            max_workers=upapi.batch.MAX_WORKERS,
+            timeout=upapi.base.TIMEOUT,
+            save=None,
+            save_batch=SAVE_BATCH,
+            save_max_age=SAVE_MAX_AGE):
+        """
+        Start the worker threads.
+
+        :param config: upapi.config.AppConfig object of the app
+        :param max_workers: maximum number of concurrent exchanges
+        :param timeout: seconds to wait for the token endpoint
+        :param save: optional function taking a list of new oauth2client.client.OAuth2Credentials objects, to persist
+            them in one go (e.g., in one database transaction)
+        :param save_batch: number of credentials to collect before calling save
+        :param save_max_age: seconds after which collected credentials are saved even if the batch is not full, or None
+            to only save full batches and on flush
+        """
+        self.config = config
+        self.timeout = timeout
+        self.save = save
+        self.save_batch = save_batch
+        self.save_max_age = save_max_age
+        self.save_errors = []
+        self._local = threading.local()
+        self._pending = []
+        self._timer = None
+        self._lock = threading.Lock()
+        self._pool = multiprocessing.pool.ThreadPool(max_workers)
+        super(TokenExchanger, self).__init__()
+
+    def _http(self):
+        """
+        Get the calling thread's Http object, which keeps its connection to the token endpoint open between exchanges.
+
+        :return: httplib2.Http object
+        """
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            http = self._local.http = httplib2.Http(timeout=self.timeout)
+        return http
+
+    def exchange(self, callback_url):
+        """
+        Exchange one callback for credentials in the calling thread, and queue them to be saved. Errors raised by save
+        go to save_errors, not to the caller, since the exchange itself succeeded.
+
+        :param callback_url: The full URL on your server that Jawbone sent the user back to
+        :return: oauth2client.client.OAuth2Credentials object
+        """
+        credentials = self.config.flow.step2_exchange(upapi.base.callback_code(callback_url), http=self._http())
+        if self.save is not None:
+            batch = None
+            with self._lock:
+                self._pending.append(credentials)
+                if len(self._pending) >= self.save_batch:
+                    batch, self._pending = self._pending, []
+                else:
+                    self._arm()
+            if batch:
+                self._save_quietly(batch)
+        return credentials
+
+    def submit(self, callback_url):
+        """
+        Queue a callback to be exchanged by the worker threads, so the caller does not wait on the token endpoint.
+
+        :param callback_url: The full URL on your server that Jawbone sent the user back to
+        :return: multiprocessing.pool.AsyncResult whose get method returns the credentials or raises the error
+        """
+        return self._pool.apply_async(self.exchange, (callback_url,))
+
+    def exchange_all(self, callback_urls):
+        """
+        Exchange many callbacks concurrently, then save every pending credentials object. Save errors go to save_errors.
+
+        :param callback_urls: iterable of callback URLs
+        :return: list of upapi.batch.Result objects (item, credentials or None, error or None) in the same order
+        """
+        results = self._pool.map(functools.partial(upapi.batch.capture, self.exchange), callback_urls, chunksize=1)
+        try:
+            self.flush()
+        except Exception as error:
+            with self._lock:
+                self.save_errors.append(error)
+        return results
+
+    def _save(self, batch):
+        """
+        Save a batch of credentials, putting it back in the queue to be retried after save_max_age if saving fails.
+
+        :param batch: list of credentials objects
+        """
+        try:
+            self.save(batch)
+        except Exception:
+            with self._lock:
+                self._pending[:0] = batch
+                self._arm()
+            raise
+
+    def _save_quietly(self, batch):
+        """
+        Save a batch of credentials, keeping the error in save_errors if saving fails.
+
+        :param batch: list of credentials objects
+        """
+        try:
+            self._save(batch)
+        except Exception as error:
+            with self._lock:
+                self.save_errors.append(error)
+
+    def _arm(self):
+        """
+        Start the timer that saves the pending credentials after save_max_age, unless it is already running. Call with
+        the lock held.
+        """
+        if self._timer is None and self.save_max_age is not None:
+            self._timer = threading.Timer(self.save_max_age, self._expire)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _expire(self):
+        """
+        Save the collected credentials once the oldest has waited save_max_age seconds.
+        """
+        with self._lock:
+            self._timer = None
+            batch, self._pending = self._pending, []
+        if batch:
+            self._save_quietly(batch)
+
+    def flush(self):
+        """
+        Save the credentials collected so far.
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            batch, self._pending = self._pending, []
+        if batch:
+            self._save(batch)
+
+    def close(self):
+        """
+        Wait for queued exchanges, save their credentials and stop the worker threads.
+        """
+        self._pool.close()
+        self._pool.join()
+        self.flush()
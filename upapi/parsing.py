@@ -0,0 +1,137 @@
+"""
+Decode response bodies in a pool of worker processes. JSON decoding holds the GIL, so threads waiting on many API calls
+end up decoding on one core. Give an UpApi object a ParsePool to spread large list bodies across cores instead, asking
+for their items as columns (e.g., UpApi.request(url, columns=['time', 'steps'])).
+
+Workers only send back compact columns (see decode_columns), since unpickling whole dicts in the caller would cost about
+as much as decoding them there.
+"""
+import array
+import json
+import multiprocessing
+import numbers
+
+
+"""
+Bodies smaller than this are decoded in the calling thread, where it is cheaper than sending them to a worker.
+"""
+MIN_SIZE = 64 * 1024
+
+"""
+Array typecodes of the columns decode_columns makes: whole numbers become INTEGER columns, and columns with fractions or
+missing values (NaN) become FLOAT columns.
+"""
+INTEGER = 'l'
+FLOAT = 'd'
+
+NAN = float('nan')
+
+
+def decode(content, columns=None):
+    """
+    Decode a response body.
+
+    :param content: JSON response body
+    :param columns: optional item field names to decode into columns (see decode_columns)
+    :return: decoded response
+    """
+    if columns is not None:
+        return decode_columns(content, columns)
+    return json.loads(content)
+
+
+def _column(values):
+    """
+    Pack the values of one item field into an array, with the typecode the values need.
+
+    :param values: list of the field's values, None where an item has none
+    :return: INTEGER array, FLOAT array with NaN for missing values, or the list itself if a value is not a number
+    """
+    typecode = INTEGER
+    for value in values:
+        if value is None or isinstance(value, float):
+            typecode = FLOAT
+        elif not isinstance(value, numbers.Integral):
+            return values
+    if typecode == INTEGER:
+        return array.array(INTEGER, values)
+    return array.array(FLOAT, [NAN if value is None else value for value in values])
+
+
+def decode_columns(content, columns):
+    """
+    Decode a list response body and convert its items into one array per field, which are much smaller than lists of
+    dicts to send back from a worker and to keep around (e.g., for ticks).
+
+    :param content: JSON response body
+    :param columns: iterable of item field names, e.g. ['time', 'steps']
+    :return: decoded response, with data['items'] replaced by a dict of field name to array (see _column)
+    """
+    resp_json = json.loads(content)
+    items = resp_json['data']['items']
+    resp_json['data']['items'] = dict((field, _column([item.get(field) for item in items])) for field in columns)
+    return resp_json
+
+
+def _context():
+    """
+    Get the multiprocessing context for the workers. Forked workers would inherit the caller's threads' locks and
+    connections, so they are started fresh, by a fork server where there is one.
+
+    :return: multiprocessing context, or the multiprocessing module on Python 2, which only forks
+    """
+    if not hasattr(multiprocessing, 'get_context'):
+        return multiprocessing
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context('spawn')
+
+
+class ParsePool(object):
+    """
+    The ParsePool decodes large response bodies in worker processes. It is safe to share between threads and UpApi
+    objects.
+    """
+    def __init__(self, processes=None, min_size=MIN_SIZE):
+        """
+        Start the worker processes.
+
+        :param processes: number of workers, defaults to the number of CPUs
+        :param min_size: bodies smaller than this many bytes are decoded without a worker
+        """
+        self.min_size = min_size
+        self._pool = _context().Pool(processes)
+        super(ParsePool, self).__init__()
+
+    def decode(self, content, columns=None):
+        """
+        Decode a response body. Without columns, it is decoded in the calling thread, since a worker would send back
+        the same dicts.
+
+        :param content: JSON response body
+        :param columns: optional item field names to decode into columns (see decode_columns)
+        :return: decoded response
+        """
+        if columns is None:
+            return decode(content)
+        return self.decode_columns(content, columns)
+
+    def decode_columns(self, content, columns):
+        """
+        Decode a list response body into columns (see decode_columns), in a worker if the body is large.
+
+        :param content: JSON response body
+        :param columns: iterable of item field names
+        :return: decoded response with columnar items
+        """
+        columns = list(columns)
+        if len(content) < self.min_size:
+            return decode_columns(content, columns)
+        return self._pool.apply(decode_columns, (content, columns))
+
+    def close(self):
+        """
+        Stop the worker processes.
+        """
+        self._pool.close()
+        self._pool.join()
@@ -0,0 +1,25 @@
+"""
+Every API call returns its own Response object, so concurrent calls on a shared UpApi object never see each other's
+results.
+"""
+
+
+class Response(object):
+    """
+    The Response object holds the result of one API call.
+    """
+    def __init__(self, status, headers, meta, data, elapsed):
+        """
+        Create a response from the parts of an API call.
+
+        :param status: HTTP status code
+        :param headers: dict of response headers (lowercase names)
+        :param meta: upapi.meta.Meta object from the response body
+        :param data: JSON data from the response body
+        :param elapsed: seconds from sending the request to decoding the response
+        """
+        self.status = status
+        self.headers = headers
+        self.meta = meta
+        self.data = data
+        self.elapsed = elapsed
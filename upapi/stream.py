@@ -0,0 +1,168 @@
+"""
+Incremental parsing of UP API responses. List responses look like {"meta": {...}, "data": {"items": [...], ...}}, and
+ItemStream yields the items one at a time as the body arrives, so large pages never sit in memory as raw bytes.
+"""
+import codecs
+import json
+import re
+
+
+"""
+Number of bytes to read from the socket at a time.
+"""
+CHUNK_SIZE = 64 * 1024
+
+_STRING = re.compile(r'"(?:[^"\\]|\\.)*"', re.DOTALL)
+_SCALAR = re.compile(r'[^\s,:\[\]{}]+')
+_WHITESPACE = ' \t\r\n'
+_DELIMITERS = _WHITESPACE + ',]'
+
+
+class ItemStream(object):
+    """
+    Iterate over the items array of a JSON response body, reading the body in chunks. Everything outside the items
+    array (meta, links, size, etc.) is kept, and available as response once the items are exhausted.
+    """
+    def __init__(self, chunks, path=('data', 'items')):
+        """
+        Set up the parser.
+
+        :param chunks: iterable of body byte strings
+        :param path: keys leading to the array to stream
+        """
+        self.chunks = iter(chunks)
+        self.path = tuple(path)
+        self.response = None
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._json = json.JSONDecoder()
+        self._buf = u''
+        self._pos = 0
+        self._eof = False
+        self._skeleton = []
+        super(ItemStream, self).__init__()
+
+    def _fill(self):
+        """
+        Read the next chunk into the buffer, dropping what has already been parsed.
+
+        :return: False if the body is exhausted
+        """
+        if self._eof:
+            return False
+        self._buf = self._buf[self._pos:]
+        self._pos = 0
+        try:
+            chunk = next(self.chunks)
+        except StopIteration:
+            self._eof = True
+            self._buf += self._decoder.decode(b'', final=True)
+            return False
+        self._buf += self._decoder.decode(chunk)
+        return True
+
+    def _match(self, pattern):
+        """
+        Match a complete token at the current position, reading more of the body if it might be cut off.
+
+        :param pattern: compiled token pattern
+        :return: the token
+        """
+        while True:
+            match = pattern.match(self._buf, self._pos)
+            if match is not None and (match.end() < len(self._buf) or self._eof):
+                self._pos = match.end()
+                return match.group()
+            if not self._fill():
+                if match is None:
+                    raise ValueError('Truncated JSON response')
+
+    def _peek(self):
+        """
+        Get the next character, reading more of the body if necessary.
+
+        :return: the character, or None at the end of the body
+        """
+        while self._pos >= len(self._buf):
+            if not self._fill():
+                return None
+        return self._buf[self._pos]
+
+    def _items(self):
+        """
+        Decode the elements of the streamed array, up to its closing bracket.
+        """
+        while True:
+            char = self._peek()
+            if char is None:
+                raise ValueError('Truncated JSON response')
+            if char in _WHITESPACE or char == ',':
+                self._pos += 1
+            elif char == ']':
+                self._pos += 1
+                return
+            else:
+                try:
+                    item, end = self._json.raw_decode(self._buf, self._pos)
+                except ValueError:
+                    #
+                    # Incomplete item, so wait for more of the body.
+                    #
+                    if not self._fill():
+                        raise
+                    continue
+                if end == len(self._buf) or self._buf[end] not in _DELIMITERS:
+                    #
+                    # A value only ends at a delimiter: a number cut off by the end of a chunk (e.g. 12. of 12.5) may
+                    # decode as a shorter one.
+                    #
+                    if self._fill():
+                        continue
+                    if end < len(self._buf):
+                        raise ValueError('Truncated JSON response')
+                self._pos = end
+                yield item
+
+    def __iter__(self):
+        """
+        Walk the JSON structure, copying it to the skeleton, until reaching the array at path.
+
+        :return: generator of items
+        """
+        #
+        # Each stack entry is [is_object, last_key, expecting_key].
+        #
+        stack = []
+        while True:
+            char = self._peek()
+            if char is None:
+                break
+            if char in _WHITESPACE:
+                self._pos += 1
+                continue
+            if char == '"':
+                token = self._match(_STRING)
+                if stack and stack[-1][0] and stack[-1][2]:
+                    stack[-1][1] = json.loads(token)
+                    stack[-1][2] = False
+                self._skeleton.append(token)
+                continue
+            self._pos += 1
+            if char == '[':
+                keys = tuple(entry[1] for entry in stack if entry[0])
+                if keys == self.path and len(keys) == len(stack):
+                    self._skeleton.append('[]')
+                    for item in self._items():
+                        yield item
+                    continue
+                stack.append([False, None, False])
+            elif char == '{':
+                stack.append([True, None, True])
+            elif char in ']}':
+                stack.pop()
+            elif char == ',' and stack and stack[-1][0]:
+                stack[-1][2] = True
+            elif char not in ',:':
+                self._pos -= 1
+                char = self._match(_SCALAR)
+            self._skeleton.append(char)
+        self.response = json.loads(''.join(self._skeleton))
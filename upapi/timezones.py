@@ -0,0 +1,259 @@
+"""
+Timezone handling for UP API times. The API reports unixtimes, and events carry the zone they happened in (their tz
+field), while the timezone endpoint has each user's zone history:
+https://jawbone.com/up/developer/endpoints/timezone
+
+Named zones (e.g., America/Los_Angeles) need zoneinfo (Python 3.9+) or pytz. Without either, only UTC and fixed offsets
+(e.g., GMT-0800) are available.
+"""
+import bisect
+import datetime
+import re
+import threading
+import upapi.endpoints
+import upapi.exceptions
+
+try:
+    import zoneinfo
+except ImportError:
+    zoneinfo = None
+
+try:
+    import pytz
+except ImportError:
+    pytz = None
+
+
+class FixedOffset(datetime.tzinfo):
+    """
+    A zone with a constant offset from UTC.
+    """
+    def __init__(self, minutes, name):
+        """
+        Create the zone.
+
+        :param minutes: offset east of UTC in minutes
+        :param name: zone name
+        """
+        self._offset = datetime.timedelta(minutes=minutes)
+        self._name = name
+        super(FixedOffset, self).__init__()
+
+    def utcoffset(self, dt):
+        """
+        Offset from UTC.
+
+        :param dt: ignored, the offset is constant
+        :return: offset east of UTC
+        """
+        return self._offset
+
+    def dst(self, dt):
+        """
+        Daylight saving time adjustment.
+
+        :param dt: ignored, fixed offsets have no daylight saving time
+        :return: zero
+        """
+        return datetime.timedelta(0)
+
+    def tzname(self, dt):
+        """
+        Name of the zone.
+
+        :param dt: ignored, the name is constant
+        :return: zone name
+        """
+        return self._name
+
+    def __reduce__(self):
+        """
+        Pickle support, e.g. for upapi.parsing workers.
+
+        :return: constructor and arguments
+        """
+        return FixedOffset, (self._offset.days * 1440 + self._offset.seconds // 60, self._name)
+
+    def __repr__(self):
+        """
+        Represent the zone by its name.
+
+        :return: representation with the zone name
+        """
+        return 'FixedOffset({!r})'.format(self._name)
+
+
+UTC = FixedOffset(0, 'UTC')
+
+_OFFSET = re.compile(r'^(?:GMT|UTC)?([+-])(\d{1,2}):?(\d{2})?$')
+_zones = {}
+_zones_lock = threading.Lock()
+
+
+def _load_zone(name):
+    """
+    Create the tzinfo object for a zone name.
+
+    :param name: zone name, e.g. America/Los_Angeles or GMT-0800
+    :return: tzinfo object
+    """
+    if name in ('UTC', 'GMT', 'Z'):
+        return UTC
+    match = _OFFSET.match(name)
+    if match is not None:
+        sign, hours, minutes = match.groups()
+        offset = int(hours) * 60 + int(minutes or 0)
+        return FixedOffset(-offset if sign == '-' else offset, name)
+    if zoneinfo is not None:
+        try:
+            return zoneinfo.ZoneInfo(name)
+        except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+            pass
+    if pytz is not None:
+        try:
+            return pytz.timezone(name)
+        except pytz.UnknownTimeZoneError:
+            pass
+    raise upapi.exceptions.UnknownTimezone(name)
+
+
+def get_zone(name):
+    """
+    Get the tzinfo object for a zone name. Zones are created once and reused.
+
+    :param name: zone name, e.g. America/Los_Angeles or GMT-0800
+    :return: tzinfo object
+    """
+    zone = _zones.get(name)
+    if zone is None:
+        zone = _load_zone(name)
+        with _zones_lock:
+            _zones[name] = zone
+    return zone
+
+
+def from_timestamp(time, zone=UTC):
+    """
+    Convert a unixtime to an aware datetime.
+
+    :param time: unixtime
+    :param zone: tzinfo object or zone name, defaults to UTC
+    :return: aware datetime
+    """
+    if not isinstance(zone, datetime.tzinfo):
+        zone = get_zone(zone)
+    return datetime.datetime.fromtimestamp(time, zone)
+
+
+def localize(times, zone=UTC):
+    """
+    Convert many unixtimes in the same zone to aware datetimes.
+
+    :param times: iterable of unixtimes
+    :param zone: tzinfo object or zone name, defaults to UTC
+    :return: list of aware datetimes
+    """
+    if not isinstance(zone, datetime.tzinfo):
+        zone = get_zone(zone)
+    fromtimestamp = datetime.datetime.fromtimestamp
+    return [fromtimestamp(time, zone) for time in times]
+
+
+def localize_items(items, field='time_created', default=UTC):
+    """
+    Convert a time field of many events to aware datetimes in each event's own zone (its tz field).
+
+    :param items: list of event dicts
+    :param field: unixtime field to convert
+    :param default: tzinfo object for events without a tz field
+    :return: list of aware datetimes
+    """
+    fromtimestamp = datetime.datetime.fromtimestamp
+    return [
+        fromtimestamp(item[field], get_zone(item['tz']) if item.get('tz') else default)
+        for item in items]
+
+
+class TimezoneHistory(object):
+    """
+    The TimezoneHistory object holds the zones a user has been in, from the timezone endpoint.
+    """
+    def __init__(self, items):
+        """
+        Index the history by time.
+
+        :param items: list of dicts with time (when the user entered the zone) and tz
+        """
+        items = sorted(items, key=lambda item: item['time'])
+        self.times = [item['time'] for item in items]
+        self.zones = [get_zone(item['tz']) for item in items]
+        super(TimezoneHistory, self).__init__()
+
+    def zone_at(self, time):
+        """
+        Get the zone the user was in at a time. Times before the history use the earliest zone.
+
+        :param time: unixtime
+        :return: tzinfo object, or UTC if the history is empty
+        """
+        if not self.zones:
+            return UTC
+        return self.zones[max(bisect.bisect_right(self.times, time) - 1, 0)]
+
+    def localize(self, times):
+        """
+        Convert many unixtimes to aware datetimes in the zone the user was in at each time.
+
+        :param times: iterable of unixtimes
+        :return: list of aware datetimes
+        """
+        fromtimestamp = datetime.datetime.fromtimestamp
+        return [fromtimestamp(time, self.zone_at(time)) for time in times]
+
+
+class Timezones(object):
+    """
+    The Timezones object caches the timezone history of each user, so it is only fetched once per user.
+    """
+    def __init__(self):
+        """
+        Create an empty cache.
+        """
+        self._histories = {}
+        self._lock = threading.Lock()
+        super(Timezones, self).__init__()
+
+    def history(self, client):
+        """
+        Get a user's timezone history, fetching it if it is not cached. Histories are cached by user xid, so a client
+        that has not made a call yet first fetches its user to learn it.
+
+        :param client: UpApi object with the user's credentials
+        :return: TimezoneHistory object
+        """
+        if client.user_xid is None:
+            client.get(upapi.endpoints.USER)
+        history = self._histories.get(client.user_xid)
+        if history is None:
+            items = []
+            for page in client.get_pages(upapi.endpoints.USERTIMEZONE):
+                items.extend(page['items'])
+            history = TimezoneHistory(items)
+            with self._lock:
+                self._histories[client.user_xid] = history
+        return history
+
+    def invalidate(self, user_xid):
+        """
+        Drop a user's cached history, e.g. after the user travels.
+
+        :param user_xid: user xid
+        """
+        with self._lock:
+            self._histories.pop(user_xid, None)
+
+
+"""
+Timezone histories shared by every UpApi object, e.g. to find the user's today.
+"""
+TIMEZONES = Timezones()
@@ -0,0 +1,141 @@
+"""
+An optional HTTP/2 transport. By default each thread of each UpApi object opens its own connections, so fetching for
+many users at once means many sockets to the same host. Give UpApi objects one shared Http2Transport instead, and their
+concurrent requests are multiplexed over a few connections.
+
+The transport needs httpx with HTTP/2 support (Python 3 only): pip install upapi[http2]
+"""
+import httplib2
+import socket
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+"""
+Default number of connections the transport opens to each host. Each connection carries many concurrent requests.
+"""
+MAX_CONNECTIONS = 4
+
+
+def _translate(exc):
+    """
+    Convert an httpx error into the socket error that the httplib-based code handles.
+
+    :param exc: httpx.TransportError
+    :return: socket.timeout or socket.error
+    """
+    if isinstance(exc, httpx.TimeoutException):
+        return socket.timeout(str(exc))
+    return socket.error(str(exc))
+
+
+class StreamResponse(object):
+    """
+    The StreamResponse wraps a streamed httpx response in the parts of the httplib response interface UpApi uses.
+    """
+    def __init__(self, response):
+        """
+        Wrap the response.
+
+        :param response: httpx.Response with an unread body
+        """
+        self.status = response.status_code
+        self._response = response
+        self._chunks = response.iter_raw()
+        self._buffer = b''
+        super(StreamResponse, self).__init__()
+
+    def getheaders(self):
+        """
+        Get the response headers.
+
+        :return: list of (lowercase name, value) tuples
+        """
+        return list(self._response.headers.items())
+
+    def read(self, size=None):
+        """
+        Read from the body.
+
+        :param size: maximum number of bytes to read, or None for the rest of the body
+        :return: byte string, empty at the end of the body
+        """
+        while size is None or len(self._buffer) < size:
+            try:
+                self._buffer += next(self._chunks)
+            except StopIteration:
+                break
+            except httpx.TransportError as exc:
+                raise _translate(exc)
+        if size is None:
+            size = len(self._buffer)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def close(self):
+        """
+        Stop reading the body and release its stream.
+        """
+        self._response.close()
+
+
+class Http2Transport(object):
+    """
+    The Http2Transport sends requests over shared HTTP/2 connections. It is safe to share between threads and UpApi
+    objects, and takes care of no credentials itself: UpApi applies each user's credentials to every request.
+    """
+    def __init__(self, max_connections=MAX_CONNECTIONS):
+        """
+        Create the connection pool. Connections open on first use.
+
+        :param max_connections: maximum number of connections to each host
+        """
+        if httpx is None:
+            raise ImportError('The HTTP/2 transport needs httpx: pip install upapi[http2]')
+        self._client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections))
+        super(Http2Transport, self).__init__()
+
+    def request(self, uri, method='GET', body=None, headers=None, timeout=None):
+        """
+        Send a request and read the whole response, like httplib2.Http.request.
+
+        :param uri: request URL
+        :param method: HTTP method
+        :param body: optional request body
+        :param headers: optional dict of request headers
+        :param timeout: seconds to wait for a connection or for each read, or None to wait forever
+        :return: tuple of httplib2.Response and body bytes
+        """
+        try:
+            response = self._client.request(method, uri, content=body, headers=headers, timeout=timeout)
+        except httpx.TransportError as exc:
+            raise _translate(exc)
+        info = dict(response.headers.items())
+        info['status'] = response.status_code
+        return httplib2.Response(info), response.content
+
+    def stream(self, uri, headers=None, timeout=None):
+        """
+        Send a GET request without reading the response body.
+
+        :param uri: request URL
+        :param headers: optional dict of request headers
+        :param timeout: seconds to wait for a connection or for each read, or None to wait forever
+        :return: StreamResponse object
+        """
+        request = self._client.build_request('GET', uri, headers=headers, timeout=timeout)
+        try:
+            return StreamResponse(self._client.send(request, stream=True))
+        except httpx.TransportError as exc:
+            raise _translate(exc)
+
+    def close(self):
+        """
+        Close all the connections.
+        """
+        self._client.close()
@@ -5,7 +5,14 @@ https://jawbone.com/up/developer/endpoints/user
 import upapi.base
 import upapi.endpoints
 import upapi.meta
+import upapi.user.bodyevents
+import upapi.user.events
 import upapi.user.friends
+import upapi.user.goals
+import upapi.user.heartrates
+import upapi.user.meals
+import upapi.user.sleeps
+import upapi.user.workouts
 
 
 class User(upapi.base.UpApi):
@@ -34,7 +41,7 @@ class User(upapi.base.UpApi):
         #
         self.first = None
         self.last = None
-        for key, val in resp_data.iteritems():
+        for key, val in resp_data.items():
             setattr(self, key, val)
 
     @property
@@ -56,3 +63,82 @@ class User(upapi.base.UpApi):
         """
         self._friends = upapi.user.friends.Friends(*self.args, **self.kwargs)
         return self._friends
+
+    def get_body_events(self, params=None):
+        """
+        Stream the body events endpoint into a BodyEvents time series.
+
+        :param params: optional dict of query parameters, e.g. start_time and end_time
+        :return: a BodyEvents object
+        """
+        return upapi.user.bodyevents.BodyEvents(*self.args, params=params, **self.kwargs)
+
+    def get_generic_events(self):
+        """
+        Create a GenericEvents object to stream and write the user's generic events.
+
+        :return: a GenericEvents object
+        """
+        return upapi.user.events.GenericEvents(*self.args, **self.kwargs)
+
+    def get_goals(self, state=None):
+        """
+        Call the goals endpoint and convert the response to a Goals object.
+
+        :param state: optional state of an earlier Goals object for this user, to detect changes
+        :return: a Goals object
+        """
+        return upapi.user.goals.Goals(*self.args, state=state, **self.kwargs)
+
+    def get_moods(self):
+        """
+        Create a Moods object to stream and write the user's moods.
+
+        :return: a Moods object
+        """
+        return upapi.user.events.Moods(*self.args, **self.kwargs)
+
+    def get_settings(self, state=None):
+        """
+        Call the settings endpoint and convert the response to a Settings object.
+
+        :param state: optional state of an earlier Settings object for this user, to detect changes
+        :return: a Settings object
+        """
+        return upapi.user.goals.Settings(*self.args, state=state, **self.kwargs)
+
+    def get_heartrates(self, params=None):
+        """
+        Stream the heartrates endpoint into a HeartRates time series.
+
+        :param params: optional dict of query parameters, e.g. start_time and end_time
+        :return: a HeartRates object
+        """
+        return upapi.user.heartrates.HeartRates(*self.args, params=params, **self.kwargs)
+
+    def get_meals(self, params=None):
+        """
+        Stream the meals endpoint into a Meals object.
+
+        :param params: optional dict of query parameters, e.g. start_time and end_time
+        :return: a Meals object
+        """
+        return upapi.user.meals.Meals(*self.args, params=params, **self.kwargs)
+
+    def get_sleeps(self, params=None):
+        """
+        Stream the sleeps endpoint into a Sleeps object.
+
+        :param params: optional dict of query parameters, e.g. start_time and end_time
+        :return: a Sleeps object
+        """
+        return upapi.user.sleeps.Sleeps(*self.args, params=params, **self.kwargs)
+
+    def get_workouts(self, params=None):
+        """
+        Stream the workouts endpoint into a Workouts object.
+
+        :param params: optional dict of query parameters, e.g. start_time and end_time
+        :return: a Workouts object
+        """
+        return upapi.user.workouts.Workouts(*self.args, params=params, **self.kwargs)
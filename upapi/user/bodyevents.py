@@ -0,0 +1,167 @@
+"""
+The BodyEvents object represents resources from the body events endpoint (weight, body fat, etc.):
+https://jawbone.com/up/developer/endpoints/body
+"""
+import array
+import bisect
+import math
+import upapi.base
+import upapi.endpoints
+
+
+"""
+Measurements of a body event kept in the time series. Missing measurements are NaN.
+"""
+METRICS = ('weight', 'body_fat', 'lean_mass', 'bmi')
+
+NAN = float('nan')
+
+
+def _measure(item, metric):
+    """
+    Get a measurement of a body event.
+
+    :param item: body event dict
+    :param metric: one of METRICS
+    :return: float, NaN if missing
+    """
+    value = item.get(metric)
+    return NAN if value is None else float(value)
+
+
+class BodyEvents(upapi.base.UpApi):
+    """
+    The BodyEvents object holds a user's body events as a time series: parallel arrays of unixtimes and of each metric,
+    sorted by time, with one entry per xid. updated is the latest time_updated seen, which refresh fetches from.
+    """
+    def __init__(self, *args, **kwargs):
+        """
+        Stream the body events endpoint into the time series.
+
+        :param args: pass through to base class
+        :param kwargs: pass through to base class, except params, an optional dict of query parameters for the body
+            events endpoint (e.g., start_time and end_time)
+        """
+        params = kwargs.pop('params', None)
+        super(BodyEvents, self).__init__(*args, **kwargs)
+        self.times = array.array('l')
+        self.xids = []
+        self.values = dict((metric, array.array('d')) for metric in METRICS)
+        self.updated = None
+        self.merge(self.stream_items(upapi.endpoints.USERBODYEVENTS, params))
+
+    def __len__(self):
+        """
+        Count the body events.
+
+        :return: the number of body events
+        """
+        return len(self.times)
+
+    def _entries(self, indexes):
+        """
+        Get entries of the series as sortable tuples.
+
+        :param indexes: iterable of entry indexes
+        :return: list of (unixtime, 0, xid, measurements) tuples
+        """
+        return [
+            (self.times[index], 0, self.xids[index], tuple(self.values[metric][index] for metric in METRICS))
+            for index in indexes]
+
+    def merge(self, items):
+        """
+        Add body events to the series. An event already in the series (by xid) is replaced by the newer copy, wherever
+        it falls in time. A batch of events newer than the series is appended; any other batch is merged in one pass
+        rather than inserted event by event.
+
+        :param items: iterable of body event dicts
+        :return: the number of events that were not in the series before
+        """
+        batch = {}
+        for item in items:
+            batch[item['xid']] = item
+            updated = item.get('time_updated', item['time_created'])
+            self.updated = updated if self.updated is None else max(self.updated, updated)
+        if not batch:
+            return 0
+
+        known = set(self.xids)
+        added = len([xid for xid in batch if xid not in known])
+        incoming = sorted(
+            (item['time_created'], 1, xid, tuple(_measure(item, metric) for metric in METRICS))
+            for xid, item in batch.items())
+        if added == len(batch) and (not self.times or incoming[0][0] >= self.times[-1]):
+            entries = incoming
+        else:
+            #
+            # Both lists are sorted, so sorting them together is a linear merge. Existing entries sort before new
+            # ones at the same time, as if the new ones were appended.
+            #
+            kept = self._entries(index for index, xid in enumerate(self.xids) if xid not in batch)
+            entries = sorted(kept + incoming)
+            self.times = array.array('l')
+            self.xids = []
+            self.values = dict((metric, array.array('d')) for metric in METRICS)
+
+        self.times.extend(entry[0] for entry in entries)
+        self.xids.extend(entry[2] for entry in entries)
+        for column, metric in enumerate(METRICS):
+            self.values[metric].extend(entry[3][column] for entry in entries)
+        return added
+
+    def refresh(self):
+        """
+        Fetch the body events created or edited since the last update in the series and merge them in, so edits to
+        older events are seen too.
+
+        :return: the number of new events
+        """
+        params = None
+        if self.updated is not None:
+            params = {'updated_after': self.updated}
+        return self.merge(self.stream_items(upapi.endpoints.USERBODYEVENTS, params))
+
+    def between(self, start_time, end_time, metric='weight'):
+        """
+        Get one metric over a time range, leaving out events without it.
+
+        :param start_time: first unixtime, inclusive
+        :param end_time: last unixtime, inclusive
+        :param metric: one of METRICS
+        :return: tuple of arrays (unixtimes, values)
+        """
+        begin = bisect.bisect_left(self.times, start_time)
+        end = bisect.bisect_right(self.times, end_time)
+        times = array.array('l')
+        values = array.array('d')
+        for created, value in zip(self.times[begin:end], self.values[metric][begin:end]):
+            if not math.isnan(value):
+                times.append(created)
+                values.append(value)
+        return times, values
+
+    def latest(self, metric='weight', before=None):
+        """
+        Get the most recent measurement of a metric.
+
+        :param metric: one of METRICS
+        :param before: optional unixtime; only events up to it count
+        :return: tuple of unixtime and value, or None if there is no measurement
+        """
+        index = len(self.times) if before is None else bisect.bisect_right(self.times, before)
+        values = self.values[metric]
+        while index > 0:
+            index -= 1
+            if not math.isnan(values[index]):
+                return self.times[index], values[index]
+        return None
+
+    def get_body_event(self, xid):
+        """
+        Fetch one body event.
+
+        :param xid: body event xid
+        :return: JSON data of the body event
+        """
+        return self.get_item(upapi.endpoints.BODYEVENTS, xid)
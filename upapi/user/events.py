@@ -0,0 +1,333 @@
+"""
+The Events object creates, updates and deletes a user's events: meals, workouts, body events, generic events and moods.
+The GenericEvents and Moods objects also read and import generic events and moods in bulk.
+https://jawbone.com/up/developer/endpoints
+"""
+import json
+import upapi.base
+import upapi.batch
+import upapi.endpoints
+
+
+"""
+Optional fields the API accepts for each type of event. Required fields are explicit arguments of the create methods.
+"""
+PLACE_FIELDS = ('place_lat', 'place_lon', 'place_acc', 'place_name')
+COMMON_FIELDS = ('time_created', 'tz', 'share', 'image_url') + PLACE_FIELDS
+MEAL_FIELDS = COMMON_FIELDS + ('note', 'sub_type', 'photo_url', 'items')
+WORKOUT_FIELDS = COMMON_FIELDS + ('calories', 'distance', 'intensity', 'steps', 'time_completed', 'sub_type')
+BODY_EVENT_FIELDS = COMMON_FIELDS + ('title', 'weight', 'body_fat', 'lean_mass', 'bmi', 'note')
+GENERIC_FIELDS = COMMON_FIELDS + ('title', 'verb', 'attributes', 'note')
+MOOD_FIELDS = ('time_created', 'tz', 'share', 'title', 'sub_type')
+
+"""
+Events methods that submit may call. Anything else (e.g., disconnect) is rejected.
+"""
+WRITE_METHODS = frozenset([
+    'create_meal', 'update_meal', 'delete_meal',
+    'create_workout', 'update_workout', 'delete_workout',
+    'create_body_event', 'delete_body_event',
+    'create_generic_event', 'update_generic_event', 'delete_generic_event',
+    'create_mood', 'delete_mood'])
+
+
+def check_fields(allowed, fields):
+    """
+    Check that every field is one the API accepts for this type of event, e.g. before sending a partial update.
+
+    :param allowed: tuple of accepted field names
+    :param fields: dict of fields to send
+    :return: the fields
+    """
+    unknown = sorted(set(fields) - set(allowed))
+    if unknown:
+        raise TypeError('Unexpected event fields: {}'.format(', '.join(unknown)))
+    return fields
+
+
+class Events(upapi.base.UpApi):
+    """
+    The Events object manages writes to the UP API event endpoints.
+    """
+
+    def create_meal(self, note, **fields):
+        """
+        Create a meal.
+
+        :param note: description of the meal
+        :param fields: optional meal fields (see MEAL_FIELDS), e.g. items as a list of dicts
+        :return: the new meal
+        """
+        fields['note'] = note
+        return self.post(upapi.endpoints.USERMEALS, check_fields(MEAL_FIELDS, fields))
+
+    def update_meal(self, xid, **fields):
+        """
+        Update some fields of a meal.
+
+        :param xid: the meal's xid
+        :param fields: meal fields to change (see MEAL_FIELDS)
+        :return: the updated meal
+        """
+        return self._mirror_update(
+            upapi.endpoints.MEALS,
+            self.post(upapi.endpoints.MEALSUPDATE.format(xid=xid), check_fields(MEAL_FIELDS, fields)))
+
+    def delete_meal(self, xid):
+        """
+        Delete a meal.
+
+        :param xid: the meal's xid
+        """
+        return self._mirror_delete(xid, self.delete(upapi.endpoints.MEALS.format(xid=xid)))
+
+    def create_workout(self, sub_type, time_created, time_completed, **fields):
+        """
+        Create a workout.
+
+        :param sub_type: workout type (see https://jawbone.com/up/developer/endpoints/workouts)
+        :param time_created: unixtime the workout started
+        :param time_completed: unixtime the workout ended
+        :param fields: optional workout fields (see WORKOUT_FIELDS)
+        :return: the new workout
+        """
+        fields.update(sub_type=sub_type, time_created=time_created, time_completed=time_completed)
+        return self.post(upapi.endpoints.USERWORKOUTS, check_fields(WORKOUT_FIELDS, fields))
+
+    def update_workout(self, xid, **fields):
+        """
+        Update some fields of a workout.
+
+        :param xid: the workout's xid
+        :param fields: workout fields to change (see WORKOUT_FIELDS)
+        :return: the updated workout
+        """
+        return self._mirror_update(
+            upapi.endpoints.WORKOUTS,
+            self.post(upapi.endpoints.WORKOUTSUPDATE.format(xid=xid), check_fields(WORKOUT_FIELDS, fields)))
+
+    def delete_workout(self, xid):
+        """
+        Delete a workout.
+
+        :param xid: the workout's xid
+        """
+        return self._mirror_delete(xid, self.delete(upapi.endpoints.WORKOUTS.format(xid=xid)))
+
+    def create_body_event(self, title, **fields):
+        """
+        Create a body event, e.g. a weigh-in. The API does not support updating body events.
+
+        :param title: title of the event
+        :param fields: optional body event fields (see BODY_EVENT_FIELDS), e.g. weight in kg
+        :return: the new body event
+        """
+        fields['title'] = title
+        return self.post(upapi.endpoints.USERBODYEVENTS, check_fields(BODY_EVENT_FIELDS, fields))
+
+    def delete_body_event(self, xid):
+        """
+        Delete a body event.
+
+        :param xid: the body event's xid
+        """
+        return self._mirror_delete(xid, self.delete(upapi.endpoints.BODYEVENTS.format(xid=xid)))
+
+    def create_generic_event(self, title, **fields):
+        """
+        Create a generic event.
+
+        :param title: title of the event
+        :param fields: optional generic event fields (see GENERIC_FIELDS), e.g. attributes as a dict
+        :return: the new generic event
+        """
+        fields['title'] = title
+        return self.post(upapi.endpoints.USERGENERIC, check_fields(GENERIC_FIELDS, fields))
+
+    def update_generic_event(self, xid, **fields):
+        """
+        Update some fields of a generic event.
+
+        :param xid: the generic event's xid
+        :param fields: generic event fields to change (see GENERIC_FIELDS)
+        :return: the updated generic event
+        """
+        return self._mirror_update(
+            upapi.endpoints.GENERICEVENTS,
+            self.post(upapi.endpoints.GENERICUPDATE.format(xid=xid), check_fields(GENERIC_FIELDS, fields)))
+
+    def delete_generic_event(self, xid):
+        """
+        Delete a generic event.
+
+        :param xid: the generic event's xid
+        """
+        return self._mirror_delete(xid, self.delete(upapi.endpoints.GENERICEVENTS.format(xid=xid)))
+
+    def create_mood(self, title, sub_type, **fields):
+        """
+        Create a mood. The API does not support updating moods.
+
+        :param title: title of the mood
+        :param sub_type: mood type from 1 (amazing) to 8 (totally done)
+        :param fields: optional mood fields (see MOOD_FIELDS)
+        :return: the new mood
+        """
+        fields.update(title=title, sub_type=sub_type)
+        return self.post(upapi.endpoints.USERMOODS, check_fields(MOOD_FIELDS, fields))
+
+    def delete_mood(self, xid):
+        """
+        Delete a mood.
+
+        :param xid: the mood's xid
+        """
+        return self._mirror_delete(xid, self.delete(upapi.endpoints.MOODS.format(xid=xid)))
+
+    def _write(self, operation):
+        """
+        Call one write method.
+
+        :param operation: (method name, kwargs) tuple; the method must be in WRITE_METHODS
+        :return: the method's return value
+        """
+        name, kwargs = operation
+        if name not in WRITE_METHODS:
+            raise ValueError('Not an event write method: {}'.format(name))
+        return getattr(self, name)(**kwargs)
+
+    def submit(self, operations, max_workers=upapi.batch.MAX_WORKERS):
+        """
+        Send many writes concurrently over this object's connections. An operation naming a method outside
+        WRITE_METHODS fails with a ValueError in its result.
+
+        :param operations: iterable of (method name, kwargs) tuples, e.g. ('delete_meal', {'xid': xid})
+        :param max_workers: maximum number of concurrent requests
+        :return: list of upapi.batch.Result objects, one per operation, in the same order
+        """
+        return list(self.stream_submit(operations, max_workers=max_workers))
+
+    def stream_submit(self, operations, max_workers=upapi.batch.MAX_WORKERS):
+        """
+        Send many writes like submit, but a chunk at a time as the results are consumed, so neither the operations nor
+        the results are all held in memory (e.g., to import a large export file line by line).
+
+        :param operations: iterable of (method name, kwargs) tuples
+        :param max_workers: maximum number of concurrent requests
+        :return: generator of upapi.batch.Result objects, one per operation, in the same order
+        """
+        return upapi.batch.stream(self._write, operations, max_workers=max_workers)
+
+
+class EventLog(Events):
+    """
+    The EventLog streams one kind of event and writes it in bulk: reads stream every page of the list endpoint without
+    holding it in memory, and writes go through submit with a result or error per event. Subclasses set the endpoints,
+    the accepted fields and the names of the Events methods that create and delete the kind.
+    """
+    list_url = None
+    item_url = None
+    fields = ()
+    create_method = None
+    delete_method = None
+
+    def stream(self, params=None):
+        """
+        Iterate over the events, following the next links until the last page.
+
+        :param params: optional dict of query parameters, e.g. start_time and end_time
+        :return: generator of event dicts
+        """
+        return self.stream_items(self.list_url, params)
+
+    def get_event(self, xid):
+        """
+        Fetch one event, reading through the mirror if there is one.
+
+        :param xid: the event's xid
+        :return: JSON data of the event
+        """
+        return self.get_item(self.item_url, xid)
+
+    def export(self, fileobj, params=None):
+        """
+        Write the events to a file as JSON lines, one event per line.
+
+        :param fileobj: file opened for writing text
+        :param params: optional dict of query parameters, e.g. start_time and end_time
+        :return: the number of events written
+        """
+        count = 0
+        for event in self.stream(params):
+            fileobj.write(json.dumps(event, sort_keys=True))
+            fileobj.write('\n')
+            count += 1
+        return count
+
+    def import_events(self, events, max_workers=upapi.batch.MAX_WORKERS):
+        """
+        Create many events concurrently. Fields the API sets itself (e.g., xid and date) are dropped, so exported events
+        can be imported as they are.
+
+        :param events: iterable of event dicts
+        :param max_workers: maximum number of concurrent requests
+        :return: list of upapi.batch.Result objects, one per event, in the same order
+        """
+        return list(self.stream_import(events, max_workers=max_workers))
+
+    def stream_import(self, events, max_workers=upapi.batch.MAX_WORKERS):
+        """
+        Create many events like import_events, a chunk at a time as the results are consumed (see stream_submit).
+
+        :param events: iterable of event dicts, e.g. json.loads of each line of an export file
+        :param max_workers: maximum number of concurrent requests
+        :return: generator of upapi.batch.Result objects, one per event, in the same order
+        """
+        return self.stream_submit(
+            ((self.create_method, dict((key, val) for key, val in event.items() if key in self.fields))
+             for event in events),
+            max_workers=max_workers)
+
+    def delete_events(self, xids, max_workers=upapi.batch.MAX_WORKERS):
+        """
+        Delete many events concurrently.
+
+        :param xids: iterable of event xids
+        :param max_workers: maximum number of concurrent requests
+        :return: list of upapi.batch.Result objects, one per xid, in the same order
+        """
+        return self.submit(((self.delete_method, {'xid': xid}) for xid in xids), max_workers=max_workers)
+
+
+class GenericEvents(EventLog):
+    """
+    The GenericEvents object reads and writes a user's generic events.
+    """
+    list_url = upapi.endpoints.USERGENERIC
+    item_url = upapi.endpoints.GENERICEVENTS
+    fields = GENERIC_FIELDS
+    create_method = 'create_generic_event'
+    delete_method = 'delete_generic_event'
+
+    def update_events(self, updates, max_workers=upapi.batch.MAX_WORKERS):
+        """
+        Update some fields of many generic events concurrently.
+
+        :param updates: iterable of (xid, dict of fields to change) tuples
+        :param max_workers: maximum number of concurrent requests
+        :return: list of upapi.batch.Result objects, one per update, in the same order
+        """
+        return self.submit(
+            (('update_generic_event', dict(fields, xid=xid)) for xid, fields in updates),
+            max_workers=max_workers)
+
+
+class Moods(EventLog):
+    """
+    The Moods object reads and writes a user's moods. The API does not support updating moods.
+    """
+    list_url = upapi.endpoints.USERMOODS
+    item_url = upapi.endpoints.MOODS
+    fields = MOOD_FIELDS
+    create_method = 'create_mood'
+    delete_method = 'delete_mood'
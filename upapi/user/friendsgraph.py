@@ -0,0 +1,184 @@
+"""
+The FriendsGraph object crawls the friends lists of many authorized users and indexes the friendships between them.
+https://jawbone.com/up/developer/endpoints/user
+"""
+import array
+import hashlib
+import time
+import upapi.batch
+import upapi.endpoints
+
+
+class FriendsGraph(object):
+    """
+    The FriendsGraph holds an undirected friends graph. Each xid gets a small integer id, and each user's friends are
+    stored as a sorted array of ids. A friendship reported by both users is stored once. When two crawled users
+    disagree, the list fetched more recently decides, and lists fetched at the same time must both report it; a
+    friendship with a user who was never crawled is taken from the one side that reported it.
+    """
+    def __init__(self):
+        """
+        Create an empty graph.
+        """
+        self.xids = []
+        self._ids = {}
+        self._reported = {}
+        self._reported_by = {}
+        self._digests = {}
+        self._fetched = {}
+        self._stale = set()
+        self._adjacency = {}
+        super(FriendsGraph, self).__init__()
+
+    def id_of(self, xid):
+        """
+        Get the integer id of an xid, assigning a new one if necessary.
+
+        :param xid: user xid
+        :return: integer id
+        """
+        node = self._ids.get(xid)
+        if node is None:
+            node = self._ids[xid] = len(self.xids)
+            self.xids.append(xid)
+        return node
+
+    def friends(self, xid):
+        """
+        Get a user's friends.
+
+        :param xid: user xid
+        :return: list of friend xids
+        """
+        node = self._ids.get(xid)
+        if node is None:
+            return []
+        return [self.xids[friend] for friend in self._adjacency.get(node, ())]
+
+    def edges(self):
+        """
+        Iterate over the friendships, once each.
+
+        :return: generator of (xid, xid) tuples
+        """
+        for node, friends in self._adjacency.items():
+            for friend in friends:
+                if node < friend:
+                    yield self.xids[node], self.xids[friend]
+
+    def mark_stale(self, xid):
+        """
+        Make the next crawl refetch a user's friends list, e.g. after a pubsub notification.
+
+        :param xid: user xid
+        """
+        self._stale.add(self.id_of(xid))
+
+    def _needs_fetch(self, client, max_age, now):
+        """
+        Decide whether a user's friends list has to be fetched.
+
+        :param client: UpApi object with the user's credentials
+        :param max_age: seconds a fetched list stays fresh, or None to always fetch
+        :param now: current unixtime
+        :return: True to fetch
+        """
+        if max_age is None or client.user_xid is None:
+            return True
+        node = self._ids.get(client.user_xid)
+        if node is None or node in self._stale or node not in self._fetched:
+            return True
+        return now - self._fetched[node] > max_age
+
+    def _update(self, xid, friend_xids, now):
+        """
+        Replace a user's reported friends and reindex the users whose friendships changed.
+
+        :param xid: user xid
+        :param friend_xids: list of friend xids from the friends endpoint
+        :param now: unixtime of the fetch
+        :return: True if the list changed
+        """
+        node = self.id_of(xid)
+        self._fetched[node] = now
+        self._stale.discard(node)
+        old = self._reported.get(node, frozenset())
+        digest = hashlib.sha1(','.join(sorted(friend_xids)).encode('utf-8')).digest()
+        changed = self._digests.get(node) != digest
+        if changed:
+            self._digests[node] = digest
+            new = frozenset(self.id_of(friend) for friend in friend_xids)
+            self._reported[node] = new
+            for friend in old - new:
+                self._reported_by[friend].discard(node)
+            for friend in new - old:
+                self._reported_by.setdefault(friend, set()).add(node)
+        else:
+            new = old
+
+        #
+        # A newer fetch can settle friendships the two users disagree on, even if this list did not change.
+        #
+        disputed = new ^ self._reported_by.get(node, frozenset())
+        if not changed and not disputed:
+            return False
+        for friend in (old ^ new) | disputed:
+            self._reindex(friend)
+        self._reindex(node)
+        return changed
+
+    def _agree(self, node, friend):
+        """
+        Decide whether two users are friends from what they reported.
+
+        :param node: integer id
+        :param friend: integer id
+        :return: True if they are friends
+        """
+        reports_friend = friend in self._reported.get(node, frozenset())
+        reports_node = node in self._reported.get(friend, frozenset())
+        if reports_friend == reports_node:
+            return reports_friend
+        if node not in self._fetched or friend not in self._fetched:
+            return True
+        if self._fetched[node] == self._fetched[friend]:
+            return False
+        return reports_friend if self._fetched[node] > self._fetched[friend] else reports_node
+
+    def _reindex(self, node):
+        """
+        Rebuild one user's adjacency array from what the user and everyone else reported.
+
+        :param node: integer id
+        """
+        reported = self._reported.get(node, frozenset()) | self._reported_by.get(node, frozenset())
+        self._adjacency[node] = array.array('l', sorted(friend for friend in reported if self._agree(node, friend)))
+
+    def crawl(self, clients, max_age=None, max_workers=upapi.batch.MAX_WORKERS):
+        """
+        Fetch the friends lists of many users concurrently and update the graph. Lists fetched less than max_age
+        seconds ago are skipped unless marked stale, and unchanged lists leave the index untouched.
+
+        :param clients: iterable of UpApi objects, one per authorized user
+        :param max_age: seconds a fetched list stays fresh, or None to fetch every list
+        :param max_workers: maximum number of concurrent requests
+        :return: list of upapi.batch.Result objects for the fetched users, with a value of True if the list changed
+        """
+        now = time.time()
+        fetch = [client for client in clients if self._needs_fetch(client, max_age, now)]
+        results = upapi.batch.run(
+            lambda client: client.request(upapi.endpoints.USERFRIENDS),
+            fetch,
+            max_workers=max_workers)
+
+        #
+        # Index in this thread once the requests are done, so the index needs no locking.
+        #
+        updated = []
+        for result in results:
+            if result.error is None:
+                response = result.value
+                friend_xids = [item['xid'] for item in response.data['items']]
+                result = result._replace(value=self._update(response.meta.user_xid, friend_xids, now))
+            updated.append(result)
+        return updated
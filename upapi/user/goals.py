@@ -0,0 +1,106 @@
+"""
+The Goals and Settings objects represent resources from the goals and settings endpoints:
+https://jawbone.com/up/developer/endpoints/goals
+https://jawbone.com/up/developer/endpoints/settings
+
+Both are polled for change detection: give each object the state saved from the previous fetch, and it sends a
+conditional request and compares payload hashes, so unchanged users cost a 304 and no processing.
+"""
+import hashlib
+import json
+import upapi.base
+import upapi.endpoints
+
+try:
+    import http.client as httplib
+except ImportError:
+    import httplib
+
+
+def digest(data, volatile=()):
+    """
+    Hash a decoded payload, independent of key order.
+
+    :param data: JSON data
+    :param volatile: top-level keys to leave out of the hash
+    :return: hex digest
+    """
+    stable = dict((key, val) for key, val in data.items() if key not in volatile)
+    return hashlib.sha1(json.dumps(stable, sort_keys=True, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+
+class PolledResource(upapi.base.UpApi):
+    """
+    The PolledResource fetches a single resource and tracks whether it changed since the last fetch. Subclasses set
+    url, and volatile for keys that change without the resource changing.
+    """
+    url = None
+    volatile = ()
+
+    def __init__(self, *args, **kwargs):
+        """
+        Fetch the resource, conditionally if there is saved state.
+
+        :param args: pass through to base class
+        :param kwargs: pass through to base class, except state, an optional dict saved from the state attribute of an
+            earlier object for the same user
+        """
+        state = kwargs.pop('state', None) or {}
+        super(PolledResource, self).__init__(*args, **kwargs)
+        self.etag = state.get('etag')
+        self.digest = state.get('digest')
+        self.data = state.get('data')
+        self.previous = None
+        self.changed = False
+        self.refresh()
+
+    @property
+    def state(self):
+        """
+        The state to pass to the next object for this user. It is JSON serializable, so it can be stored between runs.
+
+        :return: dict of etag, digest and data
+        """
+        return {'etag': self.etag, 'digest': self.digest, 'data': self.data}
+
+    def refresh(self):
+        """
+        Fetch the resource again. If it changed, data holds the new payload and previous the cached copy it replaced.
+
+        :return: True if the resource changed since the last fetch
+        """
+        headers = {}
+        if self.etag is not None and self.data is not None:
+            headers['If-None-Match'] = self.etag
+        response = self.request(self.url, ok_statuses=[httplib.OK, httplib.NOT_MODIFIED], headers=headers)
+        self.changed = False
+        if response.status == httplib.NOT_MODIFIED:
+            return self.changed
+
+        #
+        # The ETag may change with volatile keys, or the server may send none, so compare the hashes too.
+        #
+        self.etag = response.headers.get('etag')
+        new_digest = digest(response.data, self.volatile)
+        self.changed = new_digest != self.digest
+        if self.changed:
+            self.previous = self.data
+        self.data = response.data
+        self.digest = new_digest
+        return self.changed
+
+
+class Goals(PolledResource):
+    """
+    The Goals object holds a user's goals, e.g. move_steps and sleep_total. The remaining_for_day progress changes all
+    day, so it does not count as a change.
+    """
+    url = upapi.endpoints.USERGOALS
+    volatile = ('remaining_for_day',)
+
+
+class Settings(PolledResource):
+    """
+    The Settings object holds a user's settings, e.g. data sharing and units.
+    """
+    url = upapi.endpoints.USERSETTINGS
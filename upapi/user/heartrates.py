@@ -0,0 +1,117 @@
+"""
+The HeartRates object represents the resting heart rates from the heartrates endpoint:
+https://jawbone.com/up/developer/endpoints/heartrate
+"""
+import array
+import bisect
+import itertools
+import operator
+import upapi.base
+import upapi.endpoints
+
+
+#
+# Python 2's map builds a list and pads short iterables (e.g., itertools.repeat) forever; imap stops like Python 3's.
+#
+_map = getattr(itertools, 'imap', map)
+
+
+def _running_sums(values):
+    """
+    Get the running sums of some values, starting from 0.
+
+    :param values: iterable of numbers
+    :return: iterator of len(values) + 1 sums
+    """
+    if hasattr(itertools, 'accumulate'):
+        return itertools.accumulate(itertools.chain([0.0], values))
+    return _accumulate(values)
+
+
+def _accumulate(values):
+    """
+    Running sums for Python 2, which has no itertools.accumulate.
+
+    :param values: iterable of numbers
+    :return: generator of len(values) + 1 sums
+    """
+    total = 0.0
+    yield total
+    for value in values:
+        total += value
+        yield total
+
+
+class HeartRates(upapi.base.UpApi):
+    """
+    The HeartRates object holds a user's resting heart rates as a time series: parallel arrays of unixtimes and beats
+    per minute, sorted by time.
+    """
+    def __init__(self, *args, **kwargs):
+        """
+        Stream the heartrates endpoint into arrays.
+
+        :param args: pass through to base class
+        :param kwargs: pass through to base class, except params, an optional dict of query parameters for the
+            heartrates endpoint (e.g., start_time and end_time)
+        """
+        params = kwargs.pop('params', None)
+        super(HeartRates, self).__init__(*args, **kwargs)
+        entries = sorted(
+            (item['time_created'], item['resting_heartrate'])
+            for item in self.stream_items(upapi.endpoints.USERHEARTRATES, params)
+            if item.get('resting_heartrate') is not None)
+        self.times = array.array('l', [entry[0] for entry in entries])
+        self.rates = array.array('d', [entry[1] for entry in entries])
+
+    def __len__(self):
+        """
+        Count the heart rates.
+
+        :return: the number of heart rates
+        """
+        return len(self.times)
+
+    def downsample(self, window):
+        """
+        Summarize the heart rates in fixed windows of time. Windows without heart rates are left out.
+
+        :param window: window length in seconds
+        :return: tuple of arrays (window start times, minimums, maximums, means)
+        """
+        starts = array.array('l')
+        mins = array.array('d')
+        maxes = array.array('d')
+        means = array.array('d')
+        begin = 0
+        while begin < len(self.times):
+            start = self.times[begin] - self.times[begin] % window
+            end = bisect.bisect_left(self.times, start + window, begin)
+            rates = self.rates[begin:end]
+            starts.append(start)
+            mins.append(min(rates))
+            maxes.append(max(rates))
+            means.append(sum(rates) / len(rates))
+            begin = end
+        return starts, mins, maxes, means
+
+    def rolling(self, count):
+        """
+        Compute the mean and standard deviation of every run of count consecutive heart rates, from running sums so
+        each run costs the same regardless of count. The arithmetic is mapped over whole arrays rather than looped.
+
+        :param count: number of heart rates per run
+        :return: tuple of arrays (means, standard deviations), one entry per run ending at each heart rate from
+            index count - 1
+        """
+        if count < 1:
+            raise ValueError('count must be positive')
+        sums = array.array('d', _running_sums(self.rates))
+        squares = array.array('d', _running_sums(_map(operator.mul, self.rates, self.rates)))
+        size = itertools.repeat(float(count))
+
+        means = array.array('d', _map(operator.truediv, _map(operator.sub, sums[count:], sums[:-count]), size))
+        mean_squares = _map(operator.truediv, _map(operator.sub, squares[count:], squares[:-count]), size)
+        variances = _map(max, _map(operator.sub, mean_squares, _map(operator.mul, means, means)), itertools.repeat(0.0))
+        stdevs = array.array('d', _map(operator.pow, variances, itertools.repeat(0.5)))
+        return means, stdevs
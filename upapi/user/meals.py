@@ -0,0 +1,155 @@
+"""
+The Meals object represents resources from the meals endpoint:
+https://jawbone.com/up/developer/endpoints/meals
+"""
+import array
+import upapi.base
+import upapi.batch
+import upapi.endpoints
+
+
+"""
+Nutrient fields of a meal's details, in the order of each meal's row of nutrients.
+"""
+NUTRIENTS = (
+    'calories',
+    'carbohydrate',
+    'protein',
+    'fat',
+    'saturated_fat',
+    'unsaturated_fat',
+    'cholesterol',
+    'fiber',
+    'sugar',
+    'sodium',
+    'potassium',
+    'calcium',
+    'iron',
+    'vitamin_a',
+    'vitamin_c')
+
+"""
+Position of each nutrient in a row.
+"""
+COLUMNS = dict((name, column) for column, name in enumerate(NUTRIENTS))
+
+WIDTH = len(NUTRIENTS)
+
+
+def vectorize(details):
+    """
+    Flatten a meal's (or food item's) nutrient fields into a row in NUTRIENTS order. Missing nutrients are 0.
+
+    :param details: dict of nutrient fields
+    :return: array of WIDTH doubles
+    """
+    return array.array('d', [float(details.get(name) or 0) for name in NUTRIENTS])
+
+
+class Meals(upapi.base.UpApi):
+    """
+    The Meals object holds a user's meals as a table sorted by date and time: parallel xids, dates and times, and one
+    flat array with a row of nutrients per meal.
+    """
+    def __init__(self, *args, **kwargs):
+        """
+        Stream the meals endpoint into the table.
+
+        :param args: pass through to base class
+        :param kwargs: pass through to base class, except params, an optional dict of query parameters for the meals
+            endpoint (e.g., start_time and end_time)
+        """
+        params = kwargs.pop('params', None)
+        super(Meals, self).__init__(*args, **kwargs)
+        meals = sorted(
+            (item['date'], item['time_created'], item['xid'], vectorize(item.get('details') or {}))
+            for item in self.stream_items(upapi.endpoints.USERMEALS, params))
+        self.xids = [meal[2] for meal in meals]
+        self.dates = array.array('l', [meal[0] for meal in meals])
+        self.times = array.array('l', [meal[1] for meal in meals])
+        self.nutrients = array.array('d')
+        for meal in meals:
+            self.nutrients.extend(meal[3])
+
+    def __len__(self):
+        """
+        Count the meals.
+
+        :return: the number of meals
+        """
+        return len(self.xids)
+
+    def row(self, index):
+        """
+        Get one meal's nutrients.
+
+        :param index: meal index
+        :return: array of WIDTH doubles in NUTRIENTS order
+        """
+        return self.nutrients[index * WIDTH:(index + 1) * WIDTH]
+
+    def column(self, nutrient):
+        """
+        Get one nutrient of every meal.
+
+        :param nutrient: one of NUTRIENTS
+        :return: array of doubles, one per meal
+        """
+        return self.nutrients[COLUMNS[nutrient]::WIDTH]
+
+    def totals(self):
+        """
+        Total every nutrient over all the meals.
+
+        :return: array of WIDTH doubles in NUTRIENTS order
+        """
+        return array.array('d', [sum(self.nutrients[column::WIDTH]) for column in range(WIDTH)])
+
+    def daily(self):
+        """
+        Total every nutrient per day. The meals are sorted by date, so each day is one run of rows.
+
+        :return: tuple of an array of dates and a flat array with a row of WIDTH totals per date
+        """
+        dates = array.array('l')
+        sums = array.array('d')
+        start = 0
+        for index in range(1, len(self.dates) + 1):
+            if index < len(self.dates) and self.dates[index] == self.dates[start]:
+                continue
+            run = self.nutrients[start * WIDTH:index * WIDTH]
+            dates.append(self.dates[start])
+            sums.extend(sum(run[column::WIDTH]) for column in range(WIDTH))
+            start = index
+        return dates, sums
+
+    def get_meal(self, xid):
+        """
+        Fetch one meal with its food items.
+
+        :param xid: meal xid
+        :return: JSON data of the meal
+        """
+        return self.get_item(upapi.endpoints.MEALS, xid)
+
+    def details(self, xids=None, max_workers=upapi.batch.MAX_WORKERS):
+        """
+        Fetch many meals with their food items concurrently, and report failures per meal.
+
+        :param xids: optional list of meal xids, defaults to every meal
+        :param max_workers: maximum number of concurrent requests
+        :return: list of upapi.batch.Result objects with the JSON data of the meals as values, in the same order
+        """
+        if xids is None:
+            xids = self.xids
+        return upapi.batch.run(self.get_meal, xids, max_workers=max_workers)
+
+
+def totals_by_user(meals):
+    """
+    Total every nutrient per user.
+
+    :param meals: iterable of Meals objects, one per user
+    :return: dict of user xid to array of WIDTH doubles in NUTRIENTS order
+    """
+    return dict((meals_obj.user_xid, meals_obj.totals()) for meals_obj in meals)
@@ -0,0 +1,142 @@
+"""
+The Sleeps and SleepPhases objects represent resources from the sleeps endpoint and the depth ticks of each sleep:
+https://jawbone.com/up/developer/endpoints/sleeps
+"""
+import array
+import upapi.base
+import upapi.batch
+import upapi.endpoints
+
+
+"""
+Sleep depths reported by the sleep ticks.
+"""
+AWAKE = 1
+LIGHT = 2
+DEEP = 3
+REM = 4
+
+
+class SleepPhases(object):
+    """
+    The SleepPhases object run-length encodes a sleep's depth ticks into intervals: parallel arrays of start times, end
+    times and depths, with consecutive ticks of the same depth merged.
+    """
+    def __init__(self, ticks, time_completed):
+        """
+        Encode the ticks. Each tick's depth lasts until the next tick, and the last one until the sleep ends.
+
+        :param ticks: list of tick dicts with time and depth, ordered by time
+        :param time_completed: unixtime the sleep ended
+        """
+        self.starts = array.array('l')
+        self.ends = array.array('l')
+        self.depths = array.array('b')
+        for tick in ticks:
+            if self.depths and self.depths[-1] == tick['depth']:
+                continue
+            if self.depths:
+                self.ends.append(tick['time'])
+            self.starts.append(tick['time'])
+            self.depths.append(tick['depth'])
+        if self.depths:
+            self.ends.append(max(time_completed, self.starts[-1]))
+        super(SleepPhases, self).__init__()
+
+    def durations(self):
+        """
+        Total the time spent at each depth.
+
+        :return: dict of depth to seconds
+        """
+        totals = {}
+        for start, end, depth in zip(self.starts, self.ends, self.depths):
+            totals[depth] = totals.get(depth, 0) + end - start
+        return totals
+
+    @property
+    def duration(self):
+        """
+        Time from the first tick to the end of the sleep.
+
+        :return: seconds
+        """
+        if not self.depths:
+            return 0
+        return self.ends[-1] - self.starts[0]
+
+    @property
+    def efficiency(self):
+        """
+        Fraction of the sleep spent asleep, i.e. at any depth but AWAKE.
+
+        :return: efficiency from 0 to 1
+        """
+        if not self.duration:
+            return 0.0
+        return 1.0 - float(self.durations().get(AWAKE, 0)) / self.duration
+
+    @property
+    def awakenings(self):
+        """
+        Number of times the user woke up between first falling asleep and last falling asleep. Waking up for good at the
+        end of the sleep is not an awakening.
+
+        :return: count of awakenings
+        """
+        asleep = [index for index, depth in enumerate(self.depths) if depth != AWAKE]
+        if not asleep:
+            return 0
+        return self.depths[asleep[0]:asleep[-1]].count(AWAKE)
+
+    @property
+    def fragmentation(self):
+        """
+        How often the sleep changes depth.
+
+        :return: depth changes per hour
+        """
+        if not self.duration:
+            return 0.0
+        return (len(self.depths) - 1) * 3600.0 / self.duration
+
+
+class Sleeps(upapi.base.UpApi):
+    """
+    The Sleeps object holds a list of the user's sleeps and analyzes their phases.
+    """
+    def __init__(self, *args, **kwargs):
+        """
+        Stream the sleeps endpoint into a list of sleeps.
+
+        :param args: pass through to base class
+        :param kwargs: pass through to base class, except params, an optional dict of query parameters for the sleeps
+            endpoint (e.g., start_time and end_time)
+        """
+        params = kwargs.pop('params', None)
+        super(Sleeps, self).__init__(*args, **kwargs)
+        self.items = list(self.stream_items(upapi.endpoints.USERSLEEPS, params))
+
+    def get_phases(self, sleep):
+        """
+        Fetch and encode one sleep's depth ticks.
+
+        :param sleep: sleep dict from the sleeps endpoint
+        :return: a SleepPhases object
+        """
+        ticks = sorted(
+            self.stream_items(upapi.endpoints.SLEEPSPHASES.format(xid=sleep['xid'])),
+            key=lambda tick: tick['time'])
+        return SleepPhases(ticks, sleep['time_completed'])
+
+    def phases(self, max_workers=upapi.batch.MAX_WORKERS):
+        """
+        Fetch and encode the depth ticks of every sleep concurrently. A night whose ticks could not be fetched does not
+        stop the others.
+
+        :param max_workers: maximum number of concurrent requests
+        :return: dict of sleep xid to upapi.batch.Result object, with the sleep dict as item and a SleepPhases object as
+            value
+        """
+        results = upapi.batch.run(self.get_phases, self.items, max_workers=max_workers)
+        return dict((result.item['xid'], result) for result in results)
@@ -0,0 +1,136 @@
+"""
+The Workouts object represents resources from the workouts endpoint, with each workout's ticks and graph:
+https://jawbone.com/up/developer/endpoints/workouts
+"""
+import collections
+import upapi.base
+import upapi.batch
+import upapi.endpoints
+import upapi.user.events
+
+
+"""
+Compact summary of one workout: its xid, sub_type and date, start and end unixtimes, duration in seconds, steps,
+calories, distance in meters, intensity, number of ticks and the most steps in one tick.
+"""
+WorkoutSummary = collections.namedtuple(
+    'WorkoutSummary',
+    ['xid', 'sub_type', 'date', 'start', 'end', 'duration', 'steps', 'calories', 'distance', 'intensity', 'ticks',
+     'peak_steps'])
+
+
+def summarize(workout, ticks):
+    """
+    Summarize a workout. Totals the workout's details leave out are added up from its ticks.
+
+    :param workout: JSON data of the workout
+    :param ticks: list of the workout's tick dicts
+    :return: WorkoutSummary object
+    """
+    details = workout.get('details') or {}
+
+    def total(field):
+        """
+        Get a total from the details, or else from the ticks.
+        """
+        if details.get(field) is not None:
+            return details[field]
+        return sum(tick.get(field) or 0 for tick in ticks)
+
+    start = workout['time_created']
+    end = workout.get('time_completed') or start
+    return WorkoutSummary(
+        workout['xid'],
+        workout.get('sub_type'),
+        workout.get('date'),
+        start,
+        end,
+        end - start,
+        total('steps'),
+        total('calories'),
+        total('distance'),
+        details.get('intensity'),
+        len(ticks),
+        max([tick.get('steps') or 0 for tick in ticks] or [0]))
+
+
+class Workouts(upapi.base.UpApi):
+    """
+    The Workouts object holds a list of the user's workouts and fetches their details and ticks.
+    """
+    def __init__(self, *args, **kwargs):
+        """
+        Stream the workouts endpoint into a list of workouts.
+
+        :param args: pass through to base class
+        :param kwargs: pass through to base class, except params, an optional dict of query parameters for the
+            workouts endpoint (e.g., start_time and end_time)
+        """
+        params = kwargs.pop('params', None)
+        super(Workouts, self).__init__(*args, **kwargs)
+        self.items = list(self.stream_items(upapi.endpoints.USERWORKOUTS, params))
+
+    def get_workout(self, xid):
+        """
+        Fetch one workout.
+
+        :param xid: the workout's xid
+        :return: JSON data of the workout
+        """
+        return self.get_item(upapi.endpoints.WORKOUTS, xid)
+
+    def get_ticks(self, xid):
+        """
+        Fetch one workout's ticks.
+
+        :param xid: the workout's xid
+        :return: list of tick dicts ordered by time
+        """
+        return sorted(
+            self.stream_items(upapi.endpoints.WORKOUTSTICKS.format(xid=xid)),
+            key=lambda tick: tick['time'])
+
+    def get_summary(self, xid):
+        """
+        Fetch one workout with its ticks and summarize it.
+
+        :param xid: the workout's xid
+        :return: WorkoutSummary object
+        """
+        return summarize(self.get_workout(xid), self.get_ticks(xid))
+
+    def summaries(self, xids=None, max_workers=upapi.batch.MAX_WORKERS):
+        """
+        Fetch and summarize many workouts concurrently, e.g. a whole season listed with start_time and end_time.
+
+        :param xids: optional list of workout xids, defaults to every listed workout
+        :param max_workers: maximum number of concurrent workouts
+        :return: list of upapi.batch.Result objects with WorkoutSummary values, in the same order
+        """
+        if xids is None:
+            xids = [workout['xid'] for workout in self.items]
+        return upapi.batch.run(self.get_summary, xids, max_workers=max_workers)
+
+    def download_graph(self, xid, fileobj):
+        """
+        Download one workout's graph image.
+
+        :param xid: the workout's xid
+        :param fileobj: file opened for binary writing
+        :return: number of bytes written
+        """
+        return self.download(upapi.endpoints.WORKOUTSGRAPH.format(xid=xid), fileobj)
+
+    def update(self, xid, **fields):
+        """
+        Update some fields of a workout, like upapi.user.events.Events.update_workout.
+
+        :param xid: the workout's xid
+        :param fields: workout fields to change (see upapi.user.events.WORKOUT_FIELDS)
+        :return: the updated workout
+        """
+        return self._mirror_update(
+            upapi.endpoints.WORKOUTS,
+            self.post(
+                upapi.endpoints.WORKOUTSUPDATE.format(xid=xid),
+                upapi.user.events.check_fields(upapi.user.events.WORKOUT_FIELDS, fields)))